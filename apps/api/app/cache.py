@@ -1,11 +1,18 @@
 """Redis cache configuration and utilities."""
 import hashlib
-import json
-from typing import Optional, Callable
+import inspect
+import time
+from decimal import Decimal
+from functools import wraps
+from typing import Any, Optional, Callable
 from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
-from fastapi_cache.decorator import cache
+from fastapi_cache.coder import Coder
+from fastapi_cache.decorator import cache as _fastapi_cache
+import orjson
+from pydantic import BaseModel
 from redis import asyncio as aioredis
 
 from app.config import settings
@@ -14,6 +21,109 @@ from app.config import settings
 # Global redis client reference
 redis_client: Optional[aioredis.Redis] = None
 
+# Key prefix; bumped whenever the stored encoding changes so old entries
+# are never served in the new format
+CACHE_PREFIX = "crypto-signals:v2"
+
+
+# ============== Response Cache Encoding ==============
+
+def _orjson_default(obj: Any) -> Any:
+    """Types orjson does not serialize natively, rendered as FastAPI would."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return jsonable_encoder(obj)
+
+
+class ORJSONCoder(Coder):
+    """
+    Store endpoint results as the JSON bytes they are sent as.
+
+    A hit is returned as a ready ``Response`` over the stored bytes, so it
+    skips the parse, model validation and re-encode the default JsonCoder
+    round trip costs.
+    """
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        if isinstance(value, Response):
+            return value.body
+        return orjson.dumps(
+            value,
+            default=_orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:
+        return orjson.loads(value)
+
+    @classmethod
+    def decode_as_type(cls, value: bytes, *, type_: Any) -> Any:
+        return Response(content=value, media_type="application/json")
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag for a response body, identical on every worker."""
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def cache(expire: Optional[int] = None, **kwargs) -> Callable:
+    """
+    fastapi-cache's ``@cache``, keeping its headers on raw-bytes hits.
+
+    FastAPI ignores headers set on the injected response when an endpoint
+    returns its own ``Response``, which is what ORJSONCoder hands back on a
+    hit; Cache-Control, ETag and the HIT marker are copied across here.
+
+    fastapi-cache derives its ETag from Python's per-process ``hash()``, so
+    it differed between workers and If-None-Match rarely matched; it is
+    replaced with a digest of the body and answered with 304 when matched.
+    """
+    def wrapper(func: Callable) -> Callable:
+        cached = _fastapi_cache(expire=expire, **kwargs)(func)
+
+        @wraps(cached)
+        async def inner(*args, **kw):
+            result = await cached(*args, **kw)
+            sub = request = None
+            for value in kw.values():
+                if isinstance(value, Response):
+                    sub = value
+                elif isinstance(value, Request):
+                    request = value
+            if sub is None or result is sub:
+                return result
+
+            if "etag" in sub.headers:
+                body = result.body if isinstance(result, Response) else ORJSONCoder.encode(result)
+                etag = body_etag(body)
+                sub.headers["ETag"] = etag
+                if request is not None and etag_matches(request, etag):
+                    result = Response(status_code=304)
+            if isinstance(result, Response):
+                result.headers.raw.extend(sub.headers.raw)
+            return result
+
+        return inner
+
+    return wrapper
+
+
+def build_custom_key(request: Request) -> str:
+    """
+    Hash a request's path and query string into a fixed-length key part.
+
+    Path parameters are part of the URL path, so this identifies the
+    endpoint call on its own. Returns a 32-char BLAKE2b hex digest.
+    """
+    payload = orjson.dumps(
+        {"p": request.url.path, "q": sorted(request.query_params.multi_items())}
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
 
 def custom_key_builder(
     func: Callable,
@@ -23,25 +133,35 @@ def custom_key_builder(
     args: tuple = None,
     kwargs: dict = None,
 ) -> str:
-    """Build custom cache key including query parameters."""
+    """
+    Build a cache key from the endpoint name plus a digest of the request.
+
+    Only the request URL is hashed, never the injected dependencies: the
+    per-request ``AsyncSession`` in *kwargs* stringifies with its memory
+    address, which made every key unique.
+    """
     prefix = f"{FastAPICache.get_prefix()}:{namespace}:{func.__module__}:{func.__name__}"
     
-    # Include path parameters
-    if kwargs:
-        sorted_kwargs = sorted(kwargs.items())
-        kwargs_str = json.dumps(sorted_kwargs, sort_keys=True, default=str)
-        kwargs_hash = hashlib.md5(kwargs_str.encode()).hexdigest()[:8]
-        prefix = f"{prefix}:{kwargs_hash}"
+    if request is not None:
+        return f"{prefix}:{build_custom_key(request)}"
     
-    # Include query parameters
-    if request and request.query_params:
-        query_str = str(sorted(request.query_params.items()))
-        query_hash = hashlib.md5(query_str.encode()).hexdigest()[:8]
-        prefix = f"{prefix}:q:{query_hash}"
+    # Called outside a request: key on plain-valued arguments only
+    if kwargs:
+        plain = sorted(
+            (k, v) for k, v in kwargs.items()
+            if isinstance(v, (str, int, float, bool, type(None)))
+        )
+        payload = orjson.dumps(plain)
+        prefix = f"{prefix}:{hashlib.blake2b(payload, digest_size=16).hexdigest()}"
     
     return prefix
 
 
+def get_redis() -> Optional[aioredis.Redis]:
+    """Get the shared Redis client, or None when running on the in-memory cache."""
+    return redis_client
+
+
 async def init_cache():
     """Initialize Redis cache."""
     global redis_client
@@ -49,7 +169,7 @@ async def init_cache():
     if not settings.cache_enabled:
         # Use in-memory backend if cache is disabled
         from fastapi_cache.backends.inmemory import InMemoryBackend
-        FastAPICache.init(InMemoryBackend(), prefix="crypto-signals")
+        FastAPICache.init(InMemoryBackend(), prefix=CACHE_PREFIX, coder=ORJSONCoder)
         return
     
     try:
@@ -64,14 +184,15 @@ async def init_cache():
         
         FastAPICache.init(
             RedisBackend(redis_client),
-            prefix="crypto-signals",
+            prefix=CACHE_PREFIX,
+            coder=ORJSONCoder,
             key_builder=custom_key_builder,
         )
         print(f"✅ Redis cache initialized: {settings.redis_url}")
     except Exception as e:
         print(f"⚠️ Redis connection failed: {e}. Using in-memory cache.")
         from fastapi_cache.backends.inmemory import InMemoryBackend
-        FastAPICache.init(InMemoryBackend(), prefix="crypto-signals")
+        FastAPICache.init(InMemoryBackend(), prefix=CACHE_PREFIX, coder=ORJSONCoder)
 
 
 async def close_cache():
@@ -92,6 +213,72 @@ async def clear_cache(pattern: str = "*"):
             await redis_client.delete(key)
 
 
+# ============== Conditional GET (ETag) ==============
+
+VERSION_PREFIX = "version:"
+
+
+async def version_etag(*keys: str) -> Optional[str]:
+    """
+    Build an ETag from the current version counters of *keys*.
+
+    Missing counters are seeded with the current time rather than 0 so a
+    Redis flush can never bring back a version a client already holds.
+    Returns None without Redis: per-process counters would hand out 304s
+    for data another worker already changed.
+    """
+    redis = get_redis()
+    if redis is None:
+        return None
+
+    names = [VERSION_PREFIX + k for k in keys]
+    try:
+        values = await redis.mget(names)
+        if None in values:
+            seed = time.time_ns()
+            async with redis.pipeline(transaction=False) as pipe:
+                for name, value in zip(names, values):
+                    if value is None:
+                        pipe.set(name, seed, nx=True)
+                await pipe.execute()
+            values = await redis.mget(names)
+    except Exception:
+        return None
+
+    payload = b"|".join(
+        k.encode() + b"=" + (v or b"") for k, v in zip(keys, values)
+    )
+    return f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+
+
+async def bump_version(*keys: str) -> None:
+    """Invalidate ETags built from *keys*. Call after the write is committed."""
+    redis = get_redis()
+    if redis is None or not keys:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for k in keys:
+                pipe.incr(VERSION_PREFIX + k)
+            await pipe.execute()
+    except Exception as e:
+        print(f"⚠️ Version bump failed for {keys}: {e}")
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Whether the request's If-None-Match already names *etag*."""
+    if etag is None:
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in header.split(",")
+    )
+
+
 class CacheStatus:
     """Utility class to track cache status for headers."""
     
@@ -104,5 +291,65 @@ class CacheStatus:
         return False
 
 
+# ============== Service Result Cache ==============
+
+def cached_result(namespace: str, ttl: int) -> Callable:
+    """
+    Cache an async service method's dict result in Redis for *ttl* seconds.
+
+    Keyed by *namespace* and the call arguments (not ``self``) bound to the
+    method's signature, so ``f(24)``, ``f(hours=24)`` and a defaulted ``f()``
+    share one entry. HTTP routes and background loops in every worker thus
+    share one computation per TTL. Hits are returned with ``cached`` set to
+    True. Without Redis the method simply runs.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            redis = get_redis()
+            if redis is None:
+                return await func(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            key = f"{CACHE_PREFIX}:result:{namespace}:" + orjson.dumps(
+                list(bound.arguments.items())[1:]
+            ).decode()
+            try:
+                raw = await redis.get(key)
+            except Exception:
+                raw = None
+            if raw is not None:
+                result = orjson.loads(raw)
+                result["cached"] = True
+                return result
+
+            result = await func(self, *args, **kwargs)
+            try:
+                await redis.set(key, ORJSONCoder.encode(result), ex=ttl)
+            except Exception as e:
+                print(f"⚠️ Result cache write failed for {namespace}: {e}")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
 # Re-export cache decorator for convenience
-__all__ = ["cache", "init_cache", "close_cache", "clear_cache", "custom_key_builder"]
+__all__ = [
+    "cache",
+    "ORJSONCoder",
+    "init_cache",
+    "close_cache",
+    "clear_cache",
+    "custom_key_builder",
+    "build_custom_key",
+    "get_redis",
+    "version_etag",
+    "bump_version",
+    "etag_matches",
+    "cached_result",
+]
@@ -18,6 +18,9 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite+aiosqlite:///./crypto_signals.db"
+    db_pool_size: int = 20  # Server databases only; SQLite keeps its default pool
+    db_max_overflow: int = 40
+    db_pool_recycle: int = 1800  # seconds
     
     # Redis
     redis_url: str = "redis://localhost:6379/0"
@@ -49,6 +52,9 @@ class Settings(BaseSettings):
     # Cache
     cache_enabled: bool = True
     
+    # Per-route request rate limits (see app.rate_limit)
+    rate_limit_enabled: bool = True
+    
     # API Settings
     api_v1_prefix: str = "/api/v1"
     project_name: str = "Crypto Signal Aggregator"
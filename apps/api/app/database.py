@@ -5,6 +5,8 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
@@ -15,11 +17,23 @@ class Base(DeclarativeBase):
     pass
 
 
+# Connection pool sizing for server databases (PostgreSQL). Connections
+# are checked with a ping before reuse and recycled before the server or a
+# proxy drops them. SQLite gets no sizing: it serializes writers, and
+# in-memory databases use a single static connection.
+_pool_options = {} if settings.database_url.startswith("sqlite") else {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_pre_ping": True,
+    "pool_recycle": settings.db_pool_recycle,
+}
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    **_pool_options,
 )
 
 # Create async session factory
@@ -45,6 +59,18 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+# Dialect-specific insert() constructs; both support ON CONFLICT ... RETURNING
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+def upsert_insert(session: AsyncSession):
+    """Get the ``insert()`` with ``on_conflict_do_*`` support for the session's database."""
+    return _UPSERT_INSERTS[session.bind.dialect.name]
+
+
 async def create_tables():
     """Create all database tables."""
     async with engine.begin() as conn:
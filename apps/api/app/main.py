@@ -30,8 +30,10 @@ from app.routers import (
 )
 from app.routers.telegram import router as telegram_router
 from app.routers.subscriptions import router as subscriptions_router
-from app.routers.search import router as search_router
+from app.routers.search import router as search_router, run_contract_index_refresh
 from app.routers.notifications import router as notifications_router
+from app.routers.live import run_live_snapshot_refresh
+from app.routers.signals import remember_token_symbol
 from app.services.telegram_monitor import telegram_monitor, start_monitoring, stop_monitoring
 from app.services.token_tracker import token_tracker
 # from app.services.streams_service import streams_service
@@ -105,6 +107,7 @@ async def save_signal_to_db(signal_data: dict):
             session.add(signal)
             await session.commit()
             await session.refresh(signal)
+            remember_token_symbol(signal.token_symbol)
             
             logger.info(f"💾 Saved signal #{signal.id}: {signal.token_symbol} from {channel_name}")
             
@@ -123,11 +126,15 @@ async def save_signal_to_db(signal_data: dict):
                 "timestamp": signal.timestamp.isoformat() if signal.timestamp else datetime.utcnow().isoformat(),
             }
             
-            await manager.broadcast({
-                "type": "new_signal",
-                "data": broadcast_data,
-                "timestamp": datetime.utcnow().isoformat(),
-            })
+            await manager.broadcast_signal(
+                {
+                    "type": "new_signal",
+                    "data": broadcast_data,
+                    "timestamp": datetime.utcnow().isoformat(),
+                },
+                token_symbol=signal.token_symbol,
+                channel_name=channel_name,
+            )
             
             # Notify subscribers (Phase 2)
             # Run in background to not block signal processing
@@ -279,6 +286,7 @@ async def lifespan(app: FastAPI):
                 channels = (await session.execute(select(Channel))).scalars().all()
                 
                 count = 0
+                touched_users = set()
                 for user in all_users:
                     for channel in channels:
                         # Check if sub exists
@@ -297,10 +305,14 @@ async def lifespan(app: FastAPI):
                                 notify_telegram=True
                             )
                             session.add(new_sub)
+                            touched_users.add(user.id)
                             count += 1
                 
                 if count > 0:
                     await session.commit()
+                    from app.routers.subscriptions import invalidate_subscriptions
+                    for user_id in touched_users:
+                        await invalidate_subscriptions(user_id)
                     logger.info(f"✅ Auto-subscribed users to {count} channel slots")
         except Exception as e:
             logger.error(f"Failed to backfill user subscriptions: {e}")
@@ -345,10 +357,18 @@ async def lifespan(app: FastAPI):
     logger.info("📡 Restoring per-user background monitoring...")
     asyncio.create_task(user_telegram_manager.restore_all_monitoring())
     
+    # Shared sentiment/trending snapshots for the live WebSocket stream
+    live_snapshot_task = asyncio.create_task(run_live_snapshot_refresh())
+    
+    # Contract address → platform index for token search
+    contract_index_task = asyncio.create_task(run_contract_index_refresh())
+    
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down...")
+    live_snapshot_task.cancel()
+    contract_index_task.cancel()
     await user_telegram_manager.shutdown()
     await token_tracker.stop()
     # await streams_service.cleanup()
@@ -1,7 +1,7 @@
 """ChannelSubscription model for user-channel relationships."""
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
-from sqlalchemy import Integer, Boolean, DateTime, ForeignKey, UniqueConstraint, String
+from sqlalchemy import Integer, Boolean, DateTime, ForeignKey, UniqueConstraint, String, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -57,12 +57,19 @@ class ChannelSubscription(Base):
     )
     
     # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="channel_subscriptions")
-    channel: Mapped["Channel"] = relationship("Channel")
+    # Both must be loaded explicitly (selectinload); a lazy load raises
+    # instead of silently issuing one query per subscription
+    user: Mapped["User"] = relationship(
+        "User", back_populates="channel_subscriptions", lazy="raise"
+    )
+    channel: Mapped["Channel"] = relationship("Channel", lazy="raise")
     
     # Constraints
     __table_args__ = (
+        # Also serves every (user_id, channel_id) lookup and the upsert's conflict target
         UniqueConstraint("user_id", "channel_id", name="uq_user_channel_subscription"),
+        # A user's subscriptions (newest first) read in index order, no sort step
+        Index("idx_subscription_user_created", "user_id", text("created_at DESC")),
     )
     
     def __repr__(self) -> str:
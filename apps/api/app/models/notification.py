@@ -11,6 +11,7 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Index,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -60,7 +61,16 @@ class Notification(Base):
 
     __table_args__ = (
         Index("idx_notif_user_read", "user_id", "is_read"),
-        Index("idx_notif_user_created", "user_id", "created_at"),
+        Index("idx_notif_user_created", "user_id", text("created_at DESC")),
+        # Partial index for the hot unread-count / unread-list path (badge)
+        Index(
+            "ix_notifications_user_unread_created",
+            "user_id",
+            "is_read",
+            text("created_at DESC"),
+            postgresql_where=text("is_read = false"),
+            sqlite_where=text("is_read = 0"),
+        ),
     )
 
     def __repr__(self) -> str:
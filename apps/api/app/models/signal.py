@@ -11,8 +11,10 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Index,
+    CheckConstraint,
+    text,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.database import Base
 
@@ -65,12 +67,11 @@ class Signal(Base):
     message_text: Mapped[str] = mapped_column(Text, nullable=False)
     confidence_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.5)
     
-    # Timestamps
+    # Timestamps (indexed by idx_signal_timestamp_covering below)
     timestamp: Mapped[datetime] = mapped_column(
         DateTime, 
         nullable=False, 
         default=datetime.utcnow,
-        index=True,
     )
     
     # Performance tracking
@@ -88,8 +89,29 @@ class Signal(Base):
         Index("idx_signal_timestamp_channel", "timestamp", "channel_id"),
         Index("idx_signal_token_timestamp", "token_symbol", "timestamp"),
         Index("idx_signal_sentiment_timestamp", "sentiment", "timestamp"),
+        # Channel-filtered lists (newest first) read in index order and stop at LIMIT
+        Index("idx_signal_channel_timestamp", "channel_id", text("timestamp DESC")),
+        # Time-window analytics read only these columns; on Postgres the
+        # INCLUDE list lets those scans be served from the index alone. It
+        # replaces the plain ix_signals_timestamp index.
+        Index(
+            "idx_signal_timestamp_covering",
+            "timestamp",
+            postgresql_include=[
+                "token_symbol", "channel_name", "sentiment",
+                "success", "roi_percent", "confidence_score",
+            ],
+        ),
+        # Symbols are stored uppercase so lookups (which uppercase their
+        # input) always match exactly and can use the token indexes
+        CheckConstraint("token_symbol = UPPER(token_symbol)", name="ck_signal_token_symbol_upper"),
     )
     
+    @validates("token_symbol")
+    def _normalize_token_symbol(self, key: str, value: str) -> str:
+        """Store token symbols uppercase regardless of the writer."""
+        return value.upper() if value else value
+    
     def __repr__(self) -> str:
         return f"<Signal(id={self.id}, token={self.token_symbol}, sentiment={self.sentiment})>"
     
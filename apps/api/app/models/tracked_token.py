@@ -23,4 +23,5 @@ class TrackedToken(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="tracked_tokens")
+    # Must be loaded explicitly; a lazy load raises instead of querying per row
+    user: Mapped["User"] = relationship("User", back_populates="tracked_tokens", lazy="raise")
@@ -0,0 +1,114 @@
+"""
+Per-route request rate limiting.
+
+Fixed-window counters keyed by route and caller, kept in Redis so every
+worker shares one budget. Callers are identified by the user id in their
+token (decoded only, no DB lookup) and otherwise by client address, so a
+rejected request never reaches the database.
+"""
+import logging
+import time
+from typing import Callable, Dict, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.auth import decode_access_token
+from app.cache import get_redis
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Process-local fallback when Redis is unavailable:
+# key -> (window, seconds, count), least recently hit first
+_local_windows: Dict[str, Tuple[int, int, int]] = {}
+_LOCAL_MAX_KEYS = 10_000
+# Expired counters are swept at most this often (seconds), not per insert
+_LOCAL_SWEEP_INTERVAL = 60
+_local_swept_at = 0.0
+
+
+def parse_limit(limit: str) -> Tuple[int, int]:
+    """Parse ``"5/minute"`` into ``(5, 60)``."""
+    count, _, period = limit.partition("/")
+    return int(count), _PERIODS[period.strip().rstrip("s")]
+
+
+def _caller_key(request: Request) -> str:
+    """User id from the bearer token when it decodes, else the client address."""
+    auth = request.headers.get("authorization", "")
+    token = auth[7:] if auth[:7].lower() == "bearer " else request.headers.get("X-API-Key")
+    if token:
+        payload = decode_access_token(token)
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def _sweep_local_windows(now: float) -> None:
+    """Drop counters whose own window has passed."""
+    for k in [k for k, (w, s, _) in _local_windows.items() if w < int(now // s)]:
+        del _local_windows[k]
+
+
+def _local_hit(key: str, window: int, seconds: int) -> int:
+    """Count a hit in process memory; returns the count for this window."""
+    global _local_swept_at
+    now = time.time()
+    if now - _local_swept_at >= _LOCAL_SWEEP_INTERVAL:
+        _local_swept_at = now
+        _sweep_local_windows(now)
+
+    prev = _local_windows.pop(key, None)
+    if prev is None and len(_local_windows) >= _LOCAL_MAX_KEYS:
+        # Hard cap: drop the least recently hit counter
+        del _local_windows[next(iter(_local_windows))]
+    count = prev[2] + 1 if prev is not None and prev[0] == window else 1
+    _local_windows[key] = (window, seconds, count)
+    return count
+
+
+async def _hit(key: str, window: int, seconds: int) -> int:
+    redis = get_redis()
+    if redis is not None:
+        name = f"ratelimit:{key}:{window}"
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.incr(name)
+                pipe.expire(name, seconds)
+                count, _ = await pipe.execute()
+            return count
+        except Exception as e:
+            logger.warning(f"Rate limit counter unavailable, using local: {e}")
+    return _local_hit(key, window, seconds)
+
+
+def rate_limit(limit: str) -> Callable:
+    """
+    Build a route dependency enforcing *limit* (e.g. ``"10/minute"``).
+
+    Use as ``dependencies=[Depends(rate_limit("5/minute"))]`` on the route
+    decorator; route-level dependencies resolve before the endpoint's own,
+    so over-limit callers get a 429 before any session is opened.
+    """
+    max_hits, seconds = parse_limit(limit)
+
+    async def dependency(request: Request) -> None:
+        if not settings.rate_limit_enabled:
+            return
+        route = request.scope.get("route")
+        path = route.path if route is not None else request.url.path
+        now = time.time()
+        window = int(now // seconds)
+        key = f"{request.method}:{path}:{_caller_key(request)}"
+
+        if await _hit(key, window, seconds) > max_hits:
+            retry_after = int((window + 1) * seconds - now) + 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {limit}",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    return dependency
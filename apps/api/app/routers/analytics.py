@@ -1,8 +1,7 @@
 """Analytics API router with caching for 100k+ data performance."""
 import time
-from typing import Optional
+from typing import Literal, Optional
 from fastapi import APIRouter, Depends, Query, Response, Request
-from fastapi_cache.decorator import cache
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
@@ -13,9 +12,17 @@ from app.schemas.analytics import (
     ChannelLeaderboardResponse,
     PatternAnalysisResponse,
 )
-from app.cache import custom_key_builder
+from app.cache import cache, custom_key_builder
+from app.responses import ORJSONResponse
 
-router = APIRouter(prefix="/analytics", tags=["Analytics"])
+# Analytics handlers return plain dicts; render them with orjson. Set per
+# router rather than app-wide so response_model routes elsewhere keep
+# FastAPI's pydantic-core JSON fast path
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"],
+    default_response_class=ORJSONResponse,
+)
 
 
 def add_cache_headers(response: Response, cached: bool, key: str, ttl: int):
@@ -31,7 +38,12 @@ async def get_historical_data(
     request: Request,
     response: Response,
     days: int = Query(default=30, ge=1, le=365, description="Number of days of historical data"),
-    limit: int = Query(default=100000, ge=1, le=500000, description="Maximum number of records"),
+    limit: int = Query(default=500, ge=1, le=500000, description="Number of records to return"),
+    offset: int = Query(default=0, ge=0, description="Number of records to skip"),
+    layout: Literal["columns", "aos"] = Query(
+        default="columns",
+        description="'columns' for parallel arrays per field, 'aos' for one object per signal",
+    ),
     session: AsyncSession = Depends(get_session),
 ):
     """
@@ -45,23 +57,31 @@ async def get_historical_data(
     
     Query parameters:
     - **days**: Number of days of historical data (default: 30, max: 365)
-    - **limit**: Maximum records to return (default: 100000)
+    - **limit**: Records to return per page (default: 500)
+    - **offset**: Records to skip, newest first (default: 0)
+    - **layout**: `columns` (default) returns `columns: {id: [...], roi_percent: [...], ...}`;
+      `aos` returns the previous `signals: [{...}, ...]` list
     
-    Returns comprehensive historical data with summary statistics.
+    Returns one page of signals; `total_count` and the summary statistics
+    cover the whole date range.
     """
     start_time = time.perf_counter()
     
     analytics = AnalyticsService(session)
-    result = await analytics.get_historical_data(days=days, limit=limit)
+    result = await analytics.get_historical_data(
+        days=days, limit=limit, offset=offset, columnar=layout == "columns"
+    )
     
     query_time = (time.perf_counter() - start_time) * 1000
     result["query_time_ms"] = round(query_time, 2)
     
     # Cache headers will show MISS on first request
-    cache_key = f"historical:{days}:{limit}"
+    cache_key = f"historical:{days}:{limit}:{offset}"
     add_cache_headers(response, result.get("cached", False), cache_key, 300)
     
-    return result
+    # Encoded once by orjson; the cache stores this same body on a miss
+    # instead of jsonable_encoder walking every row
+    return ORJSONResponse(result)
 
 
 @router.get("/token/{symbol}/stats")
@@ -102,7 +122,7 @@ async def get_token_stats(
     cache_key = f"token_stats:{symbol.upper()}"
     add_cache_headers(response, result.get("cached", False), cache_key, 60)
     
-    return result
+    return ORJSONResponse(result)
 
 
 @router.get("/channels/leaderboard")
@@ -139,7 +159,7 @@ async def get_channel_leaderboard(
     cache_key = "channel_leaderboard"
     add_cache_headers(response, result.get("cached", False), cache_key, 3600)
     
-    return result
+    return ORJSONResponse(result)
 
 
 @router.get("/patterns")
@@ -176,7 +196,7 @@ async def get_pattern_analysis(
     cache_key = "pattern_analysis"
     add_cache_headers(response, result.get("cached", False), cache_key, 600)
     
-    return result
+    return ORJSONResponse(result)
 
 
 @router.get("/benchmark")
@@ -12,6 +12,7 @@ from app.auth import (
     authenticate_user, create_user_in_db, create_access_token,
     get_current_user, require_admin, user_to_response,
 )
+from app.rate_limit import rate_limit
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +38,11 @@ class MessageResponse(BaseModel):
     message: str
 
 
-@router.post("/register", response_model=TokenResponse)
+@router.post(
+    "/register",
+    response_model=TokenResponse,
+    dependencies=[Depends(rate_limit("10/minute"))],
+)
 async def register(
     request: RegisterRequest,
     session: AsyncSession = Depends(get_session),
@@ -111,7 +116,11 @@ async def register(
     )
 
 
-@router.post("/login", response_model=TokenResponse)
+@router.post(
+    "/login",
+    response_model=TokenResponse,
+    dependencies=[Depends(rate_limit("10/minute"))],
+)
 async def login(
     request: LoginRequest,
     session: AsyncSession = Depends(get_session),
@@ -197,7 +206,11 @@ async def create_new_user(
     )
 
 
-@router.post("/refresh", response_model=TokenResponse)
+@router.post(
+    "/refresh",
+    response_model=TokenResponse,
+    dependencies=[Depends(rate_limit("10/minute"))],
+)
 async def refresh_token(user = Depends(get_current_user)):
     """
     Refresh the access token for the current user.
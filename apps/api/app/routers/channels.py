@@ -1,7 +1,9 @@
 """Channels API router."""
+from collections import Counter
 from typing import Optional
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response, Request
-from fastapi_cache.decorator import cache
+from pydantic import TypeAdapter
 from sqlalchemy import select, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,12 +17,34 @@ from app.schemas.channel import (
     ChannelStats,
 )
 from app.config import settings
-from app.cache import custom_key_builder
+from app.cache import bump_version, cache, custom_key_builder
+from app.responses import ORJSONResponse
+from app.services.analytics_service import SENTIMENT_CODE, sentiment_code_counts
 
 router = APIRouter(prefix="/channels", tags=["Channels"])
 
+# Response fields, resolved once instead of introspecting per row
+_CHANNEL_RESPONSE_FIELDS = tuple(ChannelResponse.model_fields)
 
-@router.get("", response_model=ChannelListResponse)
+# Serializer for whole channel pages, built once
+_CHANNEL_PAGE_ADAPTER = TypeAdapter(ChannelListResponse)
+
+# Windows for the signals_last_24h/7d/30d stats
+_RECENT_WINDOWS = np.array([1, 7, 30], dtype="timedelta64[D]").astype("timedelta64[us]")
+
+
+def _channel_response(channel: Channel) -> ChannelResponse:
+    """Build a ChannelResponse from an ORM row without re-running validation."""
+    return ChannelResponse.model_construct(
+        **{field: getattr(channel, field) for field in _CHANNEL_RESPONSE_FIELDS}
+    )
+
+
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {"model": ChannelListResponse}},
+)
 @cache(expire=60, key_builder=custom_key_builder)  # 1 minute cache
 async def list_channels(
     request: Request,
@@ -54,13 +78,17 @@ async def list_channels(
     result = await session.execute(query)
     channels = result.scalars().all()
     
-    return ChannelListResponse(
-        items=[ChannelResponse.model_validate(c) for c in channels],
+    page = ChannelListResponse.model_construct(
+        items=[_channel_response(c) for c in channels],
         total=total,
         limit=limit,
         offset=offset,
         has_more=(offset + limit) < total,
     )
+    # Encoded once in pydantic-core; the cache stores these same bytes
+    return Response(
+        content=_CHANNEL_PAGE_ADAPTER.dump_json(page), media_type="application/json"
+    )
 
 
 @router.get("/{channel_id}", response_model=ChannelResponse)
@@ -87,7 +115,7 @@ async def get_channel(
             detail=f"Channel with ID {channel_id} not found"
         )
     
-    return ChannelResponse.model_validate(channel)
+    return _channel_response(channel)
 
 
 @router.get("/{channel_id}/stats")
@@ -125,17 +153,24 @@ async def get_channel_stats(
     
     # Get all signals for this channel
     signals_result = await session.execute(
-        select(Signal).where(Signal.channel_id == channel_id)
+        select(
+            Signal.success,
+            Signal.roi_percent,
+            SENTIMENT_CODE.label("sentiment_code"),
+            Signal.confidence_score,
+            Signal.token_symbol,
+            Signal.timestamp,
+        ).where(Signal.channel_id == channel_id)
     )
-    signals = signals_result.scalars().all()
+    signals = signals_result.all()
     
     if not signals:
-        return {
+        return ORJSONResponse({
             "id": channel.id,
             "name": channel.name,
             "total_signals": 0,
             "message": "No signals found for this channel",
-        }
+        })
     
     # Calculate statistics
     total = len(signals)
@@ -147,30 +182,27 @@ async def get_channel_stats(
     best_roi = max(roi_values) if roi_values else 0
     worst_roi = min(roi_values) if roi_values else 0
     
-    bullish = sum(1 for s in signals if s.sentiment == "BULLISH")
-    bearish = sum(1 for s in signals if s.sentiment == "BEARISH")
-    neutral = sum(1 for s in signals if s.sentiment == "NEUTRAL")
+    bullish, bearish, neutral = sentiment_code_counts(s.sentiment_code for s in signals).tolist()
     
     confidence_values = [s.confidence_score for s in signals]
     avg_confidence = sum(confidence_values) / len(confidence_values) if confidence_values else 0
     
     # Token frequency
-    token_counts = {}
-    for s in signals:
-        token_counts[s.token_symbol] = token_counts.get(s.token_symbol, 0) + 1
-    most_signaled = max(token_counts.items(), key=lambda x: x[1])[0] if token_counts else "N/A"
-    
-    # Time-based counts
-    from datetime import datetime, timedelta
-    now = datetime.utcnow()
-    signals_24h = sum(1 for s in signals if s.timestamp >= now - timedelta(hours=24))
-    signals_7d = sum(1 for s in signals if s.timestamp >= now - timedelta(days=7))
-    signals_30d = sum(1 for s in signals if s.timestamp >= now - timedelta(days=30))
+    token_counts = Counter(s.token_symbol for s in signals)
+    most_signaled = token_counts.most_common(1)[0][0] if token_counts else "N/A"
+    
+    # Time-based counts, from signal ages computed once
+    from datetime import datetime
+    now = np.datetime64(datetime.utcnow(), "us")
+    ages = now - np.array([s.timestamp for s in signals], dtype="datetime64[us]")
+    signals_24h, signals_7d, signals_30d = (
+        (ages[:, None] <= _RECENT_WINDOWS).sum(axis=0).tolist()
+    )
     
     response.headers["X-Cache-Status"] = "MISS"
     response.headers["Cache-Control"] = "max-age=300"
     
-    return {
+    return ORJSONResponse({
         "id": channel.id,
         "name": channel.name,
         "total_signals": total,
@@ -188,7 +220,7 @@ async def get_channel_stats(
         "signals_last_24h": signals_24h,
         "signals_last_7d": signals_7d,
         "signals_last_30d": signals_30d,
-    }
+    })
 
 
 @router.post("", response_model=ChannelResponse, status_code=status.HTTP_201_CREATED)
@@ -229,10 +261,10 @@ async def create_channel(
     )
     
     session.add(channel)
+    # Defaults are client-side and the id comes back with the INSERT
     await session.flush()
-    await session.refresh(channel)
     
-    return ChannelResponse.model_validate(channel)
+    return _channel_response(channel)
 
 
 @router.patch("/{channel_id}", response_model=ChannelResponse)
@@ -269,10 +301,11 @@ async def update_channel(
     for field, value in update_data.items():
         setattr(channel, field, value)
     
-    await session.flush()
-    await session.refresh(channel)
+    # Commit before bumping so no reader can tag stale names with the new version
+    await session.commit()
+    await bump_version("channels")
     
-    return ChannelResponse.model_validate(channel)
+    return _channel_response(channel)
 
 
 @router.delete("/{channel_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -305,4 +338,7 @@ async def delete_channel(
         )
     
     await session.delete(channel)
+    await session.commit()
+    # Subscriptions cascade with the channel
+    await bump_version("channels")
     return None
@@ -5,14 +5,26 @@ import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, Request, Response, Query, HTTPException
-from fastapi_cache.decorator import cache
+import orjson
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session, async_session_maker
+from app.models import Signal, Channel, Token
+from app.models.tracked_token import TrackedToken
 from app.services.analytics_service import AnalyticsService
+from app.services.market_service import market_service
+from app.services.coingecko_service import (
+    coingecko_service,
+    downsample_ohlc,
+    ohlc_to_candles,
+)
+from app.services.token_tracker import token_tracker
 from app.auth import verify_websocket_token
 from app.services.websocket_manager import manager
-from app.cache import custom_key_builder
+from app.cache import cache, custom_key_builder, get_redis
+from app.responses import ORJSONResponse
+from app.utils.helpers import iso_now
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +41,38 @@ ALLOWED_WS_ORIGINS = [
 ]
 
 
+# Pre-rendered WebSocket frames. Clients JSON.parse text frames, so these are
+# kept as str and sent with send_text (binary frames would arrive as Blobs).
+_WELCOME_TEMPLATE = (
+    '{"type":"connected",'
+    '"message":"Welcome to Crypto Signal Aggregator live stream",'
+    '"timestamp":"%s"}'
+)
+_PONG_TEMPLATE = '{"type":"pong","timestamp":"%s"}'
+_SUBSCRIBED_TOKEN_TEMPLATE = '{"type":"subscribed","sub_type":"token","value":%s}'
+_SUBSCRIBED_CHANNEL_TEMPLATE = '{"type":"subscribed","sub_type":"channel","value":%s}'
+_UNSUBSCRIBED_TOKEN_TEMPLATE = '{"type":"unsubscribed","sub_type":"token","value":%s}'
+_UNSUBSCRIBED_CHANNEL_TEMPLATE = '{"type":"unsubscribed","sub_type":"channel","value":%s}'
+_INVALID_JSON_FRAME = '{"type":"error","message":"Invalid JSON message"}'
+
+# (timestamp string, rendered pong frame) — thousands of pings/s share one str
+_pong_frame = ("", "")
+
+
+def _pong() -> str:
+    """Return the pong frame, re-rendered at most once per second."""
+    global _pong_frame
+    now = iso_now()
+    if _pong_frame[0] is not now:
+        _pong_frame = (now, _PONG_TEMPLATE % now)
+    return _pong_frame[1]
+
+
+def _ack(template: str, value: str) -> str:
+    """Render a subscribe/unsubscribe ACK with a JSON-escaped value."""
+    return template % orjson.dumps(value).decode()
+
+
 @router.get("/market")
 @cache(expire=60, key_builder=custom_key_builder)
 async def get_market_data(
@@ -44,17 +88,15 @@ async def get_market_data(
 
     No authentication required. Data from CoinGecko free API.
     """
-    from app.services.market_service import market_service
-
     coins = await market_service.get_top_coins(per_page=limit)
     global_stats = await market_service.get_global_stats()
 
-    return {
+    return ORJSONResponse({
         "coins": coins,
         "global": global_stats,
         "count": len(coins),
-        "timestamp": datetime.utcnow().isoformat(),
-    }
+        "timestamp": iso_now(),
+    })
 
 
 @router.get("/trending")
@@ -69,8 +111,6 @@ async def get_trending_tokens(
     Get trending tokens — combines CoinGecko market trending
     with signal-based trending from Telegram channels.
     """
-    from app.services.market_service import market_service
-
     # 1) CoinGecko trending (real market data with prices)
     market_trending = await market_service.get_trending_coins()
 
@@ -79,13 +119,13 @@ async def get_trending_tokens(
     signal_result = await analytics.get_trending_tokens(hours=hours)
     signal_trending = signal_result.get("trending", [])
 
-    return {
+    return ORJSONResponse({
         "trending": market_trending,
         "signal_trending": signal_trending,
         "total_signals_24h": signal_result.get("total_signals_24h", 0),
         "most_active_channels": signal_result.get("most_active_channels", []),
-        "timestamp": datetime.utcnow().isoformat(),
-    }
+        "timestamp": iso_now(),
+    })
 
 
 @router.get("/ohlc/{symbol}")
@@ -95,6 +135,7 @@ async def get_ohlc_data(
     response: Response,
     symbol: str,
     days: str = Query(default="7"),
+    downsample: int = Query(default=0, ge=0, le=5000, description="Max candles to return (0 = all)"),
 ):
     """
     Get OHLC candlestick data for any token symbol.
@@ -105,6 +146,8 @@ async def get_ohlc_data(
     - days=1  → 30-min candles (~48 candles)
     - days=7-30 → 4-hour candles
     - days=31+ → 4-day candles (CoinGecko behavior)
+    - downsample=N → merge adjacent candles so at most N are returned
+      (first open, max high, min low, last close per bucket)
 
     No authentication required.
 
@@ -112,8 +155,6 @@ async def get_ohlc_data(
     Errors raise HTTPException which bypasses the @cache decorator,
     allowing immediate retries.
     """
-    from app.services.coingecko_service import coingecko_service
-    
     # Handle 'max' or numeric days
     # Note: CoinGecko Free Tier now limits OHLC to 365 days max.
     if days == "max":
@@ -129,7 +170,7 @@ async def get_ohlc_data(
             days_param = 7
 
     try:
-        candles = await coingecko_service.get_ohlc(symbol, days=days_param)
+        ohlc = await coingecko_service.get_ohlc_array(symbol, days=days_param)
     except Exception as e:
         logger.warning(f"OHLC fetch failed for {symbol}: {e}")
         raise HTTPException(
@@ -137,19 +178,23 @@ async def get_ohlc_data(
             detail=f"Chart data temporarily unavailable for {symbol.upper()}. Try again shortly.",
         )
 
-    if not candles:
+    if not len(ohlc):
         raise HTTPException(
             status_code=404,
             detail=f"No chart data found for {symbol.upper()}. Token may not be listed on CoinGecko.",
         )
 
-    return {
+    if downsample:
+        ohlc = downsample_ohlc(ohlc, downsample)
+    candles = ohlc_to_candles(ohlc)
+
+    return ORJSONResponse({
         "symbol": symbol.upper(),
         "candles": candles,
         "days": days_param,
         "count": len(candles),
-        "timestamp": datetime.utcnow().isoformat(),
-    }
+        "timestamp": iso_now(),
+    })
 
 
 @router.get("/sentiment")
@@ -174,7 +219,7 @@ async def get_market_sentiment(
     """
     analytics = AnalyticsService(session)
     result = await analytics.get_market_sentiment(hours=hours)
-    return result
+    return ORJSONResponse(result)
 
 
 @router.get("/stats")
@@ -189,10 +234,6 @@ async def get_live_stats(
 
     Returns fields matching frontend StatsCards expectations.
     """
-    from sqlalchemy import select, func
-    from app.models import Signal, Channel, Token
-    from app.models.tracked_token import TrackedToken
-
     now = datetime.utcnow()
 
     # Get counts
@@ -220,9 +261,9 @@ async def get_live_stats(
 
     # Success rate and avg ROI from recent signals
     recent_result = await session.execute(
-        select(Signal).where(Signal.timestamp >= day_ago)
+        select(Signal.success, Signal.roi_percent).where(Signal.timestamp >= day_ago)
     )
-    recent_signals = recent_result.scalars().all()
+    recent_signals = recent_result.all()
 
     success_count = sum(1 for s in recent_signals if s.success)
     roi_values = [s.roi_percent for s in recent_signals if s.roi_percent is not None]
@@ -234,7 +275,7 @@ async def get_live_stats(
     total_toks = token_count.scalar() or 0
     tracked = tracked_count.scalar() or 0
 
-    return {
+    return ORJSONResponse({
         # Fields matching StatsCards component
         "total_signals": total_sigs,
         "active_channels": active_chans,
@@ -249,7 +290,7 @@ async def get_live_stats(
         "websocket_connections": manager.connection_count,
         "timestamp": now.isoformat(),
         "status": "healthy",
-    }
+    })
 
 
 @router.websocket("/stream")
@@ -286,19 +327,12 @@ async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket, user_id=user.id if user else None)
     logger.info(f"WebSocket connected (user={user.username if user else 'anon'}). Total connections: {manager.connection_count}")
     
-    # Client subscriptions
-    subscriptions = {
-        "tokens": set(),
-        "channels": set(),
-    }
+    # Client subscriptions (token bitmask/overflow set + channel names), owned by the manager
+    subscriptions = manager.get_subscriptions(websocket)
     
     # Send welcome message
     try:
-        await websocket.send_json({
-            "type": "connected",
-            "message": "Welcome to Crypto Signal Aggregator live stream",
-            "timestamp": datetime.utcnow().isoformat(),
-        })
+        await websocket.send_text(_WELCOME_TEMPLATE % iso_now())
     except Exception as e:
         logger.error(f"Failed to send welcome message: {e}")
         manager.disconnect(websocket)
@@ -330,44 +364,24 @@ async def websocket_endpoint(websocket: WebSocket):
                 
                 if action == "subscribe":
                     if sub_type == "token" and value:
-                        subscriptions["tokens"].add(value)
-                        await websocket.send_json({
-                            "type": "subscribed",
-                            "sub_type": "token",
-                            "value": value,
-                        })
+                        if manager.subscribe_token(websocket, value):
+                            await websocket.send_text(_ack(_SUBSCRIBED_TOKEN_TEMPLATE, value))
                     elif sub_type == "channel" and value:
                         subscriptions["channels"].add(value)
-                        await websocket.send_json({
-                            "type": "subscribed",
-                            "sub_type": "channel",
-                            "value": value,
-                        })
+                        await websocket.send_text(_ack(_SUBSCRIBED_CHANNEL_TEMPLATE, value))
                 
                 elif action == "unsubscribe":
-                    if sub_type == "token" and value in subscriptions["tokens"]:
-                        subscriptions["tokens"].discard(value)
-                        await websocket.send_json({
-                            "type": "unsubscribed",
-                            "sub_type": "token",
-                            "value": value,
-                        })
+                    if sub_type == "token" and value and manager.unsubscribe_token(websocket, value):
+                        await websocket.send_text(_ack(_UNSUBSCRIBED_TOKEN_TEMPLATE, value))
                     elif sub_type == "channel" and value in subscriptions["channels"]:
                         subscriptions["channels"].discard(value)
-                        await websocket.send_json({
-                            "type": "unsubscribed",
-                            "sub_type": "channel",
-                            "value": value,
-                        })
+                        await websocket.send_text(_ack(_UNSUBSCRIBED_CHANNEL_TEMPLATE, value))
                 
                 elif action == "ping":
-                    await websocket.send_json({"type": "pong", "timestamp": datetime.utcnow().isoformat()})
+                    await websocket.send_text(_pong())
                     
             except json.JSONDecodeError:
-                await websocket.send_json({
-                    "type": "error",
-                    "message": "Invalid JSON message",
-                })
+                await websocket.send_text(_INVALID_JSON_FRAME)
     
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected. Remaining connections: {manager.connection_count - 1}")
@@ -385,8 +399,125 @@ async def websocket_endpoint(websocket: WebSocket):
             price_task.cancel()
 
 
+# Server-wide sentiment/trending snapshots. One refresh loop renders each
+# frame on its interval and publishes it to Redis (shared across workers)
+# and to a process-local fallback; per-connection tasks only read them.
+SENTIMENT_SNAPSHOT_KEY = "live:sentiment"
+TRENDING_SNAPSHOT_KEY = "live:trending"
+SENTIMENT_REFRESH_SECONDS = 30
+TRENDING_REFRESH_SECONDS = 60
+
+_local_snapshots: Dict[str, str] = {}
+
+
+async def _publish_snapshot(key: str, frame: dict, ttl: int):
+    """Render *frame* once and store it for every WebSocket task to reuse."""
+    raw = orjson.dumps(frame)
+    _local_snapshots[key] = raw.decode()
+    redis = get_redis()
+    if redis is not None:
+        try:
+            await redis.set(key, raw, ex=ttl)
+        except Exception as e:
+            logger.debug(f"Failed to publish {key} snapshot: {e}")
+
+
+async def _get_snapshot(key: str) -> Optional[str]:
+    """Get the latest rendered snapshot frame, preferring Redis."""
+    redis = get_redis()
+    if redis is not None:
+        try:
+            raw = await redis.get(key)
+            if raw is not None:
+                return raw.decode() if isinstance(raw, bytes) else raw
+        except Exception as e:
+            logger.debug(f"Failed to read {key} snapshot: {e}")
+    return _local_snapshots.get(key)
+
+
+async def _refresh_sentiment_snapshot():
+    """Compute the sentiment frame from the DB and publish it."""
+    async with async_session_maker() as session:
+        analytics = AnalyticsService(session)
+        sentiment_data = await analytics.get_market_sentiment(hours=24)
+    await _publish_snapshot(
+        SENTIMENT_SNAPSHOT_KEY,
+        {
+            "type": "sentiment_update",
+            "timestamp": iso_now(),
+            "data": {
+                "overall": sentiment_data.get("overall_sentiment", "NEUTRAL"),
+                "score": sentiment_data.get("sentiment_score", 0),
+            },
+        },
+        ttl=SENTIMENT_REFRESH_SECONDS + 5,
+    )
+
+
+async def _refresh_trending_snapshot():
+    """Compute the trending frame from the DB + market prices and publish it."""
+    async with async_session_maker() as session:
+        analytics = AnalyticsService(session)
+        trending_data = await analytics.get_trending_tokens(hours=24)
+    top_tokens = []
+    # Handle response format (it returns a dict with "trending" key)
+    trending_list = trending_data.get("trending", []) if isinstance(trending_data, dict) else []
+
+    # Enrich with real prices
+    if trending_list:
+        try:
+            symbols = [t.get("symbol", "") for t in trending_list[:5]]
+            price_data = await market_service.get_prices_for_symbols(symbols)
+        except Exception:
+            price_data = {}
+    else:
+        price_data = {}
+
+    for token in trending_list[:5]:
+        sym = token.get("symbol", "")
+        pd = price_data.get(sym, {})
+        top_tokens.append({
+            "symbol": sym,
+            "count": token.get("signal_count_24h", 0),
+            "change": pd.get("price_change_24h") or token.get("price_change_24h", 0),
+            "price": pd.get("price"),
+        })
+    await _publish_snapshot(
+        TRENDING_SNAPSHOT_KEY,
+        {
+            "type": "trending_update",
+            "timestamp": iso_now(),
+            "data": {"top_tokens": top_tokens},
+        },
+        ttl=TRENDING_REFRESH_SECONDS + 5,
+    )
+
+
+async def run_live_snapshot_refresh():
+    """
+    Refresh the shared sentiment/trending snapshots forever.
+
+    Started once per process from the app lifespan, so DB load for the
+    live stream is constant regardless of how many clients are connected.
+    """
+    elapsed = 0
+    while True:
+        if elapsed % SENTIMENT_REFRESH_SECONDS == 0:
+            try:
+                await _refresh_sentiment_snapshot()
+            except Exception as e:
+                logger.debug(f"Failed to refresh sentiment snapshot: {e}")
+        if elapsed % TRENDING_REFRESH_SECONDS == 0:
+            try:
+                await _refresh_trending_snapshot()
+            except Exception as e:
+                logger.debug(f"Failed to refresh trending snapshot: {e}")
+        await asyncio.sleep(10)
+        elapsed += 10
+
+
 async def send_periodic_updates(websocket: WebSocket, subscriptions: dict):
-    """Send periodic updates to a WebSocket client using real DB data."""
+    """Forward the shared sentiment/trending snapshots to a WebSocket client."""
     sentiment_counter = 0
     trending_counter = 0
     
@@ -397,74 +528,35 @@ async def send_periodic_updates(websocket: WebSocket, subscriptions: dict):
             sentiment_counter += 10
             trending_counter += 10
             
-            # Send sentiment update every 30 seconds (from real data)
-            if sentiment_counter >= 30:
+            # Send sentiment update every 30 seconds
+            if sentiment_counter >= SENTIMENT_REFRESH_SECONDS:
                 sentiment_counter = 0
-                try:
-                    async with async_session_maker() as session:
-                        analytics = AnalyticsService(session)
-                        sentiment_data = await analytics.get_market_sentiment(hours=24)
-                        await websocket.send_json({
-                            "type": "sentiment_update",
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "data": {
-                                "overall": sentiment_data.get("overall_sentiment", "NEUTRAL"),
-                                "score": sentiment_data.get("sentiment_score", 0),
-                            }
-                        })
-                except Exception as e:
-                    logger.debug(f"Failed to send sentiment update: {e}")
+                frame = await _get_snapshot(SENTIMENT_SNAPSHOT_KEY)
+                if frame and not manager.send(websocket, frame, coalesce_key="sentiment"):
+                    break
             
-            # Send trending update every 60 seconds (from real data)
-            if trending_counter >= 60:
+            # Send trending update every 60 seconds
+            if trending_counter >= TRENDING_REFRESH_SECONDS:
                 trending_counter = 0
-                try:
-                    async with async_session_maker() as session:
-                        analytics = AnalyticsService(session)
-                        trending_data = await analytics.get_trending_tokens(hours=24)
-                        top_tokens = []
-                        # Handle response format (it returns a dict with "trending" key)
-                        trending_list = trending_data.get("trending", []) if isinstance(trending_data, dict) else []
-
-                        # Enrich with real prices
-                        if trending_list:
-                            try:
-                                from app.services.market_service import market_service
-                                symbols = [t.get("symbol", "") for t in trending_list[:5]]
-                                price_data = await market_service.get_prices_for_symbols(symbols)
-                            except Exception:
-                                price_data = {}
-                        else:
-                            price_data = {}
-
-                        for token in trending_list[:5]:
-                            sym = token.get("symbol", "")
-                            pd = price_data.get(sym, {})
-                            top_tokens.append({
-                                "symbol": sym,
-                                "count": token.get("signal_count_24h", 0),
-                                "change": pd.get("price_change_24h") or token.get("price_change_24h", 0),
-                                "price": pd.get("price"),
-                            })
-                        await websocket.send_json({
-                            "type": "trending_update",
-                            "timestamp": datetime.utcnow().isoformat(),
-                            "data": {"top_tokens": top_tokens},
-                        })
-                except Exception as e:
-                    logger.debug(f"Failed to send trending update: {e}")
+                frame = await _get_snapshot(TRENDING_SNAPSHOT_KEY)
+                if frame and not manager.send(websocket, frame, coalesce_key="trending"):
+                    break
                 
         except Exception:
             break
 
 
 async def broadcast_new_signal(signal_data: dict):
-    """Broadcast a new signal to all connected WebSocket clients."""
-    await manager.broadcast({
-        "type": "new_signal",
-        "data": signal_data,
-        "timestamp": datetime.utcnow().isoformat(),
-    })
+    """Broadcast a new signal to all subscribed WebSocket clients."""
+    await manager.broadcast_signal(
+        {
+            "type": "new_signal",
+            "data": signal_data,
+            "timestamp": iso_now(),
+        },
+        token_symbol=signal_data.get("token_symbol"),
+        channel_name=signal_data.get("channel_name"),
+    )
 
 
 async def send_tracked_price_updates(websocket: WebSocket, user_id: int):
@@ -472,20 +564,19 @@ async def send_tracked_price_updates(websocket: WebSocket, user_id: int):
     Send realtime price updates for a user's tracked tokens.
     Reads from the centralized TokenPriceTracker cache.
     """
-    from app.services.token_tracker import token_tracker
-    
     while True:
         try:
             await asyncio.sleep(15)  # Send price updates every 15 seconds
             
             prices = token_tracker.get_prices_for_user(user_id)
             if prices:
-                await websocket.send_json({
+                if not manager.send(websocket, {
                     "type": "tracked_price_update",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": iso_now(),
                     "data": {
                         "tokens": prices,
                     }
-                })
+                }, coalesce_key="tracked_price_update"):
+                    break
         except Exception:
             break
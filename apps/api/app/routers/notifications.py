@@ -15,6 +15,7 @@ from app.database import get_session
 from app.auth import get_current_user
 from app.models.user import User
 from app.models.notification import Notification
+from app.responses import ORJSONResponse
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
@@ -63,7 +64,27 @@ class NotificationPreferencesRequest(BaseModel):
 
 # ---- Routes ----
 
-@router.get("/", response_model=NotificationListResponse)
+# Columns returned by the list endpoint (mirrors NotificationResponse)
+_LIST_COLUMNS = (
+    Notification.id,
+    Notification.type,
+    Notification.title,
+    Notification.message,
+    Notification.data,
+    Notification.is_read,
+    Notification.signal_id,
+    Notification.token_symbol,
+    Notification.contract_address,
+    Notification.channel_name,
+    Notification.created_at,
+)
+
+
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": NotificationListResponse}},
+)
 async def get_notifications(
     limit: int = Query(50, le=100),
     offset: int = Query(0),
@@ -72,18 +93,21 @@ async def get_notifications(
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    """Get paginated notifications for the current user."""
-    base_query = select(Notification).where(Notification.user_id == current_user.id)
+    """
+    Get paginated notifications for the current user.
+
+    Rows are selected as plain column mappings and serialized by orjson,
+    skipping per-row Pydantic model construction.
+    """
+    filters = [Notification.user_id == current_user.id]
 
     if unread_only:
-        base_query = base_query.where(Notification.is_read == False)
+        filters.append(Notification.is_read == False)
     if type:
-        base_query = base_query.where(Notification.type == type)
+        filters.append(Notification.type == type)
 
     # Count total
-    count_q = select(func.count()).select_from(
-        base_query.subquery()
-    )
+    count_q = select(func.count()).select_from(Notification).where(*filters)
     total = (await db.execute(count_q)).scalar() or 0
 
     # Count unread
@@ -95,19 +119,20 @@ async def get_notifications(
 
     # Fetch page
     items_q = (
-        base_query
+        select(*_LIST_COLUMNS)
+        .where(*filters)
         .order_by(desc(Notification.created_at))
         .offset(offset)
         .limit(limit)
     )
     result = await db.execute(items_q)
-    notifications = result.scalars().all()
+    notifications = [dict(row) for row in result.mappings()]
 
-    return NotificationListResponse(
-        notifications=notifications,
-        total=total,
-        unread_count=unread_count,
-    )
+    return ORJSONResponse({
+        "notifications": notifications,
+        "total": total,
+        "unread_count": unread_count,
+    })
 
 
 @router.get("/badge", response_model=NotificationBadge)
@@ -131,6 +156,9 @@ async def mark_notifications_read(
     current_user: User = Depends(get_current_user),
 ):
     """Mark specific notifications as read."""
+    if not body.notification_ids:
+        return {"success": True, "marked": 0}
+
     stmt = (
         update(Notification)
         .where(
@@ -138,6 +166,7 @@ async def mark_notifications_read(
             Notification.id.in_(body.notification_ids),
         )
         .values(is_read=True)
+        .execution_options(synchronize_session=False)
     )
     await db.execute(stmt)
     await db.commit()
@@ -157,6 +186,7 @@ async def mark_all_notifications_read(
             Notification.is_read == False,
         )
         .values(is_read=True)
+        .execution_options(synchronize_session=False)
     )
     result = await db.execute(stmt)
     await db.commit()
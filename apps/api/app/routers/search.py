@@ -1,14 +1,14 @@
 """Search API router - CoinGecko-powered token search with Moralis address fallback."""
+import asyncio
 import logging
-import re
-from typing import Any, Optional, List, Tuple
+from typing import Any, Awaitable, Callable, Dict, Optional, List, Set, Tuple
 from fastapi import APIRouter, Query, HTTPException, Request, Response
-from fastapi_cache.decorator import cache
 from pydantic import BaseModel
 
 from app.services.coingecko_service import coingecko_service
 # from app.services.moralis_service import moralis_service
-from app.cache import custom_key_builder
+from app.cache import cache, custom_key_builder, get_redis
+from app.responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +18,14 @@ router = APIRouter(prefix="/search", tags=["Search"])
 # Address detection helpers
 # -------------------------------------------------------------------
 
-# Regex patterns for known address formats
-_EVM_RE = re.compile(r"^0x[0-9a-fA-F]{40}$")          # Ethereum, BSC, Polygon, etc.
-_TRON_RE = re.compile(r"^T[1-9A-HJ-NP-Za-km-z]{33}$")  # TRON base58check, 34 chars
-_SOL_RE = re.compile(r"^[1-9A-HJ-NP-Za-km-z]{32,44}$")  # Solana base58, 32-44 chars
+# Base58 alphabet (no 0, O, I, l) used by TRON (34 chars, "T" prefix) and
+# Solana (32-44 chars). Deleting these bytes with bytes.translate leaves
+# nothing for a valid string — a single C-level pass, faster than a regex.
+_BASE58_ALPHABET = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+# Every supported address is 32-44 chars (EVM 42, TRON 34, Solana 32-44)
+_MIN_ADDRESS_LEN = 32
+_MAX_ADDRESS_LEN = 44
 
 # Map detected address type → list of CoinGecko platform ids to try
 _PLATFORM_MAP: dict[str, list[str]] = {
@@ -31,22 +35,66 @@ _PLATFORM_MAP: dict[str, list[str]] = {
 }
 
 
+def _is_base58(value: str) -> bool:
+    """Return True if *value* consists only of base58 characters."""
+    return value.isascii() and not value.encode("ascii").translate(None, _BASE58_ALPHABET)
+
+
+def _is_evm(value: str) -> bool:
+    """
+    Return True if *value* is an EVM address (Ethereum, BSC, Polygon, etc.).
+
+    ``bytes.fromhex`` validates the hex body in C. It skips whitespace, so
+    the decoded length is checked: 20 bytes needs all 40 chars to be hex.
+    """
+    if len(value) != 42 or not value.startswith("0x"):
+        return False
+    try:
+        return len(bytes.fromhex(value[2:])) == 20
+    except ValueError:
+        return False
+
+
+def _check_evm(query: str) -> Optional[str]:
+    """42-char candidates: ``0x`` + 40 hex digits."""
+    return "evm" if _is_evm(query) else None
+
+
+def _check_tron(query: str) -> Optional[str]:
+    """34-char candidates: ``T`` + 33 base58 chars."""
+    return "tron" if query[0] == "T" and _is_base58(query) else None
+
+
+# Fixed-length address families, keyed by length. Anything else of address
+# length (or a miss here) falls through to the Solana base58 check.
+_ADDR_DISPATCH = {
+    42: _check_evm,
+    34: _check_tron,
+}
+
+
 def _detect_address_type(query: str) -> Optional[str]:
     """Return the address family if *query* looks like a contract address, else None."""
-    if _EVM_RE.match(query):
-        return "evm"
-    if _TRON_RE.match(query):
-        return "tron"
-    # Solana addresses are base58, typically 43-44 chars, no 0x prefix
-    if _SOL_RE.match(query) and len(query) >= 32:
-        # Heuristic: if it's all alphanumeric and >= 32 chars, likely an address
-        # But short queries like "bitcoin" are also alphanumeric — require >= 32 chars
-        return "solana"
-    return None
+    n = len(query)
+    # Names/symbols are by far the most common queries — reject them on length
+    if n < _MIN_ADDRESS_LEN or n > _MAX_ADDRESS_LEN:
+        return None
+    check = _ADDR_DISPATCH.get(n)
+    if check is not None:
+        family = check(query)
+        if family:
+            return family
+    # Any other base58 string of address length is treated as Solana
+    return "solana" if _is_base58(query) else None
 
 
 class TokenSearchResult(BaseModel):
-    """Token search result."""
+    """
+    Token search result.
+
+    Built with ``model_construct`` from service data whose numeric fields
+    are already coerced by ``_safe_float``, so validation is skipped.
+    """
     symbol: str
     name: str
     address: str
@@ -69,39 +117,221 @@ def _safe_float(val: Any) -> Optional[float]:
     """Convert a value to float or return None."""
     if val is None:
         return None
+    # JSON-decoded prices are nearly always floats already
+    if type(val) is float:
+        return val
     try:
         return float(val)
     except (ValueError, TypeError):
         return None
 
 
+def _token_row(token: dict, chain: str) -> Dict[str, Any]:
+    """
+    Read one service token dict into ``TokenSearchResult`` fields.
+
+    Missing or null text fields fall back to defaults; *chain* is used
+    when the token carries none.
+    """
+    g = token.get
+    symbol = g("symbol") or ""
+    return {
+        "symbol": symbol,
+        "name": g("name") or symbol,
+        "address": g("address") or "",
+        "chain": g("chain") or chain,
+        "price_usd": _safe_float(g("price_usd")),
+        "price_change_24h": _safe_float(g("price_change_24h")),
+        "logo": g("logo"),
+        "decimals": g("decimals"),
+        "market_cap_rank": g("market_cap_rank"),
+    }
+
+
 def _moralis_to_results(
     raw: List[dict], limit: int
 ) -> List[TokenSearchResult]:
     """Convert Moralis raw dicts into TokenSearchResult list."""
     results: List[TokenSearchResult] = []
-    seen: set = set()
+    seen: Set[Tuple[str, str, str]] = set()
     for token in raw:
-        key = f"{token.get('symbol', '')}_{token.get('chain', '')}_{token.get('address', '')}"
+        row = _token_row(token, "unknown")
+        key = (row["symbol"], row["chain"], row["address"])
         if key in seen:
             continue
         seen.add(key)
-        results.append(TokenSearchResult(
-            symbol=token.get("symbol", ""),
-            name=token.get("name", token.get("symbol", "")),
-            address=token.get("address", ""),
-            chain=token.get("chain", "unknown"),
-            price_usd=_safe_float(token.get("price_usd")),
-            price_change_24h=_safe_float(token.get("price_change_24h")),
-            logo=token.get("logo"),
-            decimals=token.get("decimals"),
-        ))
+        results.append(TokenSearchResult.model_construct(**row))
         if len(results) >= limit:
             break
     return results
 
 
-@router.get("/tokens", response_model=SearchResponse)
+def _search_response(query: str, results: List[TokenSearchResult]) -> ORJSONResponse:
+    """Serialize search results with orjson, bypassing response-model re-validation."""
+    return ORJSONResponse({
+        "query": query,
+        "results": [r.model_dump() for r in results],
+        "count": len(results),
+    })
+
+
+# In-flight CoinGecko calls by key → [shared task, number of waiters].
+# Concurrent identical requests (a cache-miss burst on a popular token)
+# await one upstream call instead of each hitting the rate-limited API.
+_inflight: Dict[Tuple, list] = {}
+
+
+async def _single_flight(key: Tuple, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Run ``factory()`` once per *key* at a time and share its result.
+
+    Each caller awaits the shared task through ``asyncio.shield`` so one
+    caller being cancelled doesn't fail the others; the task itself is
+    only cancelled once its last waiter has gone.
+    """
+    entry = _inflight.get(key)
+    if entry is None:
+        task = asyncio.ensure_future(factory())
+        entry = _inflight[key] = [task, 0]
+        task.add_done_callback(
+            lambda _: _inflight.pop(key) if _inflight.get(key) is entry else None
+        )
+    entry[1] += 1
+    try:
+        return await asyncio.shield(entry[0])
+    finally:
+        entry[1] -= 1
+        if not entry[1] and not entry[0].done():
+            entry[0].cancel()
+
+
+async def _lookup_contract(address: str, platforms: List[str]) -> Optional[dict]:
+    """
+    Look *address* up on every platform concurrently; return the hit from
+    the earliest platform in *platforms* that has one.
+
+    Results are awaited in platform order, so a faster lower-priority hit
+    never wins; once a hit is taken the remaining lookups are cancelled.
+    """
+    tasks = [
+        asyncio.create_task(_single_flight(
+            ("contract", platform, address),
+            lambda platform=platform: coingecko_service.lookup_by_contract(address, platform),
+        ))
+        for platform in platforms
+    ]
+    try:
+        for task in tasks:
+            token = await task
+            if token:
+                return token
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# -------------------------------------------------------------------
+# Contract address → platform index
+# -------------------------------------------------------------------
+
+# Built from one /coins/list call so an address lookup can go straight to
+# the platform it lives on instead of walking _PLATFORM_MAP one rate-limited
+# call at a time. Shared through a Redis hash; process memory is the
+# fallback when Redis is unavailable.
+CONTRACT_INDEX_KEY = "cg:contract_index"
+CONTRACT_INDEX_TTL = 12 * 3600  # seconds
+CONTRACT_INDEX_REFRESH_SECONDS = 6 * 3600
+_CONTRACT_INDEX_CHUNK = 5_000
+
+_local_contract_index: Dict[str, str] = {}
+
+
+def _contract_index_key(address: str) -> str:
+    """EVM addresses are case-insensitive hex; base58 ones are not."""
+    return address.lower() if address.startswith("0x") else address
+
+
+async def _indexed_platform(address: str) -> Optional[str]:
+    """Get the platform *address* is listed on, or None if it isn't indexed."""
+    key = _contract_index_key(address)
+    redis = get_redis()
+    if redis is not None:
+        try:
+            platform = await redis.hget(CONTRACT_INDEX_KEY, key)
+            if platform is not None:
+                return platform.decode() if isinstance(platform, bytes) else platform
+        except Exception as e:
+            logger.debug(f"Failed to read contract index: {e}")
+    return _local_contract_index.get(key)
+
+
+def _platform_order(platforms: List[str], indexed: Optional[str]) -> List[str]:
+    """Move the indexed platform to the front, keeping the rest as a fallback."""
+    if indexed is None or indexed not in platforms:
+        return platforms
+    return [indexed] + [p for p in platforms if p != indexed]
+
+
+async def _refresh_contract_index():
+    """Rebuild the contract index from CoinGecko and publish it."""
+    redis = get_redis()
+    if redis is not None:
+        # Another worker refreshed it recently enough
+        ttl = await redis.ttl(CONTRACT_INDEX_KEY)
+        if ttl > CONTRACT_INDEX_TTL - CONTRACT_INDEX_REFRESH_SECONDS:
+            return
+
+    platforms = list(dict.fromkeys(p for group in _PLATFORM_MAP.values() for p in group))
+    index = await coingecko_service.get_contract_index(platforms)
+    if not index:
+        return
+
+    if redis is None:
+        _local_contract_index.clear()
+        _local_contract_index.update(index)
+        return
+
+    # Fill a scratch key and swap it in, so readers never see a partial index
+    staging = f"{CONTRACT_INDEX_KEY}:staging"
+    items = list(index.items())
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.delete(staging)
+        for i in range(0, len(items), _CONTRACT_INDEX_CHUNK):
+            pipe.hset(staging, mapping=dict(items[i:i + _CONTRACT_INDEX_CHUNK]))
+        pipe.expire(staging, CONTRACT_INDEX_TTL)
+        pipe.rename(staging, CONTRACT_INDEX_KEY)
+        await pipe.execute()
+
+
+async def run_contract_index_refresh():
+    """
+    Refresh the contract index forever.
+
+    Started once per process from the app lifespan; the Redis TTL check
+    keeps the 1 MB /coins/list download to one per refresh period overall.
+    """
+    while True:
+        try:
+            await _refresh_contract_index()
+        except Exception as e:
+            logger.debug(f"Failed to refresh contract index: {e}")
+        await asyncio.sleep(CONTRACT_INDEX_REFRESH_SECONDS)
+
+
+def _contract_result(token: dict, address: str) -> TokenSearchResult:
+    """Build a search result from a CoinGecko contract lookup."""
+    row = _token_row(token, "unknown")
+    row["address"] = address
+    return TokenSearchResult.model_construct(**row)
+
+
+@router.get(
+    "/tokens",
+    response_model=None,
+    responses={200: {"model": SearchResponse}},
+)
 @cache(expire=30, key_builder=custom_key_builder)  # 30 second cache
 async def search_tokens(
     request: Request,
@@ -121,24 +351,15 @@ async def search_tokens(
 
     # ---- Contract address lookup ------------------------------------
     if addr_type:
-        platforms = _PLATFORM_MAP.get(addr_type, [])
+        platforms = _platform_order(
+            _PLATFORM_MAP.get(addr_type, []), await _indexed_platform(query)
+        )
 
         # 1. Try CoinGecko contract lookup (works for any chain)
-        for platform in platforms:
-            token = await coingecko_service.lookup_by_contract(query, platform)
-            if token:
-                result = TokenSearchResult(
-                    symbol=token.get("symbol", ""),
-                    name=token.get("name", ""),
-                    address=query,
-                    chain=token.get("chain", platform),
-                    price_usd=_safe_float(token.get("price_usd")),
-                    price_change_24h=_safe_float(token.get("price_change_24h")),
-                    logo=token.get("logo"),
-                    decimals=token.get("decimals"),
-                    market_cap_rank=token.get("market_cap_rank"),
-                )
-                return SearchResponse(query=q, results=[result], count=1)
+        token = await _lookup_contract(query, platforms)
+        if token:
+            result = _contract_result(token, query)
+            return _search_response(q, [result])
 
         # 2. Fallback to Moralis for EVM addresses
         # if addr_type == "evm" and moralis_service.is_available:
@@ -151,34 +372,26 @@ async def search_tokens(
         #        logger.debug(f"Moralis address fallback failed: {e}")
 
         # Nothing found for this address
-        return SearchResponse(query=q, results=[], count=0)
+        return _search_response(q, [])
 
     # ---- Name / symbol → CoinGecko ----------------------------------
     try:
-        raw = await coingecko_service.search_tokens(query, limit=limit)
+        raw = await _single_flight(
+            ("search", query.lower(), limit),
+            lambda: coingecko_service.search_tokens(query, limit=limit),
+        )
 
         results: List[TokenSearchResult] = []
-        seen: set = set()
+        seen: Set[Tuple[str, str]] = set()
 
         for token in raw:
-            sym = token.get("symbol", "")
-            name = token.get("name", sym)
-            key = f"{sym}_{name}"
+            row = _token_row(token, "multi")
+            key = (row["symbol"], row["name"])
             if key in seen:
                 continue
             seen.add(key)
 
-            results.append(TokenSearchResult(
-                symbol=sym,
-                name=name,
-                address=token.get("address", ""),
-                chain=token.get("chain", "multi"),
-                price_usd=_safe_float(token.get("price_usd")),
-                price_change_24h=_safe_float(token.get("price_change_24h")),
-                logo=token.get("logo"),
-                decimals=token.get("decimals"),
-                market_cap_rank=token.get("market_cap_rank"),
-            ))
+            results.append(TokenSearchResult.model_construct(**row))
 
             if len(results) >= limit:
                 break
@@ -192,7 +405,7 @@ async def search_tokens(
         #    except Exception:
         #        pass
 
-        return SearchResponse(query=q, results=results, count=len(results))
+        return _search_response(q, results)
 
     except Exception as e:
         # Last resort: try Moralis if CoinGecko errors out
@@ -206,7 +419,11 @@ async def search_tokens(
         raise HTTPException(status_code=500, detail=f"Search failed: {e}")
 
 
-@router.get("/tokens/{address}", response_model=SearchResponse)
+@router.get(
+    "/tokens/{address}",
+    response_model=None,
+    responses={200: {"model": SearchResponse}},
+)
 @cache(expire=30, key_builder=custom_key_builder)  # 30 second cache
 async def get_token_by_address(
     address: str,
@@ -230,27 +447,18 @@ async def get_token_by_address(
         # Trying to use generic search logic which supports contract addresses via CG
         
         # Check if it's an EVM address
-        if _EVM_RE.match(address):
+        if _is_evm(address):
              # Try generic lookup (which uses coingecko_service.lookup_by_contract)
-             platforms = _PLATFORM_MAP.get("evm", [])
-             for platform in platforms:
-                token = await coingecko_service.lookup_by_contract(address, platform)
-                if token:
-                     result = TokenSearchResult(
-                        symbol=token.get("symbol", ""),
-                        name=token.get("name", ""),
-                        address=address,
-                        chain=token.get("chain", platform),
-                        price_usd=_safe_float(token.get("price_usd")),
-                        price_change_24h=_safe_float(token.get("price_change_24h")),
-                        logo=token.get("logo"),
-                        decimals=token.get("decimals"),
-                        market_cap_rank=token.get("market_cap_rank"),
-                    )
-                     return SearchResponse(query=address, results=[result], count=1)
+             platforms = _platform_order(
+                 _PLATFORM_MAP.get("evm", []), await _indexed_platform(address)
+             )
+             token = await _lookup_contract(address, platforms)
+             if token:
+                 result = _contract_result(token, address)
+                 return _search_response(address, [result])
         
         # If nothing found
-        return SearchResponse(query=address, results=[], count=0)
+        return _search_response(address, [])
         
     """
     if not moralis_service.is_available:
@@ -1,9 +1,10 @@
 """Signals API router with caching."""
+import time
 from datetime import datetime
-from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Request, Response
-from fastapi_cache.decorator import cache
-from sqlalchemy import select, func, desc, and_
+from typing import Callable, Optional, List, Set, Tuple
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query, Header, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select, func, desc, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
@@ -15,12 +16,171 @@ from app.schemas.signal import (
     SignalListResponse,
 )
 from app.config import settings
-from app.cache import custom_key_builder
+from app.cache import cache, custom_key_builder
 
 router = APIRouter(prefix="/signals", tags=["Signals"])
 
+# Unfiltered signal total. Counting the whole table is a full scan, and a
+# total that lags by up to a minute is fine for pagination, so it is cached
+# longer than the 15 s page cache.
+_total_cache: dict = {
+    "total": None,
+    "timestamp": 0,
+}
+TOTAL_CACHE_TTL = 60  # seconds
 
-@router.get("", response_model=SignalListResponse)
+
+async def _unfiltered_total(session: AsyncSession) -> int:
+    """Get the total number of signals, cached for TOTAL_CACHE_TTL seconds."""
+    now = time.time()
+    if _total_cache["total"] is None or (now - _total_cache["timestamp"]) >= TOTAL_CACHE_TTL:
+        result = await session.execute(select(func.count(Signal.id)))
+        _total_cache["total"] = result.scalar() or 0
+        _total_cache["timestamp"] = now
+    return _total_cache["total"]
+
+
+# Every token symbol that has at least one signal, refreshed every
+# SYMBOLS_CACHE_TTL seconds. Lookups for symbols outside it are answered
+# without touching the DB; symbols written by this process are added
+# immediately via remember_token_symbol().
+_symbols_cache: dict = {
+    "symbols": None,
+    "timestamp": 0,
+}
+SYMBOLS_CACHE_TTL = 60  # seconds
+
+
+async def _known_symbols(session: AsyncSession) -> Set[str]:
+    """Get the set of token symbols with signals, cached for SYMBOLS_CACHE_TTL seconds."""
+    now = time.time()
+    if _symbols_cache["symbols"] is None or (now - _symbols_cache["timestamp"]) >= SYMBOLS_CACHE_TTL:
+        result = await session.execute(select(Signal.token_symbol).distinct())
+        _symbols_cache["symbols"] = set(result.scalars())
+        _symbols_cache["timestamp"] = now
+    return _symbols_cache["symbols"]
+
+
+def remember_token_symbol(symbol: str) -> None:
+    """Record a newly written token symbol so it's visible before the next refresh."""
+    if _symbols_cache["symbols"] is not None:
+        _symbols_cache["symbols"].add(symbol.upper())
+
+
+# Response fields, resolved once instead of introspecting per row
+_SIGNAL_RESPONSE_FIELDS = tuple(SignalResponse.model_fields)
+
+
+def _signal_response(signal: Signal) -> SignalResponse:
+    """Build a SignalResponse from an ORM row without re-running validation."""
+    return SignalResponse.model_construct(
+        **{field: getattr(signal, field) for field in _SIGNAL_RESPONSE_FIELDS}
+    )
+
+
+# A filter step for _paginate_signals, e.g. ``lambda s: s.where(...)``.
+# Steps are appended to lambda_stmt() statements, so each distinct filter
+# combination is compiled to SQL once and then reused with new parameters.
+SignalFilter = Callable
+
+
+# Serializer for a whole page, compiled once; dumps straight to JSON bytes
+_SIGNAL_PAGE_ADAPTER = TypeAdapter(SignalListResponse)
+
+
+def _signal_list_response(
+    items: List[SignalResponse],
+    total: Optional[int],
+    limit: int,
+    offset: int,
+    has_more: Optional[bool] = None,
+) -> Response:
+    """Serialize a page of signals in pydantic-core, bypassing response-model re-validation."""
+    if has_more is None:
+        has_more = (offset + limit) < total
+    page = SignalListResponse.model_construct(
+        items=items,
+        total=total,
+        limit=limit,
+        offset=offset,
+        has_more=has_more,
+    )
+    return Response(
+        content=_SIGNAL_PAGE_ADAPTER.dump_json(page), media_type="application/json"
+    )
+
+
+async def _paginate_signals(
+    session: AsyncSession,
+    filters: List[SignalFilter],
+    limit: int,
+    offset: int,
+) -> Tuple[List[SignalResponse], int]:
+    """
+    Fetch one page of signals (newest first) together with the total count.
+
+    With filters, the total rides along on every row via ``COUNT(*) OVER()``
+    so a page costs a single round-trip; only a page past the end (no rows
+    to carry the total) needs a separate count. Without filters the total
+    comes from the cached table count instead of scanning every row.
+    Rows are streamed and converted one at a time rather than materialising
+    the ORM result list first.
+    """
+    if not filters:
+        query = lambda_stmt(lambda: select(Signal))
+        query += lambda s: s.order_by(desc(Signal.timestamp)).offset(offset).limit(limit)
+        items = [_signal_response(signal) async for signal in await session.stream_scalars(query)]
+        total = await _unfiltered_total(session)
+        if items:
+            # Never report fewer rows than this page has already proven exist
+            total = max(total, offset + len(items))
+        return items, total
+
+    query = lambda_stmt(lambda: select(Signal, func.count().over().label("total")))
+    for step in filters:
+        query += step
+    query += lambda s: s.order_by(desc(Signal.timestamp)).offset(offset).limit(limit)
+    items: List[SignalResponse] = []
+    total = 0
+    async for signal, total in await session.stream(query):
+        items.append(_signal_response(signal))
+    if items:
+        return items, total
+
+    if not offset:
+        return [], 0
+    count_query = lambda_stmt(lambda: select(func.count(Signal.id)))
+    for step in filters:
+        count_query += step
+    count_result = await session.execute(count_query)
+    return [], count_result.scalar()
+
+
+async def _page_signals(
+    session: AsyncSession,
+    filters: List[SignalFilter],
+    limit: int,
+    offset: int,
+) -> Tuple[List[SignalResponse], bool]:
+    """
+    Fetch one page of signals (newest first) without counting the matches.
+
+    One extra row is requested past the page; whether it comes back is the
+    ``has_more`` flag, so the cost stays O(limit) however many rows match.
+    """
+    query = lambda_stmt(lambda: select(Signal))
+    for step in filters:
+        query += step
+    query += lambda s: s.order_by(desc(Signal.timestamp)).offset(offset).limit(limit + 1)
+    items = [_signal_response(signal) async for signal in await session.stream_scalars(query)]
+    return items[:limit], len(items) > limit
+
+
+@router.get(
+    "",
+    response_model=None,
+    responses={200: {"model": SignalListResponse}},
+)
 @cache(expire=15, key_builder=custom_key_builder)  # 15 second cache
 async def list_signals(
     request: Request,
@@ -33,6 +193,7 @@ async def list_signals(
     success: Optional[bool] = Query(default=None, description="Filter by success status"),
     start_date: Optional[datetime] = Query(default=None, description="Filter by start date"),
     end_date: Optional[datetime] = Query(default=None, description="Filter by end date"),
+    exact_count: bool = Query(default=True, description="Compute the total number of matches"),
     session: AsyncSession = Depends(get_session),
 ):
     """
@@ -46,51 +207,40 @@ async def list_signals(
     - **success**: Filter by success status
     - **start_date**: Filter signals after this date
     - **end_date**: Filter signals before this date
+    - **exact_count**: Set to false to skip counting; `total` is then null and
+      only `has_more` is reported
     """
-    # Build query with filters
-    query = select(Signal)
-    count_query = select(func.count(Signal.id))
-    
-    filters = []
+    # Build filters
+    filters: List[SignalFilter] = []
     
     if channel_id:
-        filters.append(Signal.channel_id == channel_id)
+        filters.append(lambda s: s.where(Signal.channel_id == channel_id))
     
     if token_symbol:
-        filters.append(Signal.token_symbol == token_symbol.upper())
+        symbol_upper = token_symbol.upper()
+        filters.append(lambda s: s.where(Signal.token_symbol == symbol_upper))
     
     if sentiment:
-        filters.append(Signal.sentiment == sentiment.upper())
+        sentiment_upper = sentiment.upper()
+        filters.append(lambda s: s.where(Signal.sentiment == sentiment_upper))
     
     if success is not None:
-        filters.append(Signal.success == success)
+        filters.append(lambda s: s.where(Signal.success == success))
     
     if start_date:
-        filters.append(Signal.timestamp >= start_date)
+        filters.append(lambda s: s.where(Signal.timestamp >= start_date))
     
     if end_date:
-        filters.append(Signal.timestamp <= end_date)
+        filters.append(lambda s: s.where(Signal.timestamp <= end_date))
     
-    if filters:
-        query = query.where(and_(*filters))
-        count_query = count_query.where(and_(*filters))
+    if not exact_count:
+        items, has_more = await _page_signals(session, filters, limit, offset)
+        return _signal_list_response(items, None, limit, offset, has_more)
     
-    # Get total count
-    total_result = await session.execute(count_query)
-    total = total_result.scalar()
+    # Get signals with pagination + total count in one query
+    items, total = await _paginate_signals(session, filters, limit, offset)
     
-    # Get signals with pagination
-    query = query.order_by(desc(Signal.timestamp)).offset(offset).limit(limit)
-    result = await session.execute(query)
-    signals = result.scalars().all()
-    
-    return SignalListResponse(
-        items=[SignalResponse.model_validate(s) for s in signals],
-        total=total,
-        limit=limit,
-        offset=offset,
-        has_more=(offset + limit) < total,
-    )
+    return _signal_list_response(items, total, limit, offset)
 
 
 @router.get("/{signal_id}", response_model=SignalResponse)
@@ -117,10 +267,14 @@ async def get_signal(
             detail=f"Signal with ID {signal_id} not found"
         )
     
-    return SignalResponse.model_validate(signal)
+    return _signal_response(signal)
 
 
-@router.get("/token/{symbol}", response_model=SignalListResponse)
+@router.get(
+    "/token/{symbol}",
+    response_model=None,
+    responses={200: {"model": SignalListResponse}},
+)
 @cache(expire=15, key_builder=custom_key_builder)  # 15 second cache
 async def get_signals_by_token(
     symbol: str,
@@ -139,28 +293,37 @@ async def get_signals_by_token(
     """
     symbol_upper = symbol.upper()
     
-    # Get total count
-    count_result = await session.execute(
-        select(func.count(Signal.id)).where(Signal.token_symbol == symbol_upper)
-    )
-    total = count_result.scalar()
+    # Never-seen symbols can't have signals — skip the query entirely
+    if symbol_upper not in await _known_symbols(session):
+        return _signal_list_response([], 0, limit, offset)
     
-    # Get signals
-    result = await session.execute(
-        select(Signal)
-        .where(Signal.token_symbol == symbol_upper)
-        .order_by(desc(Signal.timestamp))
-        .offset(offset)
-        .limit(limit)
+    # Get signals + total count in one query
+    items, total = await _paginate_signals(
+        session,
+        [lambda s: s.where(Signal.token_symbol == symbol_upper)],
+        limit,
+        offset,
     )
-    signals = result.scalars().all()
     
-    return SignalListResponse(
-        items=[SignalResponse.model_validate(s) for s in signals],
-        total=total,
-        limit=limit,
-        offset=offset,
-        has_more=(offset + limit) < total,
+    return _signal_list_response(items, total, limit, offset)
+
+
+def _signal_from_create(signal_data: SignalCreate) -> Signal:
+    """Build a Signal row from a validated SignalCreate."""
+    return Signal(
+        channel_id=signal_data.channel_id,
+        channel_name=signal_data.channel_name,
+        token_symbol=signal_data.token_symbol.upper(),
+        token_name=signal_data.token_name,
+        price_at_signal=signal_data.price_at_signal,
+        current_price=signal_data.current_price,
+        sentiment=signal_data.sentiment.upper(),
+        message_text=signal_data.message_text,
+        confidence_score=signal_data.confidence_score,
+        timestamp=datetime.utcnow(),
+        success=signal_data.success,
+        roi_percent=signal_data.roi_percent,
+        tags=signal_data.tags or [],
     )
 
 
@@ -195,27 +358,53 @@ async def create_signal(
         )
     
     # Create signal
-    signal = Signal(
-        channel_id=signal_data.channel_id,
-        channel_name=signal_data.channel_name,
-        token_symbol=signal_data.token_symbol.upper(),
-        token_name=signal_data.token_name,
-        price_at_signal=signal_data.price_at_signal,
-        current_price=signal_data.current_price,
-        sentiment=signal_data.sentiment.upper(),
-        message_text=signal_data.message_text,
-        confidence_score=signal_data.confidence_score,
-        timestamp=datetime.utcnow(),
-        success=signal_data.success,
-        roi_percent=signal_data.roi_percent,
-        tags=signal_data.tags or [],
-    )
-    
+    signal = _signal_from_create(signal_data)
     session.add(signal)
+    # Defaults are client-side and the id comes back with the INSERT
+    await session.flush()
+    remember_token_symbol(signal.token_symbol)
+    
+    return _signal_response(signal)
+
+
+@router.post("/batch", response_model=List[SignalResponse], status_code=status.HTTP_201_CREATED)
+async def create_signals_batch(
+    signals_data: List[SignalCreate] = Body(..., min_length=1, max_length=1000),
+    x_admin_key: Optional[str] = Header(default=None, description="Admin API key"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Create up to 1000 signals in one request. **Admin only**.
+    
+    The whole list is validated in a single pass and inserted in one
+    flush; if any referenced channel is missing nothing is written.
+    
+    Requires `X-Admin-Key` header with valid admin API key.
+    """
+    if x_admin_key != settings.secret_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or missing admin API key"
+        )
+    
+    # Verify every referenced channel exists with one query
+    channel_ids = {s.channel_id for s in signals_data}
+    found = await session.execute(select(Channel.id).where(Channel.id.in_(channel_ids)))
+    missing = channel_ids.difference(found.scalars().all())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Channels not found: {sorted(missing)}"
+        )
+    
+    signals = [_signal_from_create(s) for s in signals_data]
+    session.add_all(signals)
+    # Inserted as one multi-row INSERT ... RETURNING
     await session.flush()
-    await session.refresh(signal)
+    for signal in signals:
+        remember_token_symbol(signal.token_symbol)
     
-    return SignalResponse.model_validate(signal)
+    return [_signal_response(signal) for signal in signals]
 
 
 @router.delete("/{signal_id}", status_code=status.HTTP_204_NO_CONTENT)
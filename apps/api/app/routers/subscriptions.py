@@ -2,16 +2,23 @@
 Channel subscription router for per-user channel tracking.
 Users can subscribe to channels from their Telegram to receive notifications.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
 from typing import Optional, List
-from sqlalchemy import select, and_
+from typing_extensions import TypedDict
+from sqlalchemy import select, delete, lambda_stmt
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from datetime import datetime
+import orjson
 
 from app.auth import get_current_user
-from app.database import async_session_maker
+from app.cache import bump_version, etag_matches, version_etag
+from app.database import get_session, upsert_insert
 from app.models import ChannelSubscription, User
 from app.models.channel import Channel
+from app.rate_limit import rate_limit
+from app.responses import ORJSONResponse
 
 router = APIRouter(prefix="/subscriptions", tags=["Channel Subscriptions"])
 
@@ -33,18 +40,15 @@ class UpdateSubscriptionRequest(BaseModel):
     is_active: Optional[bool] = None
 
 
-class SubscriptionInfo(BaseModel):
-    """Subscription information."""
+class SubscriptionInfo(TypedDict):
+    """Subscription information (response-only, so a plain dict)."""
     id: int
     channel_id: int
-    channel_name: Optional[str] = None
+    channel_name: Optional[str]
     is_active: bool
     notify_email: bool
     notify_telegram: bool
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 
 class SubscriptionListResponse(BaseModel):
@@ -63,47 +67,108 @@ class SubscriptionResponse(BaseModel):
     error: Optional[str] = None
 
 
+def _subscription_info(
+    sub: ChannelSubscription, channel_name: Optional[str]
+) -> SubscriptionInfo:
+    """Read a DB row into SubscriptionInfo fields."""
+    return {
+        "id": sub.id,
+        "channel_id": sub.channel_id,
+        "channel_name": channel_name,
+        "is_active": sub.is_active,
+        "notify_email": sub.notify_email,
+        "notify_telegram": sub.notify_telegram,
+        "created_at": sub.created_at,
+    }
+
+
+def _version_keys(user_id: int) -> tuple:
+    """Version counters the subscription list depends on (channel names included)."""
+    return (f"subscriptions:{user_id}", "channels")
+
+
+async def invalidate_subscriptions(user_id: int) -> None:
+    """Bump the user's subscription list version. Call after commit."""
+    await bump_version(f"subscriptions:{user_id}")
+
+
+def _static_json(body: bytes) -> Response:
+    """Wrap a pre-encoded body; a new Response each time since middleware
+    appends to a response's header list in place."""
+    return Response(content=body, media_type="application/json")
+
+
+# Fixed SubscriptionResponse payloads, encoded once at import
+_UNSUBSCRIBED_BODY = orjson.dumps({
+    "success": True,
+    "subscription": None,
+    "message": "Unsubscribed from channel",
+    "error": None,
+})
+_ALREADY_SUBSCRIBED_BODY = orjson.dumps({
+    "success": False,
+    "subscription": None,
+    "message": None,
+    "error": "Already subscribed to this channel",
+})
+
+
 # ============== Endpoints ==============
 
-@router.get("/", response_model=SubscriptionListResponse)
-async def list_subscriptions(user = Depends(get_current_user)):
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": SubscriptionListResponse}},
+    dependencies=[Depends(rate_limit("60/minute"))],
+)
+async def list_subscriptions(
+    request: Request,
+    user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
+):
     """
     List all channel subscriptions for the current user.
     
     Returns all channels the user has subscribed to for tracking.
+    Supports conditional GET: an unchanged list answers 304 via ETag.
     """
-    async with async_session_maker() as db:
-        result = await db.execute(
-            select(ChannelSubscription, Channel)
-            .outerjoin(Channel, ChannelSubscription.channel_id == Channel.id)
-            .where(ChannelSubscription.user_id == user.id)
-            .order_by(ChannelSubscription.created_at.desc())
-        )
-        rows = result.all()
-        
-        subscriptions = []
-        for sub, channel in rows:
-            subscriptions.append(SubscriptionInfo(
-                id=sub.id,
-                channel_id=sub.channel_id,
-                channel_name=channel.name if channel else None,
-                is_active=sub.is_active,
-                notify_email=sub.notify_email,
-                notify_telegram=sub.notify_telegram,
-                created_at=sub.created_at,
-            ))
-        
-        return SubscriptionListResponse(
-            success=True,
-            subscriptions=subscriptions,
-            count=len(subscriptions),
-        )
+    user_id = user.id
+    etag = await version_etag(*_version_keys(user_id))
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    # lambda_stmt: the statement is built and compiled once, then reused
+    # with the new user_id bound in
+    result = await db.execute(lambda_stmt(
+        lambda: select(ChannelSubscription)
+        .options(selectinload(ChannelSubscription.channel))
+        .where(ChannelSubscription.user_id == user_id)
+        .order_by(ChannelSubscription.created_at.desc())
+    ))
+    
+    # Plain dicts, serialized for the whole list in one orjson pass
+    subscriptions = [
+        _subscription_info(sub, sub.channel.name if sub.channel else None)
+        for sub in result.scalars()
+    ]
+    
+    response = ORJSONResponse({
+        "success": True,
+        "subscriptions": subscriptions,
+        "count": len(subscriptions),
+        "error": None,
+    })
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+    return response
 
 
 @router.post("/", response_model=SubscriptionResponse)
 async def subscribe_to_channel(
     request: SubscribeRequest,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
 ):
     """
     Subscribe to a channel for tracking.
@@ -118,93 +183,74 @@ async def subscribe_to_channel(
         notify_email: Send email notifications for signals (requires Phase 2)
         notify_telegram: Forward signals to Telegram Saved Messages (requires Phase 2)
     """
-    async with async_session_maker() as db:
-        # Check if already subscribed
-        result = await db.execute(
-            select(ChannelSubscription).where(
-                and_(
-                    ChannelSubscription.user_id == user.id,
-                    ChannelSubscription.channel_id == request.channel_id
-                )
-            )
-        )
-        existing = result.scalar_one_or_none()
-        
-        if existing:
-            # Reactivate if was deactivated
-            if not existing.is_active:
-                existing.is_active = True
-                existing.notify_email = request.notify_email
-                existing.notify_telegram = request.notify_telegram
-                await db.commit()
-                await db.refresh(existing)
-                
-                return SubscriptionResponse(
-                    success=True,
-                    subscription=SubscriptionInfo(
-                        id=existing.id,
-                        channel_id=existing.channel_id,
-                        channel_name=request.channel_title,
-                        is_active=existing.is_active,
-                        notify_email=existing.notify_email,
-                        notify_telegram=existing.notify_telegram,
-                        created_at=existing.created_at,
-                    ),
-                    message="Subscription reactivated",
-                )
-            
-            return SubscriptionResponse(
-                success=False,
-                error="Already subscribed to this channel",
-            )
-        
-        # Ensure channel exists in our database (create if needed)
-        channel_result = await db.execute(
-            select(Channel).where(Channel.id == request.channel_id)
-        )
-        channel = channel_result.scalar_one_or_none()
-        
-        if not channel and request.channel_title:
-            # Create channel record
-            channel = Channel(
+    insert = upsert_insert(db)
+    
+    # Ensure channel exists in our database (create if needed)
+    if request.channel_title:
+        await db.execute(
+            insert(Channel)
+            .values(
                 id=request.channel_id,
                 name=request.channel_title,
                 telegram_id=str(request.channel_id),
             )
-            db.add(channel)
-        
-        # Create subscription
-        subscription = ChannelSubscription(
+            .on_conflict_do_nothing()
+        )
+        channel_name = request.channel_title
+    else:
+        channel_id = request.channel_id
+        channel_name = await db.scalar(lambda_stmt(
+            lambda: select(Channel.name).where(Channel.id == channel_id)
+        ))
+    
+    # Create the subscription, or reactivate it if it was deactivated. An
+    # active subscription matches no row, so nothing is returned. Only the
+    # reactivation sets updated_at, which tells the two outcomes apart.
+    result = await db.execute(
+        insert(ChannelSubscription)
+        .values(
             user_id=user.id,
             channel_id=request.channel_id,
             is_active=True,
             notify_email=request.notify_email,
             notify_telegram=request.notify_telegram,
         )
-        db.add(subscription)
-        await db.commit()
-        await db.refresh(subscription)
-        
-        return SubscriptionResponse(
-            success=True,
-            subscription=SubscriptionInfo(
-                id=subscription.id,
-                channel_id=subscription.channel_id,
-                channel_name=request.channel_title or (channel.name if channel else None),
-                is_active=subscription.is_active,
-                notify_email=subscription.notify_email,
-                notify_telegram=subscription.notify_telegram,
-                created_at=subscription.created_at,
-            ),
-            message="Successfully subscribed to channel",
+        .on_conflict_do_update(
+            index_elements=["user_id", "channel_id"],
+            set_={
+                "is_active": True,
+                "notify_email": request.notify_email,
+                "notify_telegram": request.notify_telegram,
+                "updated_at": datetime.utcnow(),
+            },
+            where=ChannelSubscription.is_active == False,  # noqa: E712
         )
+        .returning(ChannelSubscription)
+    )
+    subscription = result.scalar_one_or_none()
+    await db.commit()
+    
+    if subscription is None:
+        return _static_json(_ALREADY_SUBSCRIBED_BODY)
+    
+    await invalidate_subscriptions(user.id)
+    return SubscriptionResponse(
+        success=True,
+        subscription=_subscription_info(subscription, channel_name),
+        message=(
+            "Subscription reactivated"
+            if subscription.updated_at is not None
+            else "Successfully subscribed to channel"
+        ),
+    )
 
 
 @router.patch("/{subscription_id}", response_model=SubscriptionResponse)
 async def update_subscription(
     subscription_id: int,
     request: UpdateSubscriptionRequest,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
 ):
     """
     Update subscription settings.
@@ -215,56 +261,43 @@ async def update_subscription(
         notify_telegram: Enable/disable Telegram forwarding
         is_active: Enable/disable the subscription
     """
-    async with async_session_maker() as db:
-        result = await db.execute(
-            select(ChannelSubscription).where(
-                and_(
-                    ChannelSubscription.id == subscription_id,
-                    ChannelSubscription.user_id == user.id
-                )
-            )
-        )
-        subscription = result.scalar_one_or_none()
-        
-        if not subscription:
-            raise HTTPException(status_code=404, detail="Subscription not found")
-        
-        # Update fields
-        if request.notify_email is not None:
-            subscription.notify_email = request.notify_email
-        if request.notify_telegram is not None:
-            subscription.notify_telegram = request.notify_telegram
-        if request.is_active is not None:
-            subscription.is_active = request.is_active
-        
-        await db.commit()
-        await db.refresh(subscription)
-        
-        # Get channel name
-        channel_result = await db.execute(
-            select(Channel).where(Channel.id == subscription.channel_id)
-        )
-        channel = channel_result.scalar_one_or_none()
-        
-        return SubscriptionResponse(
-            success=True,
-            subscription=SubscriptionInfo(
-                id=subscription.id,
-                channel_id=subscription.channel_id,
-                channel_name=channel.name if channel else None,
-                is_active=subscription.is_active,
-                notify_email=subscription.notify_email,
-                notify_telegram=subscription.notify_telegram,
-                created_at=subscription.created_at,
-            ),
-            message="Subscription updated",
-        )
+    subscription = await db.get(
+        ChannelSubscription,
+        subscription_id,
+        options=[selectinload(ChannelSubscription.channel)],
+    )
+    
+    # Another user's subscription is reported exactly like a missing one
+    if not subscription or subscription.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    
+    # Update fields
+    if request.notify_email is not None:
+        subscription.notify_email = request.notify_email
+    if request.notify_telegram is not None:
+        subscription.notify_telegram = request.notify_telegram
+    if request.is_active is not None:
+        subscription.is_active = request.is_active
+    
+    channel_name = subscription.channel.name if subscription.channel else None
+    
+    # Every field in the response is already on the object (expire_on_commit
+    # is off), so no refresh SELECT
+    await db.commit()
+    await invalidate_subscriptions(user.id)
+    
+    return SubscriptionResponse(
+        success=True,
+        subscription=_subscription_info(subscription, channel_name),
+        message="Subscription updated",
+    )
 
 
 @router.delete("/{subscription_id}", response_model=SubscriptionResponse)
 async def unsubscribe(
     subscription_id: int,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
 ):
     """
     Unsubscribe from a channel.
@@ -272,57 +305,48 @@ async def unsubscribe(
     This deactivates the subscription. Use PATCH with is_active=false
     to temporarily pause without removing the subscription.
     """
-    async with async_session_maker() as db:
-        result = await db.execute(
-            select(ChannelSubscription).where(
-                and_(
-                    ChannelSubscription.id == subscription_id,
-                    ChannelSubscription.user_id == user.id
-                )
-            )
-        )
-        subscription = result.scalar_one_or_none()
-        
-        if not subscription:
-            raise HTTPException(status_code=404, detail="Subscription not found")
-        
-        await db.delete(subscription)
-        await db.commit()
-        
-        return SubscriptionResponse(
-            success=True,
-            message="Unsubscribed from channel",
+    result = await db.execute(
+        delete(ChannelSubscription)
+        .where(
+            ChannelSubscription.id == subscription_id,
+            ChannelSubscription.user_id == user.id,
         )
+        .returning(ChannelSubscription.id)
+    )
+    
+    if result.first() is None:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    
+    await db.commit()
+    await invalidate_subscriptions(user.id)
+    
+    return _static_json(_UNSUBSCRIBED_BODY)
 
 
 @router.delete("/channel/{channel_id}", response_model=SubscriptionResponse)
 async def unsubscribe_by_channel(
     channel_id: int,
-    user = Depends(get_current_user)
+    user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session),
 ):
     """
     Unsubscribe from a channel by its Telegram ID.
     
     Alternative to unsubscribing by subscription_id.
     """
-    async with async_session_maker() as db:
-        result = await db.execute(
-            select(ChannelSubscription).where(
-                and_(
-                    ChannelSubscription.channel_id == channel_id,
-                    ChannelSubscription.user_id == user.id
-                )
-            )
-        )
-        subscription = result.scalar_one_or_none()
-        
-        if not subscription:
-            raise HTTPException(status_code=404, detail="Subscription not found")
-        
-        await db.delete(subscription)
-        await db.commit()
-        
-        return SubscriptionResponse(
-            success=True,
-            message="Unsubscribed from channel",
+    result = await db.execute(
+        delete(ChannelSubscription)
+        .where(
+            ChannelSubscription.channel_id == channel_id,
+            ChannelSubscription.user_id == user.id,
         )
+        .returning(ChannelSubscription.id)
+    )
+    
+    if result.first() is None:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    
+    await db.commit()
+    await invalidate_subscriptions(user.id)
+    
+    return _static_json(_UNSUBSCRIBED_BODY)
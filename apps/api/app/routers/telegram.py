@@ -6,9 +6,12 @@ and start background monitoring of subscribed channels.
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional, List
+from typing_extensions import TypedDict
 
 from app.auth import get_current_user
+from app.rate_limit import rate_limit
 from app.services.user_telegram import user_telegram_manager
+from app.responses import ORJSONResponse
 
 router = APIRouter(prefix="/telegram", tags=["User Telegram"])
 
@@ -43,15 +46,15 @@ class TelegramStatusResponse(BaseModel):
     error: Optional[str] = None
 
 
-class ChannelInfo(BaseModel):
-    """Channel/group information."""
+class ChannelInfo(TypedDict):
+    """Channel/group information (response-only, so a plain dict)."""
     id: int
     title: str
-    username: Optional[str] = None
+    username: Optional[str]
     is_channel: bool
     is_group: bool
-    participants_count: Optional[int] = None
-    unread_count: Optional[int] = None
+    participants_count: Optional[int]
+    unread_count: Optional[int]
 
 
 class ChannelsResponse(BaseModel):
@@ -83,6 +86,12 @@ class MonitoringStatusResponse(BaseModel):
     queue_size: int = 0
 
 
+class TelegramFullStatusResponse(BaseModel):
+    """Connection status and monitoring status in one response."""
+    status: TelegramStatusResponse
+    monitoring: MonitoringStatusResponse
+
+
 class MonitoringResponse(BaseModel):
     """Response for monitoring start/stop."""
     success: bool
@@ -105,7 +114,22 @@ async def get_status(user = Depends(get_current_user)):
     return TelegramStatusResponse(**status)
 
 
-@router.post("/connect", response_model=AuthResponse)
+@router.get("/status/full", response_model=TelegramFullStatusResponse)
+async def get_full_status(user = Depends(get_current_user)):
+    """
+    Get the Telegram connection status and background monitoring status.
+    
+    Same payloads as /status and /monitoring/status, for pages that show
+    both, at the cost of a single request.
+    """
+    return await user_telegram_manager.get_combined_status(user.id)
+
+
+@router.post(
+    "/connect",
+    response_model=AuthResponse,
+    dependencies=[Depends(rate_limit("5/minute"))],
+)
 async def connect_telegram(
     request: ConnectRequest,
     user = Depends(get_current_user)
@@ -121,7 +145,11 @@ async def connect_telegram(
     return AuthResponse(**result)
 
 
-@router.post("/verify", response_model=AuthResponse)
+@router.post(
+    "/verify",
+    response_model=AuthResponse,
+    dependencies=[Depends(rate_limit("5/minute"))],
+)
 async def verify_code(
     request: VerifyCodeRequest,
     user = Depends(get_current_user)
@@ -137,7 +165,11 @@ async def verify_code(
     return AuthResponse(**result)
 
 
-@router.post("/verify-2fa", response_model=AuthResponse)
+@router.post(
+    "/verify-2fa",
+    response_model=AuthResponse,
+    dependencies=[Depends(rate_limit("5/minute"))],
+)
 async def verify_2fa(
     request: Verify2FARequest,
     user = Depends(get_current_user)
@@ -150,7 +182,11 @@ async def verify_2fa(
     return AuthResponse(**result)
 
 
-@router.get("/channels", response_model=ChannelsResponse)
+@router.get(
+    "/channels",
+    response_model=None,
+    responses={200: {"model": ChannelsResponse}},
+)
 async def list_channels(user = Depends(get_current_user)):
     """
     List all channels and groups the user has joined on Telegram.
@@ -159,19 +195,21 @@ async def list_channels(user = Depends(get_current_user)):
     result = await user_telegram_manager.get_user_channels(user.id)
     
     if not result["success"]:
-        return ChannelsResponse(
-            success=False,
-            error=result.get("error", "Failed to get channels"),
-            channels=[],
-            count=0
-        )
+        return ORJSONResponse({
+            "success": False,
+            "channels": [],
+            "count": 0,
+            "error": result.get("error", "Failed to get channels"),
+        })
     
-    channels = [ChannelInfo(**ch) for ch in result.get("channels", [])]
-    return ChannelsResponse(
-        success=True,
-        channels=channels,
-        count=len(channels)
-    )
+    # user_telegram builds ChannelInfo dicts, so they are serialized as-is
+    channels = result.get("channels", [])
+    return ORJSONResponse({
+        "success": True,
+        "channels": channels,
+        "count": len(channels),
+        "error": None,
+    })
 
 
 @router.post("/disconnect", response_model=AuthResponse)
@@ -191,7 +229,11 @@ async def disconnect_telegram(user = Depends(get_current_user)):
 
 # ============== Background Monitoring Endpoints ==============
 
-@router.get("/monitoring/status", response_model=MonitoringStatusResponse)
+@router.get(
+    "/monitoring/status",
+    response_model=None,
+    responses={200: {"model": MonitoringStatusResponse}},
+)
 async def get_monitoring_status(user = Depends(get_current_user)):
     """
     Get the current background monitoring status.
@@ -199,8 +241,8 @@ async def get_monitoring_status(user = Depends(get_current_user)):
     Returns whether monitoring is active, how many channels are being watched,
     how many messages have been processed, and how many signals detected.
     """
-    status = user_telegram_manager.get_monitoring_status(user.id)
-    return MonitoringStatusResponse(**status)
+    # The manager always fills every field, so the polled dict goes out as-is
+    return ORJSONResponse(user_telegram_manager.get_monitoring_status(user.id))
 
 
 @router.post("/monitoring/start", response_model=MonitoringResponse)
@@ -1,14 +1,21 @@
+import logging
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 
 from app.database import get_session
 from app.auth import get_current_user
+from app.cache import bump_version, etag_matches, version_etag
 from app.models.user import User
 from app.models.tracked_token import TrackedToken
+from app.responses import ORJSONResponse
+from app.services.token_tracker import token_tracker
 from pydantic import BaseModel
+from typing_extensions import TypedDict
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tracking", tags=["tracking"])
 
@@ -19,17 +26,22 @@ class TrackedTokenCreate(BaseModel):
     address: Optional[str] = None
     notes: Optional[str] = None
 
-class TrackedTokenResponse(BaseModel):
+class TrackedTokenResponse(TypedDict):
+    """Tracked token (response-only, so a plain dict)."""
     id: int
     symbol: str
-    name: Optional[str] = None
+    name: Optional[str]
     chain: str
-    address: Optional[str] = None
-    notes: Optional[str] = None
+    address: Optional[str]
+    notes: Optional[str]
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
+
+# Response fields, resolved once instead of introspecting per row
+_TRACKED_TOKEN_FIELDS = tuple(TrackedTokenResponse.__annotations__)
+
+def _tracked_token_response(token: TrackedToken) -> TrackedTokenResponse:
+    """Read an ORM row into TrackedTokenResponse fields."""
+    return {field: getattr(token, field) for field in _TRACKED_TOKEN_FIELDS}
 
 class TrackedTokenPriceResponse(BaseModel):
     symbol: str
@@ -44,21 +56,50 @@ class TrackedTokenPriceResponse(BaseModel):
     cmc_rank: Optional[int] = None
     updated_at: Optional[str] = None
 
-@router.get("/", response_model=List[TrackedTokenResponse])
+@router.get(
+    "/",
+    response_model=None,
+    responses={200: {"model": List[TrackedTokenResponse]}},
+)
 async def get_tracked_tokens(
     request: Request,
     response: Response,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all tokens tracked by the current user."""
+    """Get all tokens tracked by the current user (304 when the ETag still matches)."""
+    etag = await version_etag(f"tracked_tokens:{current_user.id}")
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
     query = select(TrackedToken).where(TrackedToken.user_id == current_user.id)
     result = await db.execute(query)
-    return result.scalars().all()
+    body = ORJSONResponse([
+        _tracked_token_response(token) for token in result.scalars().all()
+    ])
+    if etag is not None:
+        body.headers["ETag"] = etag
+        body.headers["Cache-Control"] = "private, no-cache"
+    return body
+
+async def _register_tracked_token(user_id: int, symbol: str, address: Optional[str]):
+    """Register a subscription in memory for instant price fetching (best effort)."""
+    try:
+        await token_tracker.add_subscription(user_id=user_id, symbol=symbol, address=address)
+    except Exception as e:
+        logger.warning(f"Immediate tracker update failed: {e}")
+
+async def _unregister_tracked_token(user_id: int, symbol: str):
+    """Drop a subscription from memory (best effort)."""
+    try:
+        await token_tracker.remove_subscription(user_id=user_id, symbol=symbol)
+    except Exception as e:
+        logger.warning(f"Immediate tracker removal failed: {e}")
 
 @router.post("/", response_model=TrackedTokenResponse)
 async def track_token(
     token_data: TrackedTokenCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -72,7 +113,7 @@ async def track_token(
     existing = result.scalar_one_or_none()
     
     if existing:
-        return existing
+        return _tracked_token_response(existing)
         
     new_token = TrackedToken(
         user_id=current_user.id,
@@ -84,20 +125,15 @@ async def track_token(
     )
     
     db.add(new_token)
+    # The INSERT returns the id and defaults are set client-side, so the
+    # committed object is complete without a refresh SELECT
     await db.commit()
-    await db.refresh(new_token)
+    await bump_version(f"tracked_tokens:{current_user.id}")
 
-    # Register subscription immediately in memory for instant price fetching
-    try:
-        from app.services.token_tracker import token_tracker
-        await token_tracker.add_subscription(
-            user_id=new_token.user_id,
-            symbol=new_token.symbol,
-            address=new_token.address
-        )
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Immediate tracker update failed: {e}")
+    # Register subscription in memory once the response has been sent
+    background_tasks.add_task(
+        _register_tracked_token, new_token.user_id, new_token.symbol, new_token.address
+    )
 
     # Register address with Moralis Streams (fire-and-forget)
     # Removing Moralis Integration
@@ -109,18 +145,21 @@ async def track_token(
     #         import logging
     #         logging.getLogger(__name__).warning(f"Stream add_address failed: {e}")
 
-    return new_token
+    return _tracked_token_response(new_token)
 
-@router.get("/prices", response_model=List[TrackedTokenPriceResponse])
+@router.get(
+    "/prices",
+    response_model=None,
+    responses={200: {"model": List[TrackedTokenPriceResponse]}},
+)
 async def get_tracked_token_prices(
     request: Request,
     response: Response,
     current_user: User = Depends(get_current_user)
 ):
     """Get real-time prices for all tracked tokens."""
-    from app.services.token_tracker import token_tracker
-    prices = token_tracker.get_prices_for_user(current_user.id)
-    return prices
+    # Rows are projected onto the documented fields when quotes are cached
+    return ORJSONResponse(token_tracker.get_price_rows_for_user(current_user.id))
 
 
 @router.get("/{symbol}/history")
@@ -129,7 +168,6 @@ async def get_token_price_history(
     current_user: User = Depends(get_current_user),
 ):
     """Get price/OHLC history for a tracked token (for candlestick charts)."""
-    from app.services.token_tracker import token_tracker
     ohlc = await token_tracker.get_ohlc_history(symbol)
     return {"symbol": symbol.upper(), "history": ohlc}
 
@@ -137,18 +175,21 @@ async def get_token_price_history(
 @router.delete("/{symbol}", status_code=status.HTTP_204_NO_CONTENT)
 async def untrack_token(
     symbol: str,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
     """Stop tracking a token."""
-    query = select(TrackedToken).where(
-        TrackedToken.user_id == current_user.id,
-        TrackedToken.symbol == symbol
+    result = await db.execute(
+        delete(TrackedToken)
+        .where(
+            TrackedToken.user_id == current_user.id,
+            TrackedToken.symbol == symbol
+        )
+        .returning(TrackedToken.id)
     )
-    result = await db.execute(query)
-    token = result.scalar_one_or_none()
     
-    if not token:
+    if result.first() is None:
         raise HTTPException(status_code=404, detail="Token not found")
 
     # Remove address from Moralis Streams if no other user tracks it
@@ -170,16 +211,8 @@ async def untrack_token(
     #         import logging
     #         logging.getLogger(__name__).warning(f"Stream remove_address failed: {e}")
 
-    await db.delete(token)
     await db.commit()
+    await bump_version(f"tracked_tokens:{current_user.id}")
 
-    # Remove subscription immediately from memory
-    try:
-        from app.services.token_tracker import token_tracker
-        await token_tracker.remove_subscription(
-            user_id=current_user.id,
-            symbol=symbol
-        )
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).warning(f"Immediate tracker removal failed: {e}")
+    # Remove subscription from memory once the response has been sent
+    background_tasks.add_task(_unregister_tracked_token, current_user.id, symbol)
@@ -20,6 +20,7 @@ from app.schemas.token import (
 )
 from app.schemas.analytics import (
     HistoricalDataResponse,
+    HistoricalDataColumnsResponse,
     TokenStatsResponse,
     ChannelLeaderboardResponse,
     PatternAnalysisResponse,
@@ -52,6 +53,7 @@ __all__ = [
     "TokenStats",
     # Analytics
     "HistoricalDataResponse",
+    "HistoricalDataColumnsResponse",
     "TokenStatsResponse",
     "ChannelLeaderboardResponse",
     "PatternAnalysisResponse",
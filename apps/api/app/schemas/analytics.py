@@ -23,13 +23,41 @@ class HistoricalDataResponse(BaseModel):
     
     signals: List[HistoricalSignal]
     total_count: int
+    limit: int
+    offset: int
+    has_more: bool
     date_range: Dict[str, str]
     summary: Dict[str, Any]
     query_time_ms: float
     cached: bool
+
+
+class HistoricalSignalColumns(BaseModel):
+    """Historical signals as parallel arrays, one list per field."""
     
-    class Config:
-        from_attributes = True
+    id: List[int]
+    channel_name: List[str]
+    token_symbol: List[str]
+    sentiment: List[str]
+    price_at_signal: List[Optional[float]]
+    roi_percent: List[Optional[float]]
+    success: List[Optional[bool]]
+    timestamp: List[datetime]
+    confidence_score: List[float]
+
+
+class HistoricalDataColumnsResponse(BaseModel):
+    """Schema for historical data in columnar layout."""
+    
+    columns: HistoricalSignalColumns
+    total_count: int
+    limit: int
+    offset: int
+    has_more: bool
+    date_range: Dict[str, str]
+    summary: Dict[str, Any]
+    query_time_ms: float
+    cached: bool
 
 
 class TokenStatsResponse(BaseModel):
@@ -48,9 +76,6 @@ class TokenStatsResponse(BaseModel):
     performance_trend: List[Dict[str, Any]]  # Daily/weekly performance
     query_time_ms: float
     cached: bool
-    
-    class Config:
-        from_attributes = True
 
 
 class ChannelLeaderboardEntry(BaseModel):
@@ -76,9 +101,6 @@ class ChannelLeaderboardResponse(BaseModel):
     time_period: str
     query_time_ms: float
     cached: bool
-    
-    class Config:
-        from_attributes = True
 
 
 class PatternInfo(BaseModel):
@@ -105,9 +127,6 @@ class PatternAnalysisResponse(BaseModel):
     time_period_days: int
     query_time_ms: float
     cached: bool
-    
-    class Config:
-        from_attributes = True
 
 
 class TrendingToken(BaseModel):
@@ -130,9 +149,6 @@ class TrendingResponse(BaseModel):
     total_signals_24h: int
     most_active_channels: List[str]
     timestamp: datetime
-    
-    class Config:
-        from_attributes = True
 
 
 class MarketSentiment(BaseModel):
@@ -149,6 +165,3 @@ class MarketSentiment(BaseModel):
     top_bullish_tokens: List[str]
     top_bearish_tokens: List[str]
     timestamp: datetime
-    
-    class Config:
-        from_attributes = True
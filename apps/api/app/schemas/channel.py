@@ -55,9 +55,6 @@ class ChannelListResponse(BaseModel):
     limit: int
     offset: int
     has_more: bool
-    
-    class Config:
-        from_attributes = True
 
 
 class ChannelStats(BaseModel):
@@ -80,6 +77,3 @@ class ChannelStats(BaseModel):
     signals_last_24h: int
     signals_last_7d: int
     signals_last_30d: int
-    
-    class Config:
-        from_attributes = True
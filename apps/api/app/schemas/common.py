@@ -21,9 +21,6 @@ class PaginatedResponse(BaseModel, Generic[T]):
     limit: int
     offset: int
     has_more: bool
-    
-    class Config:
-        from_attributes = True
 
 
 class SuccessResponse(BaseModel):
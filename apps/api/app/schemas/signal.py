@@ -1,36 +1,34 @@
 """Signal schemas for request/response validation."""
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, StringConstraints
+from typing_extensions import Annotated
+
+
+# Case-insensitive match, stored upper-case. Both steps run inside
+# pydantic-core, so no Python validator is called per field.
+SentimentStr = Annotated[
+    str,
+    StringConstraints(to_upper=True, pattern=r"(?i)^(bullish|bearish|neutral)$"),
+]
+UpperStr = Annotated[str, StringConstraints(to_upper=True)]
+# Closed set, checked by pydantic-core's literal lookup
+SignalType = Literal["full_signal", "contract_detection", "token_mention"]
 
 
 class SignalBase(BaseModel):
     """Base signal schema with common fields."""
     
-    token_symbol: str = Field(..., min_length=1, max_length=50, description="Token symbol (e.g., BTC)")
+    token_symbol: UpperStr = Field(..., min_length=1, max_length=50, description="Token symbol (e.g., BTC)")
     token_name: str = Field(..., min_length=1, max_length=255, description="Token name")
     price_at_signal: Optional[float] = Field(default=None, ge=0, description="Price at time of signal (optional for detections)")
-    signal_type: str = Field(default="token_mention", description="full_signal | contract_detection | token_mention")
-    contract_addresses: Optional[List[str]] = Field(default=[], description="Detected contract addresses")
+    signal_type: SignalType = Field(default="token_mention", description="full_signal | contract_detection | token_mention")
+    contract_addresses: Optional[List[str]] = Field(default_factory=list, description="Detected contract addresses")
     chain: Optional[str] = Field(default=None, max_length=30, description="Blockchain network")
-    sentiment: str = Field(default="NEUTRAL", description="Signal sentiment")
+    sentiment: SentimentStr = Field(default="NEUTRAL", description="Signal sentiment")
     message_text: str = Field(..., min_length=1, description="Original message text")
     confidence_score: float = Field(default=0.5, ge=0, le=1, description="Confidence score 0-1")
-    tags: Optional[List[str]] = Field(default=[], description="Tags for categorization")
-    
-    @field_validator("sentiment")
-    @classmethod
-    def validate_sentiment(cls, v: str) -> str:
-        valid_sentiments = ["BULLISH", "BEARISH", "NEUTRAL"]
-        v_upper = v.upper()
-        if v_upper not in valid_sentiments:
-            raise ValueError(f"Sentiment must be one of: {valid_sentiments}")
-        return v_upper
-    
-    @field_validator("token_symbol")
-    @classmethod
-    def validate_symbol(cls, v: str) -> str:
-        return v.upper()
+    tags: Optional[List[str]] = Field(default_factory=list, description="Tags for categorization")
 
 
 class SignalCreate(SignalBase):
@@ -47,22 +45,11 @@ class SignalUpdate(BaseModel):
     """Schema for updating an existing signal."""
     
     current_price: Optional[float] = Field(default=None, ge=0)
-    sentiment: Optional[str] = None
+    sentiment: Optional[SentimentStr] = None
     confidence_score: Optional[float] = Field(default=None, ge=0, le=1)
     success: Optional[bool] = None
     roi_percent: Optional[float] = None
     tags: Optional[List[str]] = None
-    
-    @field_validator("sentiment")
-    @classmethod
-    def validate_sentiment(cls, v: Optional[str]) -> Optional[str]:
-        if v is None:
-            return v
-        valid_sentiments = ["BULLISH", "BEARISH", "NEUTRAL"]
-        v_upper = v.upper()
-        if v_upper not in valid_sentiments:
-            raise ValueError(f"Sentiment must be one of: {valid_sentiments}")
-        return v_upper
 
 
 class SignalResponse(BaseModel):
@@ -76,7 +63,7 @@ class SignalResponse(BaseModel):
     price_at_signal: Optional[float] = None
     current_price: Optional[float] = None
     signal_type: str = "token_mention"
-    contract_addresses: Optional[List[str]] = []
+    contract_addresses: Optional[List[str]] = Field(default_factory=list)
     chain: Optional[str] = None
     sentiment: str
     message_text: str
@@ -94,13 +81,10 @@ class SignalListResponse(BaseModel):
     """Schema for paginated signal list response."""
     
     items: List[SignalResponse]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
     has_more: bool
-    
-    class Config:
-        from_attributes = True
 
 
 class SignalFilter(BaseModel):
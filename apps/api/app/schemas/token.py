@@ -1,19 +1,16 @@
 """Token schemas for request/response validation."""
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
+
+from app.schemas.signal import UpperStr
 
 
 class TokenBase(BaseModel):
     """Base token schema with common fields."""
     
-    symbol: str = Field(..., min_length=1, max_length=20, description="Token symbol")
+    symbol: UpperStr = Field(..., min_length=1, max_length=20, description="Token symbol")
     name: str = Field(..., min_length=1, max_length=255, description="Token name")
-    
-    @field_validator("symbol")
-    @classmethod
-    def validate_symbol(cls, v: str) -> str:
-        return v.upper()
 
 
 class TokenCreate(TokenBase):
@@ -57,9 +54,6 @@ class TokenListResponse(BaseModel):
     limit: int
     offset: int
     has_more: bool
-    
-    class Config:
-        from_attributes = True
 
 
 class TokenStats(BaseModel):
@@ -84,6 +78,3 @@ class TokenStats(BaseModel):
     signals_last_30d: int
     top_channel: str
     sentiment_score: float  # -1 to 1 scale
-    
-    class Config:
-        from_attributes = True
@@ -1,9 +1,24 @@
-"""Services package."""
-from app.services.analytics_service import AnalyticsService
-from app.services.signal_parser import SignalParser
-from app.services.email_service import EmailService, email_service
-from app.services.notification_service import NotificationService, notification_service
-# from app.services.moralis_service import MoralisService, moralis_service
+"""
+Services package.
+
+Services are imported on first attribute access (PEP 562), so importing one
+submodule such as ``app.services.websocket_manager`` doesn't also load
+NumPy, the email stack and every other service.
+"""
+from importlib import import_module
+from typing import Any
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "AnalyticsService": "analytics_service",
+    "SignalParser": "signal_parser",
+    "EmailService": "email_service",
+    "email_service": "email_service",
+    "NotificationService": "notification_service",
+    "notification_service": "notification_service",
+    # "MoralisService": "moralis_service",
+    # "moralis_service": "moralis_service",
+}
 
 __all__ = [
     "AnalyticsService",
@@ -15,3 +30,16 @@ __all__ = [
     # "MoralisService",
     # "moralis_service",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
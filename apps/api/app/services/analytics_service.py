@@ -1,14 +1,102 @@
 """Analytics service for processing and analyzing signal data."""
 import time
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from sqlalchemy import select, func, desc, case, and_, Integer
 from sqlalchemy.ext.asyncio import AsyncSession
 import numpy as np
 
+from app.cache import cached_result
 from app.models import Signal, Channel, Token
 
 
+# ROI bucket boundaries (%); each bucket includes its lower edge
+ROI_BUCKET_EDGES = np.array([-50, -20, 0, 20, 50, 100], dtype=np.float64)
+ROI_BUCKET_LABELS = (
+    "< -50%",
+    "-50% to -20%",
+    "-20% to 0%",
+    "0% to 20%",
+    "20% to 50%",
+    "50% to 100%",
+    "> 100%",
+)
+
+
+# Rows per partition when streaming large per-token scans
+STREAM_PARTITION_SIZE = 5_000
+
+# Fixed sentiment order for count vectors
+SENTIMENTS = ("BULLISH", "BEARISH", "NEUTRAL")
+_SENTIMENT_INDEX = {s: i for i, s in enumerate(SENTIMENTS)}
+
+# Sentiment encoded by the database as its SENTIMENTS index (unknown values
+# map past the end), so tallies need no per-row lookups in Python
+SENTIMENT_CODE = case(_SENTIMENT_INDEX, value=Signal.sentiment, else_=len(SENTIMENTS))
+
+# Display names for well-known symbols; anything else shows its symbol
+_TOKEN_NAMES = {
+    "BTC": "Bitcoin", "ETH": "Ethereum", "SOL": "Solana",
+    "DOGE": "Dogecoin", "PEPE": "Pepe", "SHIB": "Shiba Inu",
+    "LINK": "Chainlink", "MATIC": "Polygon", "AVAX": "Avalanche",
+    "DOT": "Polkadot",
+}
+
+# Columns returned for each historical signal, in wire order
+HISTORICAL_COLUMNS = (
+    "id",
+    "channel_name",
+    "token_symbol",
+    "sentiment",
+    "price_at_signal",
+    "roi_percent",
+    "success",
+    "timestamp",
+    "confidence_score",
+)
+
+
+def sentiment_code_counts(codes: Iterable[int]) -> np.ndarray:
+    """Count ``SENTIMENT_CODE`` values into an int64 array ordered like ``SENTIMENTS``."""
+    if not isinstance(codes, np.ndarray):
+        codes = np.fromiter(codes, dtype=np.intp)
+    return np.bincount(codes, minlength=len(SENTIMENTS) + 1)[: len(SENTIMENTS)]
+
+
+def sentiment_distribution(counts: np.ndarray) -> Dict[str, int]:
+    """Render a ``sentiment_code_counts`` array as the ``{"BULLISH": n, ...}`` wire shape."""
+    return dict(zip(SENTIMENTS, counts.tolist()))
+
+
+def roi_distribution(rois: np.ndarray) -> Dict[str, int]:
+    """Count ROI values per bucket in one vectorized pass."""
+    buckets = np.searchsorted(ROI_BUCKET_EDGES, rois, side="right")
+    counts = np.bincount(buckets, minlength=len(ROI_BUCKET_LABELS))
+    return dict(zip(ROI_BUCKET_LABELS, counts.tolist()))
+
+
+def _window_sums(values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    Sum ``values[lo[i]:hi[i]]`` for every i in one ``reduceat`` pass.
+
+    Empty windows yield ``values[lo[i]]``; callers mask those out.
+    """
+    bounds = np.column_stack([lo, hi]).ravel()
+    padded = np.append(np.asarray(values, dtype=np.float64), 0)
+    return np.add.reduceat(padded, bounds)[::2]
+
+
+def composite_scores(
+    success_rate: np.ndarray, avg_roi: np.ndarray, total_signals: np.ndarray
+) -> np.ndarray:
+    """
+    Leaderboard score per channel:
+    (success_rate * 0.4) + (avg_roi * 0.4) + (signal_count_normalized * 0.2)
+    """
+    return success_rate * 0.4 + avg_roi * 0.4 + np.minimum(total_signals / 1000, 100) * 0.2
+
+
 class AnalyticsService:
     """Service for computing analytics on signal data."""
     
@@ -18,63 +106,85 @@ class AnalyticsService:
     async def get_historical_data(
         self,
         days: int = 30,
-        limit: int = 100000,
+        limit: int = 500,
+        offset: int = 0,
+        columnar: bool = False,
     ) -> Dict[str, Any]:
         """
-        Get historical signal data for analytics.
-        This is a heavy operation on 100k+ records.
+        Get one page of historical signal data for analytics, newest first.
+        
+        The summary and ``total_count`` cover the whole date range and are
+        aggregated by the database; only the requested page of rows is
+        fetched and serialized.
+        
+        With ``columnar=True`` signals are returned as parallel arrays under
+        ``columns`` instead of one object per row under ``signals``.
         """
         start_time = time.perf_counter()
         
         # Calculate date range
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
-        
-        # Query signals with all necessary data
+        in_range = Signal.timestamp >= start_date
+        
+        # Summary over the full range in one aggregate query, one row per
+        # SENTIMENT_CODE
+        summary_result = await self.session.execute(
+            select(
+                SENTIMENT_CODE,
+                func.count(),
+                func.sum(case((Signal.success == True, 1), else_=0)),
+                func.sum(Signal.roi_percent),
+            ).where(in_range).group_by(SENTIMENT_CODE)
+        )
+        groups = summary_result.all()
+        total_count = sum(g[1] for g in groups)
+        success_count = int(sum(g[2] or 0 for g in groups))
+        roi_sum = sum(g[3] or 0 for g in groups)
+        counts = np.zeros(len(SENTIMENTS) + 1, dtype=np.int64)
+        for code, n, _, _ in groups:
+            counts[code] = n
+        distribution = sentiment_distribution(counts[: len(SENTIMENTS)])
+        
+        # Query only the returned columns of this page; no ORM objects per row
         query = (
-            select(Signal)
-            .where(Signal.timestamp >= start_date)
+            select(*(getattr(Signal, c) for c in HISTORICAL_COLUMNS))
+            .where(in_range)
             .order_by(desc(Signal.timestamp))
+            .offset(offset)
             .limit(limit)
         )
         
         result = await self.session.execute(query)
-        signals = result.scalars().all()
-        
-        # Process signals into response format
-        signal_data = []
-        total_roi = 0
-        success_count = 0
-        sentiment_counts = {"BULLISH": 0, "BEARISH": 0, "NEUTRAL": 0}
-        
-        for signal in signals:
-            signal_data.append({
-                "id": signal.id,
-                "channel_name": signal.channel_name,
-                "token_symbol": signal.token_symbol,
-                "sentiment": signal.sentiment,
-                "price_at_signal": signal.price_at_signal,
-                "roi_percent": signal.roi_percent,
-                "success": signal.success,
-                "timestamp": signal.timestamp.isoformat(),
-                "confidence_score": signal.confidence_score,
-            })
-            
-            if signal.roi_percent:
-                total_roi += signal.roi_percent
-            if signal.success:
-                success_count += 1
-            sentiment_counts[signal.sentiment] = sentiment_counts.get(signal.sentiment, 0) + 1
+        rows = result.all()
+        
+        # Transpose rows into columns. Timestamps stay datetimes: orjson
+        # formats them in C when the response is rendered, matching isoformat()
+        if rows:
+            columns = {c: list(values) for c, values in zip(HISTORICAL_COLUMNS, zip(*rows))}
+        else:
+            columns = {c: [] for c in HISTORICAL_COLUMNS}
         
         query_time = (time.perf_counter() - start_time) * 1000
         
-        total_count = len(signal_data)
-        avg_roi = total_roi / total_count if total_count > 0 else 0
+        avg_roi = float(roi_sum or 0) / total_count if total_count > 0 else 0
         success_rate = (success_count / total_count * 100) if total_count > 0 else 0
         
+        if columnar:
+            payload = {"columns": columns}
+        else:
+            payload = {
+                "signals": [
+                    dict(zip(HISTORICAL_COLUMNS, row)) for row in zip(*columns.values())
+                ]
+            }
+        
         return {
-            "signals": signal_data,
+            **payload,
             "total_count": total_count,
+            "limit": limit,
+            "offset": offset,
+            "has_more": offset + len(rows) < total_count,
             "date_range": {
                 "start": start_date.isoformat(),
                 "end": end_date.isoformat(),
@@ -82,10 +192,10 @@ class AnalyticsService:
             "summary": {
                 "avg_roi": round(avg_roi, 2),
                 "success_rate": round(success_rate, 2),
-                "sentiment_distribution": sentiment_counts,
-                "total_bullish": sentiment_counts.get("BULLISH", 0),
-                "total_bearish": sentiment_counts.get("BEARISH", 0),
-                "total_neutral": sentiment_counts.get("NEUTRAL", 0),
+                "sentiment_distribution": distribution,
+                "total_bullish": distribution["BULLISH"],
+                "total_bearish": distribution["BEARISH"],
+                "total_neutral": distribution["NEUTRAL"],
             },
             "query_time_ms": round(query_time, 2),
             "cached": False,
@@ -98,98 +208,99 @@ class AnalyticsService:
         """
         start_time = time.perf_counter()
         
-        # Get token info
+        # Get token info; only the name is used
         token_result = await self.session.execute(
-            select(Token).where(Token.symbol == symbol.upper())
+            select(Token.name).where(Token.symbol == symbol.upper())
         )
-        token = token_result.scalar_one_or_none()
+        token_name = token_result.scalar_one_or_none()
         
-        if not token:
+        if token_name is None:
             return {"error": f"Token {symbol} not found"}
         
-        # Get all signals for this token
-        signals_result = await self.session.execute(
-            select(Signal).where(Signal.token_symbol == symbol.upper())
+        # Stream the needed columns of every signal for this token; each
+        # partition is folded into column arrays so the full row list is
+        # never held in memory
+        stream = await self.session.stream(
+            select(
+                Signal.roi_percent,
+                Signal.success,
+                SENTIMENT_CODE,
+                Signal.channel_name,
+                Signal.timestamp,
+            )
+            .where(Signal.token_symbol == symbol.upper())
+            .execution_options(yield_per=STREAM_PARTITION_SIZE)
         )
-        signals = signals_result.scalars().all()
-        
-        if not signals:
+        roi_parts, success_parts, sentiment_parts, timestamp_parts = [], [], [], []
+        channel_counts = Counter()
+        async for partition in stream.partitions():
+            roi_col, success_col, sentiment_col, channel_col, timestamp_col = zip(*partition)
+            roi_parts.append(np.array(roi_col, dtype=np.float64))  # None -> nan
+            success_parts.append(np.array(success_col, dtype=bool))
+            sentiment_parts.append(np.array(sentiment_col, dtype=np.intp))
+            timestamp_parts.append(np.array(timestamp_col, dtype="datetime64[us]"))
+            channel_counts.update(channel_col)
+        
+        if not roi_parts:
             return {
                 "symbol": symbol.upper(),
-                "name": token.name,
+                "name": token_name,
                 "total_signals": 0,
                 "message": "No signals found for this token",
             }
         
         # Calculate comprehensive statistics
-        roi_values = [s.roi_percent for s in signals if s.roi_percent is not None]
-        success_signals = [s for s in signals if s.success]
+        roi_all = np.concatenate(roi_parts)
+        total = roi_all.size
+        rois = roi_all[~np.isnan(roi_all)]
+        success_count = int(np.count_nonzero(np.concatenate(success_parts)))
         
         # Sentiment distribution
-        sentiment_dist = {"BULLISH": 0, "BEARISH": 0, "NEUTRAL": 0}
-        for s in signals:
-            sentiment_dist[s.sentiment] = sentiment_dist.get(s.sentiment, 0) + 1
+        sentiment_dist = sentiment_distribution(
+            sentiment_code_counts(np.concatenate(sentiment_parts))
+        )
         
         # ROI distribution buckets
-        roi_dist = {
-            "< -50%": 0,
-            "-50% to -20%": 0,
-            "-20% to 0%": 0,
-            "0% to 20%": 0,
-            "20% to 50%": 0,
-            "50% to 100%": 0,
-            "> 100%": 0,
-        }
-        for roi in roi_values:
-            if roi < -50:
-                roi_dist["< -50%"] += 1
-            elif roi < -20:
-                roi_dist["-50% to -20%"] += 1
-            elif roi < 0:
-                roi_dist["-20% to 0%"] += 1
-            elif roi < 20:
-                roi_dist["0% to 20%"] += 1
-            elif roi < 50:
-                roi_dist["20% to 50%"] += 1
-            elif roi < 100:
-                roi_dist["50% to 100%"] += 1
-            else:
-                roi_dist["> 100%"] += 1
+        roi_dist = roi_distribution(rois)
         
         # Signals by channel
-        channel_counts = {}
-        for s in signals:
-            channel_counts[s.channel_name] = channel_counts.get(s.channel_name, 0) + 1
+        channel_counts = dict(channel_counts)
         
-        # Performance trend (last 30 days, daily)
+        # Performance trend (last 30 days, daily). Day i covers
+        # [now - (i+1) days, now - i days); avg ROI skips missing ROI.
         now = datetime.utcnow()
+        age_us = (
+            np.datetime64(now, "us") - np.concatenate(timestamp_parts)
+        ).astype(np.int64)
+        day = (age_us - 1) // 86_400_000_000
+        in_window = (day >= 0) & (day < 30)
+        day_counts = np.bincount(day[in_window], minlength=30)
+        with_roi = in_window & ~np.isnan(roi_all)
+        roi_sums = np.bincount(day[with_roi], weights=roi_all[with_roi], minlength=30)
+        roi_counts = np.bincount(day[with_roi], minlength=30)
+        
         performance_trend = []
-        for i in range(30):
-            day_start = now - timedelta(days=i+1)
-            day_end = now - timedelta(days=i)
-            day_signals = [s for s in signals if day_start <= s.timestamp < day_end]
-            if day_signals:
-                day_roi = np.mean([s.roi_percent for s in day_signals if s.roi_percent])
-                performance_trend.append({
-                    "date": day_end.strftime("%Y-%m-%d"),
-                    "signal_count": len(day_signals),
-                    "avg_roi": round(day_roi, 2) if not np.isnan(day_roi) else 0,
-                })
+        for i in np.flatnonzero(day_counts)[::-1].tolist():  # Chronological order
+            performance_trend.append({
+                "date": (now - timedelta(days=i)).strftime("%Y-%m-%d"),
+                "signal_count": int(day_counts[i]),
+                "avg_roi": round(float(roi_sums[i] / roi_counts[i]), 2) if roi_counts[i] else 0,
+            })
         
         query_time = (time.perf_counter() - start_time) * 1000
         
         return {
             "symbol": symbol.upper(),
-            "name": token.name,
-            "total_signals": len(signals),
-            "success_rate": round(len(success_signals) / len(signals) * 100, 2),
-            "avg_roi": round(np.mean(roi_values), 2) if roi_values else 0,
-            "median_roi": round(np.median(roi_values), 2) if roi_values else 0,
-            "volatility": round(np.std(roi_values), 2) if roi_values else 0,
+            "name": token_name,
+            "total_signals": total,
+            "success_rate": round(success_count / total * 100, 2),
+            "avg_roi": round(float(rois.mean()), 2) if rois.size else 0,
+            "median_roi": round(float(np.median(rois)), 2) if rois.size else 0,
+            "volatility": round(float(rois.std()), 2) if rois.size else 0,
             "sentiment_distribution": sentiment_dist,
             "roi_distribution": roi_dist,
             "signals_by_channel": channel_counts,
-            "performance_trend": performance_trend[::-1],  # Chronological order
+            "performance_trend": performance_trend,
             "query_time_ms": round(query_time, 2),
             "cached": False,
         }
@@ -201,67 +312,89 @@ class AnalyticsService:
         """
         start_time = time.perf_counter()
         
-        # Get all channels with their signals
-        channels_result = await self.session.execute(
-            select(Channel).where(Channel.is_active == True)
+        # Per-channel totals, aggregated by the database in one scan
+        active = Channel.is_active == True
+        totals_result = await self.session.execute(
+            select(
+                Signal.channel_id,
+                Channel.name,
+                func.count(Signal.id),
+                func.sum(case((Signal.success == True, 1), else_=0)),
+                func.avg(Signal.roi_percent),
+            )
+            .join(Channel, Channel.id == Signal.channel_id)
+            .where(active)
+            .group_by(Signal.channel_id, Channel.name)
+            .order_by(Signal.channel_id)
         )
-        channels = channels_result.scalars().all()
+        totals = totals_result.all()
         
-        leaderboard = []
-        total_signals = 0
-        
-        for channel in channels:
-            # Get channel signals
-            signals_result = await self.session.execute(
-                select(Signal).where(Signal.channel_id == channel.id)
+        # Most signaled token per channel: first row per channel wins. Ties
+        # go to the most recently signaled token, as they always have
+        token_result = await self.session.execute(
+            select(
+                Signal.channel_id,
+                Signal.token_symbol,
+                func.count().label("n"),
+                func.max(Signal.timestamp).label("latest"),
             )
-            signals = signals_result.scalars().all()
-            
-            if not signals:
-                continue
-            
-            total_signals += len(signals)
-            
-            # Calculate metrics
-            success_count = sum(1 for s in signals if s.success)
-            roi_values = [s.roi_percent for s in signals if s.roi_percent is not None]
-            avg_roi = np.mean(roi_values) if roi_values else 0
-            success_rate = (success_count / len(signals) * 100) if signals else 0
-            
-            # Calculate composite score
-            # Score = (success_rate * 0.4) + (avg_roi * 0.4) + (signal_count_normalized * 0.2)
-            score = (success_rate * 0.4) + (avg_roi * 0.4) + (min(len(signals) / 1000, 100) * 0.2)
-            
-            # Calculate win streak (consecutive successful signals)
-            sorted_signals = sorted(signals, key=lambda s: s.timestamp, reverse=True)
-            win_streak = 0
-            for s in sorted_signals:
-                if s.success:
-                    win_streak += 1
-                else:
-                    break
-            
-            # Find top token
-            token_counts = {}
-            for s in signals:
-                token_counts[s.token_symbol] = token_counts.get(s.token_symbol, 0) + 1
-            top_token = max(token_counts.items(), key=lambda x: x[1])[0] if token_counts else "N/A"
-            
+            .join(Channel, Channel.id == Signal.channel_id)
+            .where(active)
+            .group_by(Signal.channel_id, Signal.token_symbol)
+            .order_by(Signal.channel_id, desc("n"), desc("latest"))
+        )
+        top_token_by_channel: Dict[int, str] = {}
+        for channel_id, symbol, _, _ in token_result.all():
+            top_token_by_channel.setdefault(channel_id, symbol)
+        
+        # Win streak (consecutive successful signals from the newest): the
+        # position of each channel's newest non-successful signal, minus one
+        ranked = (
+            select(
+                Signal.channel_id,
+                Signal.success,
+                func.row_number().over(
+                    partition_by=Signal.channel_id, order_by=desc(Signal.timestamp)
+                ).label("rn"),
+            )
+            .join(Channel, Channel.id == Signal.channel_id)
+            .where(active)
+            .subquery()
+        )
+        loss_result = await self.session.execute(
+            select(ranked.c.channel_id, func.min(ranked.c.rn))
+            .where(ranked.c.success.is_not(True))
+            .group_by(ranked.c.channel_id)
+        )
+        first_loss = dict(loss_result.all())
+        
+        channel_ids = [row[0] for row in totals]
+        counts = [row[2] for row in totals]
+        win_streaks = [first_loss.get(c, n + 1) - 1 for c, n in zip(channel_ids, counts)]
+        
+        # Score every channel at once
+        total = np.asarray(counts, dtype=np.float64)
+        successes = np.fromiter((row[3] for row in totals), dtype=np.float64, count=len(totals))
+        success_rate = successes / total * 100
+        avg_roi = np.fromiter((row[4] or 0 for row in totals), dtype=np.float64, count=len(totals))
+        scores = np.round(composite_scores(success_rate, avg_roi, total), 2)
+        success_rate = np.round(success_rate, 2)
+        avg_roi = np.round(avg_roi, 2)
+        
+        leaderboard = []
+        for rank, i in enumerate(np.argsort(-scores, kind="stable").tolist(), start=1):
             leaderboard.append({
-                "channel_id": channel.id,
-                "channel_name": channel.name,
-                "total_signals": len(signals),
-                "success_rate": round(success_rate, 2),
-                "avg_roi": round(avg_roi, 2),
-                "score": round(score, 2),
-                "win_streak": win_streak,
-                "top_token": top_token,
+                "channel_id": channel_ids[i],
+                "channel_name": totals[i][1],
+                "total_signals": counts[i],
+                "success_rate": float(success_rate[i]),
+                "avg_roi": float(avg_roi[i]),
+                "score": float(scores[i]),
+                "win_streak": win_streaks[i],
+                "top_token": top_token_by_channel[channel_ids[i]],
+                "rank": rank,
             })
-        
-        # Sort by score and add ranks
-        leaderboard.sort(key=lambda x: x["score"], reverse=True)
-        for i, entry in enumerate(leaderboard):
-            entry["rank"] = i + 1
+        total_signals = sum(counts)
         
         query_time = (time.perf_counter() - start_time) * 1000
         
@@ -285,24 +418,37 @@ class AnalyticsService:
         now = datetime.utcnow()
         thirty_days_ago = now - timedelta(days=30)
         
+        week_ago = now - timedelta(days=7)
+        two_weeks_ago = now - timedelta(days=14)
+        in_window = Signal.timestamp >= thirty_days_ago
+        
+        # Sentiment mix and weekly volume, aggregated by the database
         result = await self.session.execute(
-            select(Signal)
-            .where(Signal.timestamp >= thirty_days_ago)
-            .order_by(Signal.timestamp)
+            select(
+                Signal.sentiment,
+                func.count(),
+                func.sum(case((Signal.timestamp >= week_ago, 1), else_=0)),
+                func.sum(case(
+                    (and_(Signal.timestamp >= two_weeks_ago, Signal.timestamp < week_ago), 1),
+                    else_=0,
+                )),
+            )
+            .where(in_window)
+            .group_by(Signal.sentiment)
         )
-        signals = result.scalars().all()
+        by_sentiment = result.all()
         
-        if not signals:
+        total = sum(row[1] for row in by_sentiment)
+        if not total:
             return {"error": "No signals found for pattern analysis"}
         
         # Analyze sentiment trends
-        sentiment_counts = {"BULLISH": 0, "BEARISH": 0, "NEUTRAL": 0}
-        for s in signals:
-            sentiment_counts[s.sentiment] += 1
+        counts = {sentiment: n for sentiment, n, *_ in by_sentiment}
+        bullish = counts.get("BULLISH", 0)
+        bearish = counts.get("BEARISH", 0)
         
-        total = len(signals)
-        bullish_pct = sentiment_counts["BULLISH"] / total
-        bearish_pct = sentiment_counts["BEARISH"] / total
+        bullish_pct = bullish / total
+        bearish_pct = bearish / total
         
         # Determine market phase
         if bullish_pct > 0.6:
@@ -318,61 +464,101 @@ class AnalyticsService:
         # Calculate sentiment strength (-1 to 1)
         sentiment_strength = (bullish_pct - bearish_pct)
         
-        # Detect patterns by token
-        patterns = []
-        token_signals = {}
-        for s in signals:
-            if s.token_symbol not in token_signals:
-                token_signals[s.token_symbol] = []
-            token_signals[s.token_symbol].append(s)
+        # Detect patterns by token; only tokens with 10+ signals can match,
+        # so the rest are filtered out before any rows are fetched
+        eligible = (
+            select(Signal.token_symbol)
+            .where(in_window)
+            .group_by(Signal.token_symbol)
+            .having(func.count() >= 10)
+        )
+        result = await self.session.execute(
+            select(
+                Signal.token_symbol,
+                Signal.sentiment,
+                Signal.roi_percent,
+                Signal.confidence_score,
+                Signal.timestamp,
+            )
+            .where(in_window, Signal.token_symbol.in_(eligible))
+            .order_by(Signal.token_symbol, Signal.timestamp)
+        )
+        rows = result.all()
         
-        for token, t_signals in token_signals.items():
-            if len(t_signals) < 10:
-                continue
+        patterns = []
+        if rows:
+            tokens, sentiments, rois, confidences, timestamps = zip(*rows)
+            tokens = np.array(tokens, dtype=object)
+            bullish_flags = np.array(sentiments, dtype=object) == "BULLISH"
+            rois = np.array(rois, dtype=np.float64)  # None -> nan
+            confidences = np.array(confidences, dtype=np.float64)
+            
+            # Rows arrive sorted by token, so each token is one run and a
+            # single scan for value changes finds every boundary. Tokens are
+            # reported in order of their first signal in the window
+            boundaries = np.flatnonzero(tokens[1:] != tokens[:-1]) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [len(tokens)]))
+            order = np.argsort([timestamps[i] for i in starts], kind="stable")
+            starts, ends = starts[order], ends[order]
+            sizes = ends - starts
             
-            # Check for bullish momentum (mostly bullish signals with positive ROI)
-            recent_signals = sorted(t_signals, key=lambda x: x.timestamp)[-20:]
-            bullish_count = sum(1 for s in recent_signals if s.sentiment == "BULLISH")
-            avg_roi = np.mean([s.roi_percent for s in recent_signals if s.roi_percent])
+            # Every token's windows are evaluated at once, as segment sums
+            # over the flat arrays, instead of slicing token by token.
+            # Bullish momentum: the last 20 signals, averaging known ROI
+            lo = np.maximum(starts, ends - 20)
+            bullish_counts = _window_sums(bullish_flags, lo, ends).astype(np.int64)
+            has_roi = ~np.isnan(rois)
+            roi_counts = _window_sums(has_roi, lo, ends)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                avg_rois = _window_sums(np.where(has_roi, rois, 0), lo, ends) / roi_counts
+                momentum = (bullish_counts >= 15) & (avg_rois > 20)
             
-            if bullish_count >= 15 and avg_roi > 20:
-                patterns.append({
-                    "pattern_type": "bullish_momentum",
-                    "description": f"{token} showing strong bullish momentum with {bullish_count}/20 bullish signals and {avg_roi:.1f}% avg ROI",
-                    "confidence": min(0.95, (bullish_count / 20) * 0.8 + (avg_roi / 100) * 0.2),
-                    "tokens_affected": [token],
-                    "start_date": recent_signals[0].timestamp.isoformat(),
-                    "detected_at": now.isoformat(),
-                    "supporting_signals": len(recent_signals),
-                })
+            # Accumulation: mean confidence of the last 15 vs the 15 before
+            mid = np.maximum(starts, ends - 15)
+            older_lo = np.maximum(starts, ends - 30)
+            recent_confs = _window_sums(confidences, mid, ends) / 15
+            older_confs = _window_sums(confidences, older_lo, mid) / 15
+            accumulation = (sizes >= 30) & (recent_confs > older_confs * 1.1)
+            # An all-zero older window is an unbounded increase (capped below)
+            conf_ratios = np.divide(
+                recent_confs, older_confs,
+                out=np.full_like(recent_confs, np.inf), where=older_confs > 0,
+            )
             
-            # Check for accumulation pattern (signals clustering with increasing confidence)
-            if len(t_signals) >= 30:
-                recent = t_signals[-15:]
-                older = t_signals[-30:-15]
-                recent_conf = np.mean([s.confidence_score for s in recent])
-                older_conf = np.mean([s.confidence_score for s in older])
+            for k in np.flatnonzero(momentum | accumulation).tolist():
+                token = tokens[starts[k]]
+                
+                if momentum[k]:
+                    bullish_count = int(bullish_counts[k])
+                    avg_roi = float(avg_rois[k])
+                    patterns.append({
+                        "pattern_type": "bullish_momentum",
+                        "description": f"{token} showing strong bullish momentum with {bullish_count}/20 bullish signals and {avg_roi:.1f}% avg ROI",
+                        "confidence": min(0.95, (bullish_count / 20) * 0.8 + (avg_roi / 100) * 0.2),
+                        "tokens_affected": [token],
+                        "start_date": timestamps[lo[k]].isoformat(),
+                        "detected_at": now.isoformat(),
+                        "supporting_signals": int(ends[k] - lo[k]),
+                    })
                 
-                if recent_conf > older_conf * 1.1:  # 10% increase in confidence
+                if accumulation[k]:
                     patterns.append({
                         "pattern_type": "accumulation",
                         "description": f"{token} showing accumulation pattern with increasing signal confidence",
-                        "confidence": min(0.9, (recent_conf / older_conf) - 0.9),
+                        "confidence": min(0.9, float(conf_ratios[k]) - 0.9),
                         "tokens_affected": [token],
-                        "start_date": older[0].timestamp.isoformat(),
+                        "start_date": timestamps[older_lo[k]].isoformat(),
                         "detected_at": now.isoformat(),
                         "supporting_signals": 30,
                     })
         
         # Determine volume trend
-        week_ago = now - timedelta(days=7)
-        two_weeks_ago = now - timedelta(days=14)
-        
-        recent_week = [s for s in signals if s.timestamp >= week_ago]
-        previous_week = [s for s in signals if two_weeks_ago <= s.timestamp < week_ago]
+        recent_week = sum(row[2] for row in by_sentiment)
+        previous_week = sum(row[3] for row in by_sentiment)
         
-        if len(previous_week) > 0:
-            volume_change = (len(recent_week) - len(previous_week)) / len(previous_week)
+        if previous_week > 0:
+            volume_change = (recent_week - previous_week) / previous_week
             if volume_change > 0.2:
                 volume_trend = "increasing"
             elif volume_change < -0.2:
@@ -390,12 +576,13 @@ class AnalyticsService:
             "dominant_sentiment": dominant_sentiment,
             "sentiment_strength": round(sentiment_strength, 3),
             "volume_trend": volume_trend,
-            "signals_analyzed": len(signals),
+            "signals_analyzed": total,
             "time_period_days": 30,
             "query_time_ms": round(query_time, 2),
             "cached": False,
         }
     
+    @cached_result("trending", ttl=60)
     async def get_trending_tokens(self, hours: int = 24) -> Dict[str, Any]:
         """Get trending tokens from recent signals."""
         start_time = time.perf_counter()
@@ -406,37 +593,46 @@ class AnalyticsService:
         
         # Get recent signals
         result = await self.session.execute(
-            select(Signal).where(Signal.timestamp >= cutoff)
+            select(
+                Signal.token_symbol,
+                Signal.channel_name,
+                SENTIMENT_CODE,
+                Signal.roi_percent,
+            ).where(Signal.timestamp >= cutoff)
         )
-        recent_signals = result.scalars().all()
+        recent_signals = result.all()
         
-        # Get previous period signals for comparison
+        # Previous period signal counts per token, for comparison
         result = await self.session.execute(
-            select(Signal).where(
-                and_(Signal.timestamp >= previous_cutoff, Signal.timestamp < cutoff)
-            )
+            select(Signal.token_symbol, func.count())
+            .where(and_(Signal.timestamp >= previous_cutoff, Signal.timestamp < cutoff))
+            .group_by(Signal.token_symbol)
         )
-        previous_signals = result.scalars().all()
+        previous_counts = dict(result.all())
         
         # Count signals per token
-        recent_counts = {}
-        recent_roi = {}
-        recent_sentiment = {}
-        
-        for s in recent_signals:
-            token = s.token_symbol
-            recent_counts[token] = recent_counts.get(token, 0) + 1
-            if token not in recent_roi:
-                recent_roi[token] = []
-            if s.roi_percent:
-                recent_roi[token].append(s.roi_percent)
-            if token not in recent_sentiment:
-                recent_sentiment[token] = {"BULLISH": 0, "BEARISH": 0, "NEUTRAL": 0}
-            recent_sentiment[token][s.sentiment] += 1
-        
-        previous_counts = {}
-        for s in previous_signals:
-            previous_counts[s.token_symbol] = previous_counts.get(s.token_symbol, 0) + 1
+        recent_counts = Counter(s.token_symbol for s in recent_signals)
+        
+        # Per-token ROI sums and sentiment tallies over column arrays; each
+        # signal's token is coded by its position in recent_counts
+        n_tokens = len(recent_counts)
+        token_index = {token: i for i, token in enumerate(recent_counts)}
+        if recent_signals:
+            symbol_col, _, sentiment_col, roi_col = zip(*recent_signals)
+        else:
+            symbol_col = sentiment_col = roi_col = ()
+        token_codes = np.fromiter(
+            (token_index[t] for t in symbol_col), dtype=np.intp, count=len(symbol_col)
+        )
+        rois = np.array(roi_col, dtype=np.float64)  # None -> nan
+        has_roi = ~np.isnan(rois)
+        roi_sums = np.bincount(token_codes[has_roi], weights=rois[has_roi], minlength=n_tokens)
+        roi_counts = np.bincount(token_codes[has_roi], minlength=n_tokens)
+        width = len(SENTIMENTS) + 1
+        recent_sentiment = np.bincount(
+            token_codes * width + np.array(sentiment_col, dtype=np.intp),
+            minlength=n_tokens * width,
+        ).reshape(n_tokens, width)[:, : len(SENTIMENTS)]
         
         # Get token price data
         token_symbols = list(recent_counts.keys())
@@ -454,15 +650,13 @@ class AnalyticsService:
 
         # Build trending list
         trending = []
-        for token, count in recent_counts.items():
+        for i, (token, count) in enumerate(recent_counts.items()):
             prev_count = previous_counts.get(token, 1)
             change_pct = ((count - prev_count) / prev_count) * 100
             
-            roi_list = recent_roi.get(token, [])
-            avg_roi = np.mean(roi_list) if roi_list else 0
+            avg_roi = float(roi_sums[i] / roi_counts[i]) if roi_counts[i] else 0
             
-            sent = recent_sentiment.get(token, {})
-            dominant = max(sent.items(), key=lambda x: x[1])[0] if sent else "NEUTRAL"
+            dominant = SENTIMENTS[int(recent_sentiment[i].argmax())]
             
             # Momentum score based on count, change, and sentiment
             momentum = (count * 0.3) + (change_pct * 0.4) + (avg_roi * 0.3)
@@ -487,10 +681,8 @@ class AnalyticsService:
             t["rank"] = i + 1
         
         # Get most active channels
-        channel_counts = {}
-        for s in recent_signals:
-            channel_counts[s.channel_name] = channel_counts.get(s.channel_name, 0) + 1
-        most_active = sorted(channel_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        channel_counts = Counter(s.channel_name for s in recent_signals)
+        most_active = channel_counts.most_common(5)
         
         return {
             "trending": trending[:10],
@@ -499,15 +691,17 @@ class AnalyticsService:
             "timestamp": now.isoformat(),
         }
     
+    @cached_result("market_sentiment", ttl=30)
     async def get_market_sentiment(self, hours: int = 24) -> Dict[str, Any]:
         """Get overall market sentiment analysis."""
         now = datetime.utcnow()
         cutoff = now - timedelta(hours=hours)
         
         result = await self.session.execute(
-            select(Signal).where(Signal.timestamp >= cutoff)
+            select(Signal.token_symbol, SENTIMENT_CODE.label("sentiment_code"), Signal.success)
+            .where(Signal.timestamp >= cutoff)
         )
-        signals = result.scalars().all()
+        signals = result.all()
         
         if not signals:
             return {
@@ -517,9 +711,7 @@ class AnalyticsService:
             }
         
         total = len(signals)
-        bullish = sum(1 for s in signals if s.sentiment == "BULLISH")
-        bearish = sum(1 for s in signals if s.sentiment == "BEARISH")
-        neutral = sum(1 for s in signals if s.sentiment == "NEUTRAL")
+        bullish, bearish, neutral = sentiment_code_counts(s.sentiment_code for s in signals).tolist()
         
         bullish_pct = (bullish / total) * 100
         bearish_pct = (bearish / total) * 100
@@ -542,22 +734,21 @@ class AnalyticsService:
         fear_greed = int(50 + (sentiment_score * 30) + ((success_rate - 0.5) * 40))
         fear_greed = max(0, min(100, fear_greed))
         
-        # Top tokens by sentiment
+        # Top tokens by sentiment; the extra slot absorbs unknown sentiments
         token_sentiment = {}
         for s in signals:
-            if s.token_symbol not in token_sentiment:
-                token_sentiment[s.token_symbol] = {"BULLISH": 0, "BEARISH": 0}
-            token_sentiment[s.token_symbol][s.sentiment] = token_sentiment[s.token_symbol].get(s.sentiment, 0) + 1
+            counts = token_sentiment.setdefault(s.token_symbol, [0] * (len(SENTIMENTS) + 1))
+            counts[s.sentiment_code] += 1
         
         # Sort tokens by bullish/bearish counts
         bullish_tokens = sorted(
-            [(t, s.get("BULLISH", 0)) for t, s in token_sentiment.items()],
+            [(t, c[0]) for t, c in token_sentiment.items()],
             key=lambda x: x[1],
             reverse=True
         )[:5]
         
         bearish_tokens = sorted(
-            [(t, s.get("BEARISH", 0)) for t, s in token_sentiment.items()],
+            [(t, c[1]) for t, c in token_sentiment.items()],
             key=lambda x: x[1],
             reverse=True
         )[:5]
@@ -578,10 +769,4 @@ class AnalyticsService:
     
     def _get_token_name(self, symbol: str) -> str:
         """Get token name from symbol."""
-        token_names = {
-            "BTC": "Bitcoin", "ETH": "Ethereum", "SOL": "Solana",
-            "DOGE": "Dogecoin", "PEPE": "Pepe", "SHIB": "Shiba Inu",
-            "LINK": "Chainlink", "MATIC": "Polygon", "AVAX": "Avalanche",
-            "DOT": "Polkadot",
-        }
-        return token_names.get(symbol, symbol)
+        return _TOKEN_NAMES.get(symbol, symbol)
@@ -6,19 +6,26 @@ Uses the free Basic plan endpoints:
   - /v1/cryptocurrency/map            (symbol → CMC ID mapping)
 
 Rate limits (free tier): 30 calls/min, 10,000 calls/month.
-We batch all tracked symbols into a single call to stay well within limits.
+We batch all tracked symbols into a single call to stay well within limits,
+and cache each quote in Redis so repeat lookups skip the API entirely.
 """
 import logging
 from typing import Dict, Any, Optional, List
 
 import httpx
+import orjson
 
+from app.cache import get_redis
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 CMC_BASE_URL = "https://pro-api.coinmarketcap.com"
 
+# Per-symbol quote cache shared by every worker
+QUOTE_CACHE_PREFIX = "cmc:quote:"
+QUOTE_CACHE_TTL = 90
+
 
 class CoinMarketCapService:
     """Async service for CoinMarketCap API."""
@@ -52,12 +59,18 @@ class CoinMarketCapService:
         # Deduplicate & uppercase
         unique = sorted(set(s.upper() for s in symbols))
 
+        # Only symbols without a fresh cached quote go to the API
+        results = await _cached_quotes(unique)
+        missing = [s for s in unique if s not in results]
+
         # CMC allows up to 120 symbols per call
-        results: Dict[str, Dict[str, Any]] = {}
-        for batch in _chunks(unique, 120):
+        fetched: Dict[str, Dict[str, Any]] = {}
+        for batch in _chunks(missing, 120):
             batch_result = await self._fetch_quotes(batch)
-            results.update(batch_result)
+            fetched.update(batch_result)
 
+        await _store_quotes(fetched)
+        results.update(fetched)
         return results
 
     async def get_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
@@ -140,6 +153,33 @@ class CoinMarketCapService:
         return results
 
 
+async def _cached_quotes(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Get the cached quotes for *symbols*, skipping any that have expired."""
+    redis = get_redis()
+    if redis is None or not symbols:
+        return {}
+    try:
+        raw = await redis.mget([QUOTE_CACHE_PREFIX + s for s in symbols])
+    except Exception as e:
+        logger.debug(f"Failed to read cached CMC quotes: {e}")
+        return {}
+    return {s: orjson.loads(r) for s, r in zip(symbols, raw) if r is not None}
+
+
+async def _store_quotes(quotes: Dict[str, Dict[str, Any]]) -> None:
+    """Cache freshly fetched quotes, one key per symbol."""
+    redis = get_redis()
+    if redis is None or not quotes:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for symbol, quote in quotes.items():
+                pipe.set(QUOTE_CACHE_PREFIX + symbol, orjson.dumps(quote), ex=QUOTE_CACHE_TTL)
+            await pipe.execute()
+    except Exception as e:
+        logger.debug(f"Failed to cache CMC quotes: {e}")
+
+
 def _chunks(lst: List[str], n: int):
     """Yield successive n-sized chunks from lst."""
     for i in range(0, len(lst), n):
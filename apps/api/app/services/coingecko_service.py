@@ -3,6 +3,7 @@ CoinGecko API service — free tier, no API key required.
 
 Provides:
   - Price lookup by symbol  (via /search → /simple/price)
+  - Batched price lookup by contract address (via /simple/token_price)
   - 24 h OHLC candlestick data (via /coins/{id}/ohlc)
 
 Rate limit: ~10-30 calls/min on the free tier.
@@ -11,14 +12,29 @@ We keep an in-memory symbol→id cache to minimise search calls.
 import logging
 import asyncio
 import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List, Tuple
 
 import httpx
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 CG_BASE = "https://api.coingecko.com/api/v3"
 
+# Negative cache for contract lookups CoinGecko answered with 404. Bots and
+# typos re-query the same unknown address across every platform; a miss is
+# remembered for CONTRACT_MISS_TTL seconds so those repeats skip the
+# rate-limited HTTP round-trip. Rate limits and errors are never cached.
+CONTRACT_MISS_TTL = 300  # seconds
+CONTRACT_MISS_MAX = 50_000
+
+# /simple/token_price accepts many contract addresses per call. Concurrent
+# token_price() callers are collected for TOKEN_PRICE_BATCH_WINDOW seconds
+# (or until TOKEN_PRICE_BATCH_SIZE addresses) and served by one request.
+TOKEN_PRICE_BATCH_SIZE = 50
+TOKEN_PRICE_BATCH_WINDOW = 0.01  # seconds
+
 # Pre-seeded map so top coins never need a /search call
 _SYMBOL_TO_ID: Dict[str, str] = {
     "BTC": "bitcoin",
@@ -71,11 +87,20 @@ _SYMBOL_TO_ID: Dict[str, str] = {
 }
 
 
+def _address_key(address: str) -> str:
+    """EVM addresses are case-insensitive hex; base58 ones are not."""
+    return address.lower() if address.startswith("0x") else address
+
+
 class CoinGeckoService:
     """Lightweight async CoinGecko client (free tier)."""
 
     def __init__(self) -> None:
         self._id_cache: Dict[str, Optional[str]] = dict(_SYMBOL_TO_ID)
+        # (platform, address) → time of the 404, oldest first
+        self._contract_misses: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        # platform → {address_key: future} waiting for the next token-price batch
+        self._price_batches: Dict[str, Dict[str, asyncio.Future]] = {}
         # Rate limiting state (lazy initialized)
         self._last_call_time = 0.0
     
@@ -158,11 +183,19 @@ class CoinGeckoService:
 
         Returns a dict compatible with ``TokenSearchResult`` or ``None``.
         """
+        miss_key = (platform, _address_key(address))
+        missed_at = self._contract_misses.get(miss_key)
+        if missed_at is not None:
+            if time.time() - missed_at < CONTRACT_MISS_TTL:
+                return None
+            del self._contract_misses[miss_key]
+
         try:
             resp = await self._safe_get(
                 f"{CG_BASE}/coins/{platform}/contract/{address}",
             )
             if resp.status_code == 404:
+                self._record_contract_miss(miss_key)
                 return None
             if resp.status_code == 429:
                 logger.warning("CoinGecko rate limit during contract lookup")
@@ -198,6 +231,44 @@ class CoinGeckoService:
             logger.error(f"CoinGecko contract lookup error: {e}")
             return None
 
+    def _record_contract_miss(self, miss_key: Tuple[str, str]) -> None:
+        """Remember a 404 contract lookup, evicting the oldest when full."""
+        self._contract_misses.pop(miss_key, None)
+        self._contract_misses[miss_key] = time.time()
+        while len(self._contract_misses) > CONTRACT_MISS_MAX:
+            self._contract_misses.popitem(last=False)
+
+    async def get_contract_index(self, platforms: List[str]) -> Dict[str, str]:
+        """
+        Map every known contract address on *platforms* to its platform id.
+
+        One ``/coins/list?include_platform=true`` call covers all coins.
+        When an address is listed on several platforms the earliest in
+        *platforms* wins. EVM addresses are lowercased. Returns ``{}`` on
+        any upstream failure.
+        """
+        try:
+            resp = await self._safe_get(
+                f"{CG_BASE}/coins/list", params={"include_platform": "true"}
+            )
+            if resp.status_code != 200:
+                logger.warning(f"CoinGecko coins list error {resp.status_code}")
+                return {}
+            coins = resp.json()
+        except Exception as e:
+            logger.error(f"CoinGecko coins list fetch error: {e}")
+            return {}
+
+        index: Dict[str, str] = {}
+        for coin in coins:
+            listed = coin.get("platforms") or {}
+            for platform in platforms:
+                address = listed.get(platform)
+                if not address:
+                    continue
+                index.setdefault(_address_key(address), platform)
+        return index
+
     # ------------------------------------------------------------------
     # Prices
     # ------------------------------------------------------------------
@@ -258,25 +329,98 @@ class CoinGeckoService:
 
         return results
 
+    async def get_token_prices(
+        self, platform: str, addresses: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get USD price + 24 h change for contract addresses on one platform.
+
+        Sends one /simple/token_price request per TOKEN_PRICE_BATCH_SIZE
+        addresses. Returns ``{address_key: {price_usd, price_change_24h}}``
+        for the addresses CoinGecko knows, keyed like ``_address_key``.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(addresses), TOKEN_PRICE_BATCH_SIZE):
+            chunk = addresses[i:i + TOKEN_PRICE_BATCH_SIZE]
+            try:
+                resp = await self._safe_get(
+                    f"{CG_BASE}/simple/token_price/{platform}",
+                    params={
+                        "contract_addresses": ",".join(chunk),
+                        "vs_currencies": "usd",
+                        "include_24hr_change": "true",
+                    },
+                )
+                if resp.status_code != 200:
+                    logger.warning(f"CoinGecko token price error {resp.status_code}")
+                    continue
+
+                for address, quote in resp.json().items():
+                    if quote.get("usd") is not None:
+                        results[_address_key(address)] = {
+                            "price_usd": quote["usd"],
+                            "price_change_24h": quote.get("usd_24h_change"),
+                        }
+            except Exception as e:
+                logger.error(f"CoinGecko token price fetch error: {e}")
+
+        return results
+
+    async def token_price(
+        self, platform: str, address: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the price of one contract address, batched with concurrent callers.
+
+        Returns ``{price_usd, price_change_24h}`` or ``None``.
+        """
+        key = _address_key(address)
+        batch = self._price_batches.get(platform)
+        if batch is None:
+            batch = self._price_batches[platform] = {}
+            asyncio.get_running_loop().call_later(
+                TOKEN_PRICE_BATCH_WINDOW, self._schedule_price_flush, platform, batch
+            )
+
+        fut = batch.get(key)
+        if fut is None:
+            fut = batch[key] = asyncio.get_running_loop().create_future()
+            if len(batch) >= TOKEN_PRICE_BATCH_SIZE:
+                self._schedule_price_flush(platform, batch)
+        return await asyncio.shield(fut)
+
+    def _schedule_price_flush(
+        self, platform: str, batch: Dict[str, asyncio.Future]
+    ) -> None:
+        """Close *batch* to new callers and fetch it (no-op if already sent)."""
+        if self._price_batches.get(platform) is batch:
+            del self._price_batches[platform]
+            asyncio.ensure_future(self._flush_token_prices(platform, batch))
+
+    async def _flush_token_prices(
+        self, platform: str, batch: Dict[str, asyncio.Future]
+    ) -> None:
+        """Fetch one batch of token prices and resolve every waiting caller."""
+        prices = await self.get_token_prices(platform, list(batch))
+        for address, fut in batch.items():
+            if not fut.done():
+                fut.set_result(prices.get(address))
+
     # ------------------------------------------------------------------
     # OHLC history (for candlestick charts)
     # ------------------------------------------------------------------
 
-    async def get_ohlc(
-        self, symbol: str, days: int = 1
-    ) -> List[Dict[str, Any]]:
+    async def get_ohlc_array(self, symbol: str, days: int = 1) -> np.ndarray:
         """
-        Get OHLC candlestick data from CoinGecko.
-
-        For ``days=1`` CoinGecko returns 30-minute candles (≈48 candles).
+        Get OHLC candlestick data from CoinGecko as a columnar array.
 
-        Returns list of ``{t: ISO-string, o, h, l, c}`` dicts.
-        Raises on rate-limit or transient API errors so callers can
-        decide whether to cache or retry.
+        Returns a ``float64`` array of shape ``(N, 5)`` with columns
+        ``[timestamp_ms, o, h, l, c]``. Raises on rate-limit or transient
+        API errors so callers can decide whether to cache or retry.
         """
         cg_id = await self._resolve_id(symbol)
         if not cg_id:
-            return []
+            return _EMPTY_OHLC
 
         resp = await self._safe_get(
             f"{CG_BASE}/coins/{cg_id}/ohlc",
@@ -292,24 +436,63 @@ class CoinGeckoService:
             raise Exception(f"CoinGecko API error {resp.status_code}")
 
         raw = resp.json()  # [[timestamp_ms, o, h, l, c], ...]
-        candles: List[Dict[str, Any]] = []
-        for row in raw:
-            if len(row) >= 5:
-                from datetime import datetime, timezone
+        rows = [row[:5] for row in raw if len(row) >= 5]
+        if not rows:
+            return _EMPTY_OHLC
+        return np.asarray(rows, dtype=np.float64)
 
-                ts = datetime.fromtimestamp(
-                    row[0] / 1000, tz=timezone.utc
-                )
-                candles.append(
-                    {
-                        "t": ts.isoformat(),
-                        "o": row[1],
-                        "h": row[2],
-                        "l": row[3],
-                        "c": row[4],
-                    }
-                )
-        return candles
+    async def get_ohlc(
+        self, symbol: str, days: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Get OHLC candlestick data from CoinGecko.
+
+        For ``days=1`` CoinGecko returns 30-minute candles (≈48 candles).
+
+        Returns list of ``{t: ISO-string, o, h, l, c}`` dicts.
+        Raises on rate-limit or transient API errors so callers can
+        decide whether to cache or retry.
+        """
+        return ohlc_to_candles(await self.get_ohlc_array(symbol, days=days))
+
+
+_EMPTY_OHLC = np.empty((0, 5), dtype=np.float64)
+
+
+def ohlc_to_candles(arr: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Convert an ``(N, 5)`` OHLC array into ``{t: ISO-string, o, h, l, c}`` dicts.
+    """
+    if not len(arr):
+        return []
+    stamps = np.datetime_as_string(
+        arr[:, 0].astype("datetime64[ms]").astype("datetime64[s]"), unit="s"
+    )
+    return [
+        {"t": f"{t}+00:00", "o": o, "h": h, "l": l, "c": c}
+        for t, (o, h, l, c) in zip(stamps.tolist(), arr[:, 1:].tolist())
+    ]
+
+
+def downsample_ohlc(arr: np.ndarray, target: int) -> np.ndarray:
+    """
+    Reduce an ``(N, 5)`` OHLC array to at most *target* rows by merging
+    adjacent buckets.
+
+    Each bucket keeps OHLC semantics: first open (and timestamp), max high,
+    min low, last close. Returns *arr* unchanged if already small enough.
+    """
+    n = len(arr)
+    if target <= 0 or n <= target:
+        return arr
+
+    starts = np.arange(target) * n // target
+    ends = np.append(starts[1:], n) - 1
+    merged = arr[starts].copy()
+    merged[:, 2] = np.maximum.reduceat(arr[:, 2], starts)
+    merged[:, 3] = np.minimum.reduceat(arr[:, 3], starts)
+    merged[:, 4] = arr[ends, 4]
+    return merged
 
 
 # Singleton
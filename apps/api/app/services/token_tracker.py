@@ -24,6 +24,24 @@ logger = logging.getLogger(__name__)
 PRICE_REFRESH_INTERVAL = 60
 # Max recent transfers kept in memory per token
 MAX_TRANSFERS_PER_TOKEN = 25
+# Quote fields served by GET /tracking/prices (TrackedTokenPriceResponse).
+# Rows are projected once when a quote is cached, not on every request.
+PRICE_ROW_FIELDS = (
+    "symbol", "chain", "address", "price_usd", "price_change_24h", "token_name",
+    "token_logo", "market_cap", "volume_24h", "cmc_rank", "updated_at",
+)
+# TrackedToken.chain → CoinGecko asset-platform id for contract price lookups
+CHAIN_TO_PLATFORM = {
+    "eth": "ethereum",
+    "ethereum": "ethereum",
+    "bsc": "binance-smart-chain",
+    "polygon": "polygon-pos",
+    "arbitrum": "arbitrum-one",
+    "base": "base",
+    "avalanche": "avalanche",
+    "solana": "solana",
+    "tron": "tron",
+}
 
 
 class TokenPriceTracker:
@@ -35,6 +53,8 @@ class TokenPriceTracker:
     def __init__(self):
         # Price cache:  "SYMBOL" -> CMC quote dict
         self._prices: Dict[str, Dict[str, Any]] = {}
+        # Same quotes projected onto PRICE_ROW_FIELDS:  "SYMBOL" -> row
+        self._price_rows: Dict[str, Dict[str, Any]] = {}
         # User subscription map:  user_id -> set of SYMBOL keys
         self._subscribers: Dict[int, Set[str]] = defaultdict(set)
         # Recent transfers per address:
@@ -148,23 +168,24 @@ class TokenPriceTracker:
             now_iso = datetime.utcnow().isoformat()
             for sym, data in quotes.items():
                 if data.get("price_usd") is not None:
-                    self._prices[sym] = {
-                        **data,
-                        "updated_at": now_iso,
-                    }
-                    self._price_history[sym].append(
-                        {"t": now_iso, "p": data["price_usd"]}
-                    )
+                    self._store_price(sym, data, now_iso)
 
         # --- CoinGecko fallback for any symbols still missing ---
         missing = [s for s in symbols if s not in self._prices or self._prices[s].get("price_usd") is None]
         if missing:
             await self._fallback_coingecko_prices(missing)
 
-        # --- Moralis fallback for remaining EVM tokens with addresses ---
-        # still_missing = [s for s in symbols if s not in self._prices or self._prices[s].get("price_usd") is None]
-        # if still_missing:
-        #    await self._fallback_moralis_prices(tokens, still_missing)
+        # --- CoinGecko contract-address fallback for tokens still missing ---
+        still_missing = {s for s in symbols if s not in self._prices or self._prices[s].get("price_usd") is None}
+        if still_missing:
+            await self._fallback_contract_prices(tokens, still_missing)
+
+    def _store_price(self, sym: str, data: Dict[str, Any], now_iso: str) -> None:
+        """Cache a fresh quote for *sym* and extend its price history."""
+        quote = {"symbol": sym, **data, "updated_at": now_iso}
+        self._prices[sym] = quote
+        self._price_rows[sym] = {field: quote.get(field) for field in PRICE_ROW_FIELDS}
+        self._price_history[sym].append({"t": now_iso, "p": data["price_usd"]})
 
     async def _fallback_coingecko_prices(self, symbols):
         """Use CoinGecko free API as price fallback."""
@@ -175,17 +196,40 @@ class TokenPriceTracker:
             now_iso = datetime.utcnow().isoformat()
             for sym, data in quotes.items():
                 if data.get("price_usd") is not None:
-                    self._prices[sym] = {
-                        **data,
-                        "updated_at": now_iso,
-                    }
-                    self._price_history[sym].append(
-                        {"t": now_iso, "p": data["price_usd"]}
-                    )
+                    self._store_price(sym, data, now_iso)
                     logger.debug(f"CoinGecko price for {sym}: ${data['price_usd']}")
         except Exception as e:
             logger.debug(f"CoinGecko fallback error: {e}")
 
+    async def _fallback_contract_prices(self, tokens, symbols):
+        """
+        Price tokens CoinGecko can't resolve by symbol via their contract address.
+
+        Lookups are issued concurrently so the CoinGecko client batches them
+        into one /simple/token_price request per platform.
+        """
+        from app.services.coingecko_service import coingecko_service
+
+        lookups = {}  # symbol → (platform, address)
+        for t in tokens:
+            sym = t["symbol"].upper()
+            platform = CHAIN_TO_PLATFORM.get((t.get("chain") or "").lower())
+            if sym in symbols and t.get("address") and platform and sym not in lookups:
+                lookups[sym] = (platform, t["address"])
+        if not lookups:
+            return
+
+        try:
+            quotes = await asyncio.gather(
+                *(coingecko_service.token_price(p, a) for p, a in lookups.values())
+            )
+            now_iso = datetime.utcnow().isoformat()
+            for sym, data in zip(lookups, quotes):
+                if data and data.get("price_usd") is not None:
+                    self._store_price(sym, data, now_iso)
+        except Exception as e:
+            logger.debug(f"CoinGecko contract price fallback error: {e}")
+
     async def _fallback_moralis_prices(self, tokens, symbols):
         """Use Moralis as price source when CMC/CoinGecko didn't cover a symbol."""
         # Moralis integration removed.
@@ -245,13 +289,7 @@ class TokenPriceTracker:
 
         if data and data.get("price_usd") is not None:
             now_iso = datetime.utcnow().isoformat()
-            self._prices[symbol] = {
-                **data,
-                "updated_at": now_iso,
-            }
-            self._price_history[symbol].append(
-                {"t": now_iso, "p": data["price_usd"]}
-            )
+            self._store_price(symbol, data, now_iso)
             logger.info(f"⚡ Instant price for {symbol}: ${data['price_usd']}")
         else:
             logger.warning(f"Could not fetch price for {symbol} from any source")
@@ -336,6 +374,11 @@ class TokenPriceTracker:
         keys = self._subscribers.get(user_id, set())
         return [self._prices[k] for k in keys if k in self._prices]
 
+    def get_price_rows_for_user(self, user_id: int) -> List[Dict[str, Any]]:
+        """Get a user's cached prices as pre-built PRICE_ROW_FIELDS rows."""
+        rows = self._price_rows
+        return [rows[k] for k in self._subscribers.get(user_id, ()) if k in rows]
+
     def get_all_prices(self) -> Dict[str, Dict[str, Any]]:
         return dict(self._prices)
 
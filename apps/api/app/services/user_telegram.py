@@ -465,24 +465,9 @@ class UserTelegramManager:
         }
 
         count = len(resolved) if resolved else "all"
-        # Notify via WebSocket
-        try:
-            from app.services.websocket_manager import manager
-
-            await manager.send_to_user(
-                user_id,
-                {
-                    "type": "monitoring_status",
-                    "data": {
-                        "is_monitoring": True,
-                        "channels_count": len(resolved),
-                        "message": f"Monitoring active for {count} channel(s)",
-                    },
-                    "timestamp": datetime.utcnow().isoformat(),
-                },
-            )
-        except Exception:
-            pass
+        self._push_monitoring_status(
+            user_id, f"Monitoring active for {count} channel(s)"
+        )
 
         logger.info(f"📡 User {user_id}: Monitoring {count} channels (non-blocking)")
         return {
@@ -511,25 +496,7 @@ class UserTelegramManager:
                 pass
 
         self._monitoring_status.pop(user_id, None)
-
-        # Notify via WebSocket
-        try:
-            from app.services.websocket_manager import manager
-
-            await manager.send_to_user(
-                user_id,
-                {
-                    "type": "monitoring_status",
-                    "data": {
-                        "is_monitoring": False,
-                        "channels_count": 0,
-                        "message": "Monitoring stopped",
-                    },
-                    "timestamp": datetime.utcnow().isoformat(),
-                },
-            )
-        except Exception:
-            pass
+        self._push_monitoring_status(user_id, "Monitoring stopped")
 
         logger.info(f"🛑 Stopped monitoring for user {user_id}")
         return {"success": True, "message": "Monitoring stopped", "is_monitoring": False}
@@ -549,6 +516,39 @@ class UserTelegramManager:
             "queue_size": self._msg_queue.qsize(),
         }
 
+    def _push_monitoring_status(
+        self, user_id: int, message: Optional[str] = None
+    ) -> None:
+        """
+        Queue the full monitoring status to the user's live sockets.
+
+        Frames share one coalesce key, so a client that falls behind only
+        gets the latest counters rather than one frame per message.
+        """
+        try:
+            from app.services.websocket_manager import manager
+
+            data = self.get_monitoring_status(user_id)
+            data["message"] = message
+            manager.send_to_user_nowait(
+                user_id,
+                {
+                    "type": "monitoring_status",
+                    "data": data,
+                    "timestamp": datetime.utcnow().isoformat(),
+                },
+                coalesce_key="monitoring_status",
+            )
+        except Exception:
+            pass
+
+    async def get_combined_status(self, user_id: int) -> Dict[str, Any]:
+        """Return connection status and monitoring counters together."""
+        return {
+            "status": await self.get_user_status(user_id),
+            "monitoring": self.get_monitoring_status(user_id),
+        }
+
     async def refresh_monitoring(self, user_id: int) -> Dict[str, Any]:
         """Stop and restart monitoring to pick up new subscriptions."""
         await self.stop_monitoring(user_id)
@@ -753,6 +753,9 @@ class UserTelegramManager:
         except Exception:
             pass
 
+        # Counters changed; push them instead of waiting for a status poll
+        self._push_monitoring_status(user_id)
+
     async def _dedup_cleaner(self):
         """Periodically prune expired entries from the dedup cache."""
         while True:
@@ -1,6 +1,54 @@
-from typing import List, Dict, Optional
+import asyncio
+import re
+from collections import deque
+from typing import Any, Deque, List, Dict, Optional, Tuple, Union
 from fastapi import WebSocket
 
+# Pending frames per connection for ``ConnectionManager.send``. Snapshot
+# frames (prices, sentiment, trending) carry a coalesce key and replace any
+# queued frame with the same key, so a stalled client holds at most one of
+# each; the cap only bites on un-keyed frames.
+MAX_OUTBOUND_FRAMES = 64
+
+# A queued frame: a dict sent with send_json, or pre-rendered JSON text
+Frame = Union[dict, str]
+
+# Process-wide symbol -> bit registry for per-connection token masks.
+# "Does client C want symbol S?" becomes a single ``mask & bit`` test.
+# Bits are handed out on first subscribe; once the registry is full further
+# symbols get no bit and are kept in the connection's own ``tokens`` set.
+MAX_SYMBOL_BITS = 2048
+_SYMBOL_BIT: Dict[str, int] = {}
+
+# Only symbols shaped like SignalBase.token_symbol may take a bit, so junk
+# subscribe frames can't fill the registry
+_SYMBOL_RE = re.compile(r"[A-Z0-9$._-]{1,50}")
+
+# Cap on a single connection's symbols held outside the bitmask
+MAX_OVERFLOW_TOKENS = 256
+
+
+def is_valid_symbol(symbol: str) -> bool:
+    """Return True if *symbol* looks like an (upper-cased) token symbol."""
+    return _SYMBOL_RE.fullmatch(symbol) is not None
+
+
+def symbol_bit(symbol: str) -> int:
+    """Return the subscription bit for *symbol*, allocating one if needed (0 if full)."""
+    bit = _SYMBOL_BIT.get(symbol)
+    if bit is None:
+        if len(_SYMBOL_BIT) >= MAX_SYMBOL_BITS:
+            return 0
+        bit = 1 << len(_SYMBOL_BIT)
+        _SYMBOL_BIT[symbol] = bit
+    return bit
+
+
+def lookup_symbol_bit(symbol: str) -> int:
+    """Return the bit for *symbol* without allocating (0 if it has none)."""
+    return _SYMBOL_BIT.get(symbol, 0)
+
+
 class ConnectionManager:
     """Manage WebSocket connections for real-time updates."""
     
@@ -8,14 +56,58 @@ class ConnectionManager:
         self.active_connections: List[WebSocket] = []
         # Map websocket -> user_id for authenticated connections
         self._user_map: Dict[WebSocket, int] = {}
+        # Map websocket -> {"tokens_mask": int, "tokens": set, "channels": set}
+        self._subscriptions: Dict[WebSocket, Dict[str, Any]] = {}
+        # Map websocket -> pending (coalesce_key, message) frames + writer task
+        self._outbound: Dict[WebSocket, Deque[Tuple[Optional[str], Frame]]] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket, user_id: Optional[int] = None):
         """Accept a new WebSocket connection."""
         await websocket.accept()
         self.active_connections.append(websocket)
+        self._subscriptions[websocket] = {"tokens_mask": 0, "tokens": set(), "channels": set()}
+        self._outbound[websocket] = deque(maxlen=MAX_OUTBOUND_FRAMES)
         if user_id:
             self._user_map[websocket] = user_id
     
+    def get_subscriptions(self, websocket: WebSocket) -> Dict[str, Any]:
+        """Get the (mutable) subscription filters for a WebSocket connection."""
+        return self._subscriptions.setdefault(
+            websocket, {"tokens_mask": 0, "tokens": set(), "channels": set()}
+        )
+    
+    def subscribe_token(self, websocket: WebSocket, symbol: str) -> bool:
+        """
+        Subscribe a connection to an upper-cased token symbol.
+
+        Returns False (and records nothing) for malformed symbols or when the
+        connection's overflow set is full.
+        """
+        if not is_valid_symbol(symbol):
+            return False
+        subs = self.get_subscriptions(websocket)
+        bit = symbol_bit(symbol)
+        if bit:
+            subs["tokens_mask"] |= bit
+        elif symbol in subs["tokens"] or len(subs["tokens"]) < MAX_OVERFLOW_TOKENS:
+            subs["tokens"].add(symbol)
+        else:
+            return False
+        return True
+    
+    def unsubscribe_token(self, websocket: WebSocket, symbol: str) -> bool:
+        """Drop a token subscription; returns False if it wasn't subscribed."""
+        subs = self.get_subscriptions(websocket)
+        bit = lookup_symbol_bit(symbol)
+        if bit and subs["tokens_mask"] & bit:
+            subs["tokens_mask"] &= ~bit
+            return True
+        if symbol in subs["tokens"]:
+            subs["tokens"].discard(symbol)
+            return True
+        return False
+    
     def set_user(self, websocket: WebSocket, user_id: int):
         """Associate a user ID with a WebSocket connection."""
         self._user_map[websocket] = user_id
@@ -29,6 +121,58 @@ class ConnectionManager:
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
         self._user_map.pop(websocket, None)
+        self._subscriptions.pop(websocket, None)
+        self._outbound.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+    
+    def send(
+        self,
+        websocket: WebSocket,
+        message: Frame,
+        coalesce_key: Optional[str] = None,
+    ) -> bool:
+        """
+        Queue a message (dict or pre-rendered JSON text) for a client
+        without waiting on the socket.
+
+        If *coalesce_key* is set and a frame with the same key is still
+        pending, that frame is replaced in place instead of queueing another.
+        Returns False if the connection is gone.
+        """
+        queue = self._outbound.get(websocket)
+        if queue is None:
+            return False
+        
+        if coalesce_key is not None:
+            for i, (key, _) in enumerate(queue):
+                if key == coalesce_key:
+                    queue[i] = (coalesce_key, message)
+                    break
+            else:
+                queue.append((coalesce_key, message))
+        else:
+            queue.append((None, message))
+        
+        writer = self._writers.get(websocket)
+        if writer is None or writer.done():
+            self._writers[websocket] = asyncio.create_task(
+                self._drain(websocket, queue)
+            )
+        return True
+    
+    async def _drain(self, websocket: WebSocket, queue: Deque[Tuple[Optional[str], Frame]]):
+        """Write queued frames to a client until its queue is empty."""
+        try:
+            while queue:
+                _, message = queue.popleft()
+                if isinstance(message, str):
+                    await websocket.send_text(message)
+                else:
+                    await websocket.send_json(message)
+        except Exception:
+            self.disconnect(websocket)
     
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """Send a message to a specific client."""
@@ -46,6 +190,16 @@ class ConnectionManager:
         for ws in disconnected:
             self.disconnect(ws)
     
+    def send_to_user_nowait(
+        self, user_id: int, message: Frame, coalesce_key: Optional[str] = None
+    ) -> int:
+        """Queue a message for every connection of a user; returns how many."""
+        sent = 0
+        for ws, uid in list(self._user_map.items()):
+            if uid == user_id and self.send(ws, message, coalesce_key=coalesce_key):
+                sent += 1
+        return sent
+    
     async def broadcast(self, message: dict):
         """Broadcast a message to all connected clients."""
         disconnected = []
@@ -59,6 +213,39 @@ class ConnectionManager:
         for conn in disconnected:
             self.disconnect(conn)
     
+    async def broadcast_signal(
+        self,
+        message: dict,
+        token_symbol: Optional[str] = None,
+        channel_name: Optional[str] = None,
+    ):
+        """
+        Broadcast a signal message, honouring per-connection subscriptions.
+
+        Connections without any token/channel subscription receive everything.
+        """
+        symbol = token_symbol.upper() if token_symbol else None
+        signal_bit = lookup_symbol_bit(symbol) if symbol else 0
+        channel = channel_name.upper() if channel_name else None
+        disconnected = []
+        for connection in self.active_connections:
+            subs = self._subscriptions.get(connection)
+            if subs is not None:
+                mask = subs["tokens_mask"]
+                tokens = subs["tokens"]
+                channels = subs["channels"]
+                if (mask or tokens or channels) and not (
+                    mask & signal_bit or symbol in tokens or channel in channels
+                ):
+                    continue
+            try:
+                await connection.send_json(message)
+            except Exception:
+                disconnected.append(connection)
+        
+        for conn in disconnected:
+            self.disconnect(conn)
+    
     async def broadcast_to_authenticated(self, message: dict):
         """Broadcast a message to all authenticated clients."""
         disconnected = []
@@ -3,6 +3,7 @@ from app.utils.helpers import (
     format_price,
     format_percentage,
     format_datetime,
+    iso_now,
     calculate_roi,
     generate_cache_key,
 )
@@ -16,6 +17,7 @@ __all__ = [
     "format_price",
     "format_percentage",
     "format_datetime",
+    "iso_now",
     "calculate_roi",
     "generate_cache_key",
     "validate_token_symbol",
@@ -1,5 +1,6 @@
 """Helper utility functions."""
 import hashlib
+import time
 from datetime import datetime
 from typing import Optional, Any
 
@@ -51,6 +52,28 @@ def format_percentage(value: float, include_sign: bool = True) -> str:
     return f"{value:.2f}%"
 
 
+# (epoch second, formatted ISO string) shared by every caller of iso_now()
+_TS_CACHE = [0, ""]
+
+
+def iso_now() -> str:
+    """
+    Get the current UTC time as an ISO-8601 string at second granularity.
+
+    The formatted string is cached and re-rendered at most once per second,
+    so hot paths (WebSocket frames, live endpoints) don't allocate a new
+    timestamp per message.
+
+    Returns:
+        ISO formatted UTC timestamp, e.g. ``2024-01-01T12:00:00``
+    """
+    now = int(time.time())
+    if now != _TS_CACHE[0]:
+        _TS_CACHE[0] = now
+        _TS_CACHE[1] = datetime.utcfromtimestamp(now).isoformat()
+    return _TS_CACHE[1]
+
+
 def format_datetime(dt: datetime, format: str = "%Y-%m-%d %H:%M:%S") -> str:
     """
     Format datetime for display.
@@ -6,6 +6,7 @@ from fastapi import HTTPException, status
 
 
 VALID_SENTIMENTS = ["BULLISH", "BEARISH", "NEUTRAL"]
+_VALID_SENTIMENT_SET = frozenset(VALID_SENTIMENTS)
 TOKEN_PATTERN = re.compile(r'^[A-Z]{2,10}$')
 
 
@@ -60,7 +61,7 @@ def validate_sentiment(sentiment: str) -> str:
     
     normalized = sentiment.upper().strip()
     
-    if normalized not in VALID_SENTIMENTS:
+    if normalized not in _VALID_SENTIMENT_SET:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid sentiment '{sentiment}'. Must be one of: {VALID_SENTIMENTS}"
@@ -0,0 +1,68 @@
+"""Add partial unread index and DESC list index on notifications
+
+Revision ID: a1c3e5f70001
+Revises: 
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f70001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_notif_user_created",
+            table_name="notifications",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_notif_user_created",
+            "notifications",
+            ["user_id", sa.text("created_at DESC")],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_notifications_user_unread_created",
+            "notifications",
+            ["user_id", "is_read", sa.text("created_at DESC")],
+            if_not_exists=True,
+            postgresql_where=sa.text("is_read = false"),
+            sqlite_where=sa.text("is_read = 0"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_notifications_user_unread_created",
+            table_name="notifications",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_notif_user_created",
+            table_name="notifications",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "idx_notif_user_created",
+            "notifications",
+            ["user_id", "created_at"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
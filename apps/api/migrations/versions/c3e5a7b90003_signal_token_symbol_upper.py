@@ -0,0 +1,35 @@
+"""Normalize signals.token_symbol to uppercase and enforce it
+
+Revision ID: c3e5a7b90003
+Revises: b2d4f6a80002
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b90003'
+down_revision: Union[str, None] = 'b2d4f6a80002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE signals SET token_symbol = UPPER(token_symbol) "
+        "WHERE token_symbol <> UPPER(token_symbol)"
+    )
+    # Batch mode so SQLite (which cannot ALTER constraints) rebuilds the table
+    with op.batch_alter_table("signals") as batch:
+        batch.create_check_constraint(
+            "ck_signal_token_symbol_upper",
+            "token_symbol = UPPER(token_symbol)",
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("signals") as batch:
+        batch.drop_constraint("ck_signal_token_symbol_upper", type_="check")
@@ -0,0 +1,40 @@
+"""Add (user_id, created_at DESC) index on channel_subscriptions
+
+Revision ID: d4f6b8c00004
+Revises: c3e5a7b90003
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6b8c00004'
+down_revision: Union[str, None] = 'c3e5a7b90003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_subscription_user_created",
+            "channel_subscriptions",
+            ["user_id", sa.text("created_at DESC")],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_subscription_user_created",
+            table_name="channel_subscriptions",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,59 @@
+"""Add covering timestamp index on signals for analytics windows
+
+Replaces the plain ix_signals_timestamp index, which the covering index
+makes redundant.
+
+Revision ID: e5a7c9d10005
+Revises: d4f6b8c00004
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d10005'
+down_revision: Union[str, None] = 'd4f6b8c00004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_signal_timestamp_covering",
+            "signals",
+            ["timestamp"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            postgresql_include=[
+                "token_symbol", "channel_name", "sentiment",
+                "success", "roi_percent", "confidence_score",
+            ],
+        )
+        op.drop_index(
+            "ix_signals_timestamp",
+            table_name="signals",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_signals_timestamp",
+            "signals",
+            ["timestamp"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_signal_timestamp_covering",
+            table_name="signals",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
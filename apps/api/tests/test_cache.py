@@ -155,6 +155,174 @@ class TestCacheKeys:
         assert "ETH" in key_eth
 
 
+# ============== Conditional GET Tests ==============
+
+class _FakeVersionRedis:
+    """Just enough of the Redis client for version counters and cached results"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, name):
+        return self.data.get(name)
+
+    async def set(self, name, value, ex=None):
+        self.data[name] = value
+
+    async def mget(self, names):
+        return [self.data.get(n) for n in names]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, name, value, nx=False, ex=None):
+        if not (nx and name in self.redis.data):
+            self.redis.data[name] = value if isinstance(value, bytes) else str(value).encode()
+
+    def incr(self, name):
+        self.redis.data[name] = str(int(self.redis.data.get(name, b"0")) + 1).encode()
+
+    async def execute(self):
+        return []
+
+
+class TestConditionalGet:
+    """Tests for version-based ETags"""
+
+    def test_etag_matches(self):
+        """If-None-Match lists and weak validators are honoured"""
+        from app.cache import etag_matches
+
+        request = MagicMock()
+        request.headers = {"if-none-match": 'W/"abc", "def"'}
+        assert etag_matches(request, '"abc"')
+        assert etag_matches(request, '"def"')
+        assert not etag_matches(request, '"xyz"')
+        assert not etag_matches(request, None)
+
+    @pytest.mark.asyncio
+    async def test_no_etag_without_redis(self):
+        """Without shared counters no ETag is issued"""
+        from app.cache import version_etag
+
+        with patch("app.cache.get_redis", return_value=None):
+            assert await version_etag("subscriptions:1") is None
+
+    @pytest.mark.asyncio
+    async def test_bump_changes_etag(self):
+        """Bumping a key changes every ETag built from it"""
+        from app.cache import bump_version, version_etag
+
+        redis = _FakeVersionRedis()
+        with patch("app.cache.get_redis", return_value=redis):
+            first = await version_etag("subscriptions:1", "channels")
+            assert first == await version_etag("subscriptions:1", "channels")
+            other = await version_etag("subscriptions:2", "channels")
+
+            await bump_version("subscriptions:1")
+
+            assert await version_etag("subscriptions:1", "channels") != first
+            assert await version_etag("subscriptions:2", "channels") == other
+
+
+class TestCachedResult:
+    """Tests for the service-level result cache"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_call_is_served_from_redis(self):
+        """Same arguments hit the cache and are flagged; new arguments recompute"""
+        from app.cache import cached_result
+
+        calls = []
+
+        class Service:
+            @cached_result("test", ttl=60)
+            async def compute(self, hours: int = 24):
+                calls.append(hours)
+                return {"hours": hours, "cached": False}
+
+        with patch("app.cache.get_redis", return_value=_FakeVersionRedis()):
+            first = await Service().compute(hours=24)
+            second = await Service().compute(hours=24)
+            await Service().compute(hours=1)
+
+        assert calls == [24, 1]
+        assert first["cached"] is False
+        assert second == {"hours": 24, "cached": True}
+
+    @pytest.mark.asyncio
+    async def test_positional_and_keyword_calls_share_a_key(self):
+        """Arguments are bound to the signature before keying"""
+        from app.cache import cached_result
+
+        calls = []
+
+        class Service:
+            @cached_result("test", ttl=60)
+            async def compute(self, hours: int = 24):
+                calls.append(hours)
+                return {"hours": hours, "cached": False}
+
+        with patch("app.cache.get_redis", return_value=_FakeVersionRedis()):
+            await Service().compute(24)
+            by_keyword = await Service().compute(hours=24)
+            by_default = await Service().compute()
+
+        assert calls == [24]
+        assert by_keyword["cached"] and by_default["cached"]
+
+
+# ============== Cache Coder Tests ==============
+
+class TestORJSONCoder:
+    """Tests for the raw-bytes response cache coder"""
+
+    def test_encodes_like_fastapi(self):
+        """Datetimes, models and decimals match FastAPI's JSON output"""
+        from datetime import datetime
+        from decimal import Decimal
+        from app.cache import ORJSONCoder
+        from app.schemas.channel import ChannelResponse
+
+        channel = ChannelResponse(
+            id=1, name="Whales", telegram_id="whales", description=None,
+            subscriber_count=0, success_rate=0.0, total_signals=0, avg_roi=0.0,
+            is_active=True, created_at=datetime(2024, 1, 2, 3, 4, 5), updated_at=None,
+        )
+        decoded = ORJSONCoder.decode(ORJSONCoder.encode({"c": channel, "d": Decimal("1.5")}))
+
+        assert decoded["c"] == channel.model_dump(mode="json")
+        assert decoded["d"] == 1.5
+
+    def test_hit_is_served_as_stored_bytes(self):
+        """Hits come back as a Response over the cached body"""
+        from fastapi import Response
+        from app.cache import ORJSONCoder
+
+        hit = ORJSONCoder.decode_as_type(b'{"a":1}', type_=dict)
+
+        assert isinstance(hit, Response)
+        assert hit.body == b'{"a":1}'
+
+    def test_body_etag_is_content_derived(self):
+        """Equal bodies share an ETag; any change produces a new one"""
+        from app.cache import body_etag
+
+        assert body_etag(b'{"a":1}') == body_etag(b'{"a":1}')
+        assert body_etag(b'{"a":1}') != body_etag(b'{"a":2}')
+
+
 # ============== Mock Cache Tests ==============
 
 class TestMockCache:
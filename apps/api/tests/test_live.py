@@ -0,0 +1,271 @@
+"""
+Live Stream Tests
+Validates WebSocket fan-out filtering and live-router helpers
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.websocket_manager import (
+    ConnectionManager,
+    MAX_SYMBOL_BITS,
+    symbol_bit,
+    lookup_symbol_bit,
+)
+
+
+def _fake_ws():
+    """Create a mock WebSocket"""
+    ws = MagicMock()
+    ws.accept = AsyncMock()
+    ws.send_json = AsyncMock()
+    return ws
+
+
+# ============== Subscription Mask Tests ==============
+
+class TestSymbolBits:
+    """Tests for the symbol -> bit registry"""
+
+    def test_symbol_bit_is_stable(self):
+        """Same symbol always maps to the same single bit"""
+        bit = symbol_bit("BTC")
+        assert bit == symbol_bit("BTC")
+        assert bit & (bit - 1) == 0
+
+    def test_distinct_symbols_get_distinct_bits(self):
+        """Different symbols never share a bit"""
+        assert symbol_bit("ETH") & symbol_bit("SOL") == 0
+
+    def test_lookup_does_not_allocate(self):
+        """Unknown symbols resolve to 0 without being registered"""
+        assert lookup_symbol_bit("NEVER-SUBSCRIBED") == 0
+        assert lookup_symbol_bit("NEVER-SUBSCRIBED") == 0
+
+    @pytest.mark.asyncio
+    async def test_malformed_symbols_are_rejected(self):
+        """Subscribe frames that don't look like a token symbol take no bit"""
+        mgr = ConnectionManager()
+        ws = _fake_ws()
+        await mgr.connect(ws)
+
+        assert mgr.subscribe_token(ws, "X" * 51) is False
+        assert mgr.subscribe_token(ws, "<SCRIPT>") is False
+        assert lookup_symbol_bit("<SCRIPT>") == 0
+        assert mgr.get_subscriptions(ws)["tokens_mask"] == 0
+
+    @pytest.mark.asyncio
+    async def test_full_registry_keeps_symbols_apart(self, monkeypatch):
+        """Symbols beyond the bitmask neither cross-deliver nor unsubscribe together"""
+        import app.services.websocket_manager as wm
+        monkeypatch.setattr(
+            wm, "_SYMBOL_BIT", {f"FILL{i}": 1 << i for i in range(MAX_SYMBOL_BITS)}
+        )
+        mgr = ConnectionManager()
+        ws = _fake_ws()
+        await mgr.connect(ws)
+
+        assert mgr.subscribe_token(ws, "AAA") and mgr.subscribe_token(ws, "BBB")
+        await mgr.broadcast_signal({"type": "new_signal"}, token_symbol="CCC")
+        ws.send_json.assert_not_awaited()
+
+        assert mgr.unsubscribe_token(ws, "AAA")
+        await mgr.broadcast_signal({"type": "new_signal"}, token_symbol="AAA")
+        ws.send_json.assert_not_awaited()
+        await mgr.broadcast_signal({"type": "new_signal"}, token_symbol="bbb")
+        ws.send_json.assert_awaited_once()
+
+
+class TestBroadcastSignal:
+    """Tests for subscription-aware signal fan-out"""
+
+    @pytest.mark.asyncio
+    async def test_unfiltered_client_receives_everything(self):
+        """Clients without subscriptions get every signal"""
+        mgr = ConnectionManager()
+        ws = _fake_ws()
+        await mgr.connect(ws)
+
+        await mgr.broadcast_signal({"type": "new_signal"}, token_symbol="DOGE")
+
+        ws.send_json.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_token_filter(self):
+        """Token-subscribed clients only get matching signals"""
+        mgr = ConnectionManager()
+        ws = _fake_ws()
+        await mgr.connect(ws)
+        mgr.get_subscriptions(ws)["tokens_mask"] |= symbol_bit("BTC")
+
+        await mgr.broadcast_signal({"type": "new_signal"}, token_symbol="PEPE")
+        ws.send_json.assert_not_awaited()
+
+        await mgr.broadcast_signal({"type": "new_signal"}, token_symbol="btc")
+        ws.send_json.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_channel_filter(self):
+        """Channel-subscribed clients get signals from that channel"""
+        mgr = ConnectionManager()
+        ws = _fake_ws()
+        await mgr.connect(ws)
+        mgr.get_subscriptions(ws)["channels"].add("CRYPTOWHALES")
+
+        await mgr.broadcast_signal(
+            {"type": "new_signal"}, token_symbol="PEPE", channel_name="CryptoWhales"
+        )
+        ws.send_json.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_drops_subscriptions(self):
+        """Subscription state is released on disconnect"""
+        mgr = ConnectionManager()
+        ws = _fake_ws()
+        await mgr.connect(ws)
+        mgr.disconnect(ws)
+
+        assert ws not in mgr._subscriptions
+
+
+class TestOutboundQueue:
+    """Tests for queued, coalescing sends"""
+
+    @pytest.mark.asyncio
+    async def test_coalesced_frames_replace_pending(self):
+        """A pending snapshot frame is replaced rather than queued twice"""
+        mgr = ConnectionManager()
+        ws = _fake_ws()
+        await mgr.connect(ws)
+
+        mgr.send(ws, {"type": "tracked_price_update", "n": 1}, coalesce_key="tracked_price_update")
+        mgr.send(ws, {"type": "new_signal"})
+        mgr.send(ws, {"type": "tracked_price_update", "n": 2}, coalesce_key="tracked_price_update")
+        await mgr._writers[ws]
+
+        sent = [c.args[0] for c in ws.send_json.await_args_list]
+        assert sent == [{"type": "tracked_price_update", "n": 2}, {"type": "new_signal"}]
+
+    @pytest.mark.asyncio
+    async def test_user_frames_coalesce(self):
+        """Per-user status frames reach only that user's sockets, latest wins"""
+        mgr = ConnectionManager()
+        mine, other = _fake_ws(), _fake_ws()
+        await mgr.connect(mine, user_id=1)
+        await mgr.connect(other, user_id=2)
+
+        mgr.send_to_user_nowait(1, {"type": "monitoring_status", "n": 1}, coalesce_key="monitoring_status")
+        mgr.send_to_user_nowait(1, {"type": "monitoring_status", "n": 2}, coalesce_key="monitoring_status")
+        await mgr._writers[mine]
+
+        mine.send_json.assert_awaited_once_with({"type": "monitoring_status", "n": 2})
+        other.send_json.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_send_after_disconnect(self):
+        """Sending to a closed connection is a no-op"""
+        mgr = ConnectionManager()
+        ws = _fake_ws()
+        await mgr.connect(ws)
+        mgr.disconnect(ws)
+
+        assert mgr.send(ws, {"type": "sentiment_update"}, coalesce_key="sentiment") is False
+
+
+# ============== Pre-rendered Frame Tests ==============
+
+class TestPrerenderedFrames:
+    """Tests for cached WebSocket frames"""
+
+    def test_pong_frame_is_valid_json(self):
+        """Pong frame parses and carries a timestamp"""
+        import json
+        from app.routers.live import _pong
+
+        frame = json.loads(_pong())
+        assert frame["type"] == "pong"
+        assert frame["timestamp"]
+
+    def test_pong_frame_reused_within_second(self):
+        """Repeated pings within a second reuse the same object"""
+        from unittest.mock import patch
+        from app.routers.live import _pong
+
+        with patch("app.utils.helpers.time.time", return_value=1_700_000_000.5):
+            assert _pong() is _pong()
+
+    def test_ack_escapes_value(self):
+        """ACK values are JSON-escaped"""
+        import json
+        from app.routers.live import _ack, _SUBSCRIBED_TOKEN_TEMPLATE
+
+        frame = json.loads(_ack(_SUBSCRIBED_TOKEN_TEMPLATE, 'BTC"}'))
+        assert frame == {"type": "subscribed", "sub_type": "token", "value": 'BTC"}'}
+
+
+# ============== OHLC Downsampling Tests ==============
+
+class TestDownsampleOhlc:
+    """Tests for OHLC bucket aggregation"""
+
+    @staticmethod
+    def _ohlc(n):
+        import numpy as np
+
+        i = np.arange(n, dtype=np.float64)
+        return np.column_stack([i * 60_000, i, i + 10, i - 10, i + 1])
+
+    def test_small_series_unchanged(self):
+        """Series at or under the target are returned as-is"""
+        from app.services.coingecko_service import downsample_ohlc
+
+        ohlc = self._ohlc(5)
+        assert downsample_ohlc(ohlc, 5) is ohlc
+
+    def test_buckets_preserve_ohlc(self):
+        """Each bucket keeps first open, max high, min low, last close"""
+        from app.services.coingecko_service import downsample_ohlc
+
+        merged = downsample_ohlc(self._ohlc(10), 2)
+        assert merged.tolist() == [
+            [0, 0, 14, -10, 5],
+            [300_000, 5, 19, -5, 10],
+        ]
+
+    def test_candles_wire_format(self):
+        """Array rows serialize to the {t, o, h, l, c} dicts the chart expects"""
+        from app.services.coingecko_service import ohlc_to_candles
+
+        candles = ohlc_to_candles(self._ohlc(2))
+        assert candles[1] == {
+            "t": "1970-01-01T00:01:00+00:00", "o": 1.0, "h": 11.0, "l": -9.0, "c": 2.0,
+        }
+
+
+# ============== Live Snapshot Tests ==============
+
+class TestLiveSnapshots:
+    """Tests for server-wide sentiment/trending snapshots"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_falls_back_to_local(self):
+        """Without Redis, published frames are served from process memory"""
+        import json
+        from app.routers.live import _publish_snapshot, _get_snapshot
+
+        await _publish_snapshot("live:test", {"type": "sentiment_update", "data": {}}, ttl=5)
+
+        assert json.loads(await _get_snapshot("live:test"))["type"] == "sentiment_update"
+
+    @pytest.mark.asyncio
+    async def test_text_frames_sent_as_text(self):
+        """Pre-rendered snapshot frames go out with send_text"""
+        mgr = ConnectionManager()
+        ws = _fake_ws()
+        ws.send_text = AsyncMock()
+        await mgr.connect(ws)
+
+        mgr.send(ws, '{"type":"trending_update"}', coalesce_key="trending")
+        await mgr._writers[ws]
+
+        ws.send_text.assert_awaited_once_with('{"type":"trending_update"}')
+        ws.send_json.assert_not_awaited()
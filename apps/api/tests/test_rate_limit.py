@@ -0,0 +1,77 @@
+"""
+Rate Limit Tests
+Validates limit parsing and the Redis-backed per-route rate limiter
+"""
+import pytest
+
+
+# ============== Rate Limit Tests ==============
+
+class TestRateLimit:
+    """Tests for the Redis-backed per-route rate limiter"""
+
+    def test_parse_limit(self):
+        """Limit strings parse into (count, seconds)"""
+        from app.rate_limit import parse_limit
+
+        assert parse_limit("5/minute") == (5, 60)
+        assert parse_limit("100/hours") == (100, 3600)
+
+    def test_local_window_resets(self):
+        """Without Redis, counters restart when the window rolls over"""
+        from app.rate_limit import _local_hit
+
+        assert _local_hit("test:key", 1, 60) == 1
+        assert _local_hit("test:key", 1, 60) == 2
+        assert _local_hit("test:key", 2, 60) == 1
+
+    @pytest.mark.asyncio
+    async def test_local_sweep_keeps_other_limits(self, monkeypatch):
+        """Without Redis, sweeping expired second windows keeps live minute counters"""
+        from fastapi import HTTPException, Request
+        import app.rate_limit as rl
+
+        clock = [6000.0]
+        monkeypatch.setattr(rl, "get_redis", lambda: None)
+        monkeypatch.setattr(rl.settings, "rate_limit_enabled", True)
+        monkeypatch.setattr(rl.time, "time", lambda: clock[0])
+        monkeypatch.setattr(rl, "_local_windows", {})
+        monkeypatch.setattr(rl, "_local_swept_at", clock[0])
+        monkeypatch.setattr(rl, "_LOCAL_SWEEP_INTERVAL", 1)
+
+        def request(path, host):
+            return Request({
+                "type": "http", "method": "GET", "path": path, "query_string": b"",
+                "headers": [], "client": (host, 1), "server": ("test", 80), "scheme": "http",
+            })
+
+        per_minute = rl.rate_limit("5/minute")
+        per_second = rl.rate_limit("1/second")
+        for _ in range(5):
+            await per_minute(request("/slow", "10.0.0.1"))
+        await per_second(request("/fast", "10.0.0.2"))
+        await per_second(request("/fast", "10.0.0.3"))
+
+        clock[0] += 1.5
+        await per_second(request("/fast", "10.0.0.4"))
+        with pytest.raises(HTTPException) as exc:
+            await per_minute(request("/slow", "10.0.0.1"))
+
+        assert exc.value.status_code == 429
+        assert len(rl._local_windows) == 2
+
+    def test_local_cap_drops_least_recent(self, monkeypatch):
+        """At the key cap a new key evicts only the least recently hit counter"""
+        import app.rate_limit as rl
+
+        monkeypatch.setattr(rl, "_local_windows", {})
+        monkeypatch.setattr(rl, "_local_swept_at", rl.time.time())
+        monkeypatch.setattr(rl, "_LOCAL_MAX_KEYS", 3)
+
+        for key in ("a", "b", "c"):
+            rl._local_hit(key, 1, 60)
+        rl._local_hit("a", 1, 60)
+        rl._local_hit("d", 1, 60)
+
+        assert list(rl._local_windows) == ["c", "a", "d"]
+        assert rl._local_windows["a"] == (1, 60, 2)
@@ -0,0 +1,225 @@
+"""
+Search Tests
+Validates contract-address detection used by token search
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.routers.search import _detect_address_type, _lookup_contract
+from app.services.coingecko_service import coingecko_service
+
+
+EVM_ADDRESS = "0x" + "a1" * 20
+TRON_ADDRESS = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+SOLANA_ADDRESS = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+class TestDetectAddressType:
+    """Tests for _detect_address_type"""
+
+    def test_names_and_symbols_are_not_addresses(self):
+        """Short queries are rejected before any regex"""
+        assert _detect_address_type("bitcoin") is None
+        assert _detect_address_type("BTC") is None
+        assert _detect_address_type("") is None
+
+    def test_address_families(self):
+        """Each supported address family is recognised"""
+        assert _detect_address_type(EVM_ADDRESS) == "evm"
+        assert _detect_address_type(TRON_ADDRESS) == "tron"
+        assert _detect_address_type(SOLANA_ADDRESS) == "solana"
+
+    def test_trailing_newline_rejected(self):
+        """Whole-string matching rejects a trailing newline"""
+        assert _detect_address_type(EVM_ADDRESS + "\n") is None
+
+    def test_malformed_evm_address(self):
+        """0x-prefixed strings with non-hex chars are not addresses"""
+        assert _detect_address_type("0x" + "g1" * 20) is None
+
+    def test_whitespace_in_evm_body_rejected(self):
+        """Spaces inside the hex body don't pass as an address"""
+        assert _detect_address_type("0x " + "a1" * 19 + " ") is None
+
+    def test_non_base58_characters_rejected(self):
+        """Strings containing 0, O, I, l or non-ASCII are not Solana addresses"""
+        for bad in "0OIlé":
+            assert _detect_address_type(SOLANA_ADDRESS[:-1] + bad) is None
+
+
+class TestLookupContract:
+    """Tests for the concurrent contract lookup"""
+
+    @pytest.mark.asyncio
+    async def test_first_hit_wins_and_rest_cancelled(self):
+        """The first platform with a token wins; later lookups are cancelled"""
+        cancelled = []
+
+        async def fake_lookup(address, platform):
+            if platform == "ethereum":
+                return None
+            if platform == "base":
+                return {"symbol": "TKN", "chain": platform}
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(platform)
+                raise
+
+        with patch.object(coingecko_service, "lookup_by_contract", fake_lookup):
+            token = await _lookup_contract(EVM_ADDRESS, ["ethereum", "base", "avalanche"])
+
+        assert token["chain"] == "base"
+        assert cancelled == ["avalanche"]
+
+    @pytest.mark.asyncio
+    async def test_platform_priority_kept(self):
+        """A slower hit on an earlier platform beats a faster later one"""
+        async def fake_lookup(address, platform):
+            if platform == "ethereum":
+                await asyncio.sleep(0.01)
+            return {"symbol": "TKN", "chain": platform}
+
+        with patch.object(coingecko_service, "lookup_by_contract", fake_lookup):
+            token = await _lookup_contract(EVM_ADDRESS, ["ethereum", "base"])
+
+        assert token["chain"] == "ethereum"
+
+    @pytest.mark.asyncio
+    async def test_no_hit(self):
+        """None is returned when no platform knows the address"""
+        async def fake_lookup(address, platform):
+            return None
+
+        with patch.object(coingecko_service, "lookup_by_contract", fake_lookup):
+            assert await _lookup_contract(EVM_ADDRESS, ["ethereum", "base"]) is None
+
+
+class TestContractMissCache:
+    """Tests for negative caching of unknown contract addresses"""
+
+    @pytest.mark.asyncio
+    async def test_404_is_remembered(self):
+        """A 404 lookup is not repeated within the TTL"""
+        from app.services.coingecko_service import CoinGeckoService
+
+        service = CoinGeckoService()
+        not_found = MagicMock(status_code=404)
+        with patch.object(service, "_safe_get", AsyncMock(return_value=not_found)) as get:
+            assert await service.lookup_by_contract(EVM_ADDRESS, "ethereum") is None
+            assert await service.lookup_by_contract(EVM_ADDRESS.upper().replace("0X", "0x"), "ethereum") is None
+
+        get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_is_not_remembered(self):
+        """Transient failures are retried on the next lookup"""
+        from app.services.coingecko_service import CoinGeckoService
+
+        service = CoinGeckoService()
+        limited = MagicMock(status_code=429)
+        with patch.object(service, "_safe_get", AsyncMock(return_value=limited)) as get:
+            await service.lookup_by_contract(EVM_ADDRESS, "ethereum")
+            await service.lookup_by_contract(EVM_ADDRESS, "ethereum")
+
+        assert get.await_count == 2
+
+
+class TestContractIndex:
+    """Tests for the contract address → platform index"""
+
+    @pytest.mark.asyncio
+    async def test_index_prefers_platform_order(self):
+        """Multi-chain addresses map to the highest-priority platform"""
+        from app.services.coingecko_service import CoinGeckoService
+
+        service = CoinGeckoService()
+        coins = MagicMock(status_code=200)
+        coins.json.return_value = [
+            {"id": "multi", "platforms": {"base": EVM_ADDRESS.upper().replace("0X", "0x"), "ethereum": EVM_ADDRESS}},
+            {"id": "sol", "platforms": {"solana": SOLANA_ADDRESS, "": ""}},
+        ]
+        with patch.object(service, "_safe_get", AsyncMock(return_value=coins)):
+            index = await service.get_contract_index(["ethereum", "base", "solana"])
+
+        assert index == {EVM_ADDRESS: "ethereum", SOLANA_ADDRESS: "solana"}
+
+    @pytest.mark.asyncio
+    async def test_indexed_platform_is_tried_first(self):
+        """An indexed address resolves on its own platform in one lookup"""
+        from app.routers import search
+
+        lookup = AsyncMock(return_value={"symbol": "X"})
+        with patch("app.routers.search.get_redis", return_value=None), \
+             patch.dict(search._local_contract_index, {EVM_ADDRESS: "base"}), \
+             patch.object(coingecko_service, "lookup_by_contract", lookup):
+            platforms = search._platform_order(
+                ["ethereum", "base"], await search._indexed_platform(EVM_ADDRESS.upper().replace("0X", "0x"))
+            )
+            await _lookup_contract(EVM_ADDRESS, platforms)
+
+        assert platforms == ["base", "ethereum"]
+        assert lookup.await_args_list[0].args == (EVM_ADDRESS, "base")
+
+
+class TestSingleFlight:
+    """Tests for coalescing identical in-flight CoinGecko calls"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_call(self):
+        """Simultaneous lookups of the same address hit CoinGecko once"""
+        calls = []
+
+        async def fake_lookup(address, platform):
+            calls.append(platform)
+            await asyncio.sleep(0.01)
+            return {"symbol": "TKN", "chain": platform}
+
+        with patch.object(coingecko_service, "lookup_by_contract", fake_lookup):
+            first, second = await asyncio.gather(
+                _lookup_contract(EVM_ADDRESS, ["ethereum"]),
+                _lookup_contract(EVM_ADDRESS, ["ethereum"]),
+            )
+
+        assert calls == ["ethereum"]
+        assert first == second == {"symbol": "TKN", "chain": "ethereum"}
+
+
+class TestTokenPriceBatching:
+    """Tests for batching concurrent contract price lookups"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_one_request(self):
+        """Concurrent token_price calls on one platform become a single request"""
+        from app.services.coingecko_service import CoinGeckoService
+
+        service = CoinGeckoService()
+        a, b = "0x" + "a" * 40, "0x" + "b" * 40
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {a: {"usd": 1.5, "usd_24h_change": 2.0}}
+        with patch.object(service, "_safe_get", AsyncMock(return_value=ok)) as get:
+            price_a, price_b = await asyncio.gather(
+                service.token_price("ethereum", a.upper().replace("0X", "0x")),
+                service.token_price("ethereum", b),
+            )
+
+        get.assert_awaited_once()
+        assert set(get.await_args.kwargs["params"]["contract_addresses"].split(",")) == {a, b}
+        assert price_a == {"price_usd": 1.5, "price_change_24h": 2.0}
+        assert price_b is None
+
+    @pytest.mark.asyncio
+    async def test_base58_addresses_keep_their_case(self):
+        """Mixed-case Solana addresses are sent and matched verbatim"""
+        from app.services.coingecko_service import CoinGeckoService
+
+        service = CoinGeckoService()
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {SOLANA_ADDRESS: {"usd": 1.0, "usd_24h_change": 0.5}}
+        with patch.object(service, "_safe_get", AsyncMock(return_value=ok)) as get:
+            price = await service.token_price("solana", SOLANA_ADDRESS)
+
+        assert get.await_args.kwargs["params"]["contract_addresses"] == SOLANA_ADDRESS
+        assert price == {"price_usd": 1.0, "price_change_24h": 0.5}
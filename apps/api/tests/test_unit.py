@@ -516,6 +516,222 @@ class TestAnalyticsService:
         assert stats["token_symbol"] == "ETH"
 
 
+class TestRoiDistribution:
+    """Tests for vectorized ROI bucketing"""
+
+    def test_edges_fall_in_upper_bucket(self):
+        """Each boundary value counts toward the bucket it opens"""
+        import numpy as np
+        from app.services.analytics_service import roi_distribution
+
+        dist = roi_distribution(np.array([-80, -50, -20, 0, 20, 50, 100, 250], dtype=np.float64))
+
+        assert list(dist.values()) == [1, 1, 1, 1, 1, 1, 2]
+
+    def test_empty_has_all_buckets(self):
+        """No ROI values still yields every bucket at zero"""
+        import numpy as np
+        from app.services.analytics_service import roi_distribution, ROI_BUCKET_LABELS
+
+        assert roi_distribution(np.empty(0)) == dict.fromkeys(ROI_BUCKET_LABELS, 0)
+
+
+class TestSentimentCounts:
+    """Tests for fixed-order sentiment counting"""
+
+    def test_counts_in_fixed_order(self):
+        """Counts follow BULLISH, BEARISH, NEUTRAL and render to the dict shape"""
+        from app.services.analytics_service import sentiment_code_counts, sentiment_distribution
+
+        counts = sentiment_code_counts([1, 0, 1, 3])
+
+        assert counts.tolist() == [1, 2, 0]
+        assert sentiment_distribution(counts) == {"BULLISH": 1, "BEARISH": 2, "NEUTRAL": 0}
+
+    def test_sql_codes_match_python_counts(self):
+        """SENTIMENT_CODE encodes like the Python path, unknowns dropped"""
+        from sqlalchemy import select
+        from sqlalchemy.dialects import sqlite
+        from app.services.analytics_service import SENTIMENT_CODE, sentiment_code_counts
+
+        sql = str(select(SENTIMENT_CODE).compile(
+            dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}
+        ))
+
+        assert "WHEN 'NEUTRAL' THEN 2 ELSE 3" in sql
+        assert sentiment_code_counts([1, 0, 1, 3]).tolist() == [1, 2, 0]
+
+
+class TestWindowSums:
+    """Tests for per-token segment sums in pattern analysis"""
+
+    def test_sums_each_window(self):
+        """Windows may touch the array end and sit back to back"""
+        import numpy as np
+        from app.services.analytics_service import _window_sums
+
+        values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        sums = _window_sums(values, np.array([0, 2, 3]), np.array([2, 5, 5]))
+
+        assert sums.tolist() == [3.0, 12.0, 9.0]
+
+
+async def _run_on_signals(signals, method, *args):
+    """Run an AnalyticsService method against a fresh in-memory DB holding *signals*."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        async with AsyncSession(engine) as session:
+            session.add_all(signals)
+            await session.commit()
+            return await getattr(AnalyticsService(session), method)(*args)
+    finally:
+        await engine.dispose()
+
+
+def _signal(**overrides):
+    from datetime import datetime
+
+    fields = dict(
+        channel_id=1, channel_name="c", token_symbol="BTC", token_name="Bitcoin",
+        message_text="m", sentiment="NEUTRAL", timestamp=datetime.utcnow(),
+    )
+    fields.update(overrides)
+    return Signal(**fields)
+
+
+class TestPatternAnalysis:
+    """Tests for pattern detection edge cases"""
+
+    @pytest.mark.asyncio
+    async def test_accumulation_from_zero_confidence(self):
+        """An all-zero older window caps the accumulation confidence instead of failing"""
+        from datetime import datetime, timedelta
+
+        now = datetime.utcnow()
+        result = await _run_on_signals(
+            [
+                _signal(
+                    confidence_score=0.0 if i < 15 else 0.5,
+                    timestamp=now - timedelta(hours=30 - i),
+                )
+                for i in range(30)
+            ],
+            "get_pattern_analysis",
+        )
+
+        accumulation = [p for p in result["patterns"] if p["pattern_type"] == "accumulation"]
+        assert accumulation[0]["confidence"] == 0.9
+
+
+class TestMarketSentiment:
+    """Tests for market sentiment aggregation"""
+
+    @pytest.mark.asyncio
+    async def test_unknown_sentiments_are_skipped(self):
+        """Legacy or lowercase sentiments count toward the total only"""
+        with patch("app.cache.get_redis", return_value=None):
+            result = await _run_on_signals(
+                [_signal(sentiment="BULLISH"), _signal(sentiment="bullish", token_symbol="ETH")],
+                "get_market_sentiment",
+            )
+
+        assert result["signals_analyzed"] == 2
+        assert result["bullish_percent"] == 50.0
+        assert result["top_bullish_tokens"] == ["BTC", "ETH"]
+
+
+class TestHistoricalData:
+    """Tests for paginated historical data"""
+
+    @pytest.mark.asyncio
+    async def test_summary_is_page_independent(self):
+        """Every page carries the full-range summary; has_more tracks the offset"""
+        def signals():
+            return [
+                _signal(sentiment=s, success=ok, roi_percent=roi)
+                for s, ok, roi in [
+                    ("BULLISH", True, 10.0), ("BEARISH", False, -5.0),
+                    ("BULLISH", True, 20.0), ("NEUTRAL", None, None), ("bullish", False, -1.0),
+                ]
+            ]
+
+        first = await _run_on_signals(signals(), "get_historical_data", 30, 2, 0)
+        last = await _run_on_signals(signals(), "get_historical_data", 30, 2, 4)
+
+        assert first["summary"] == last["summary"]
+        assert first["summary"]["sentiment_distribution"] == {"BULLISH": 2, "BEARISH": 1, "NEUTRAL": 1}
+        assert first["summary"]["success_rate"] == 40.0
+        assert first["summary"]["avg_roi"] == 4.8
+        assert first["total_count"] == last["total_count"] == 5
+        assert (len(first["signals"]), first["offset"], first["has_more"]) == (2, 0, True)
+        assert (len(last["signals"]), last["offset"], last["has_more"]) == (1, 4, False)
+
+
+class TestLeaderboardScore:
+    """Tests for vectorized leaderboard scoring"""
+
+    def test_matches_weighted_formula(self):
+        """Scores follow the 40/40/20 weighting with capped volume"""
+        import numpy as np
+        from app.services.analytics_service import composite_scores
+
+        scores = composite_scores(
+            np.array([50.0, 80.0]), np.array([10.0, -20.0]), np.array([500.0, 200_000.0])
+        )
+
+        assert scores.tolist() == pytest.approx([24.1, 44.0])
+
+
+# ============== CoinMarketCap Service Tests ==============
+
+class _FakeQuoteRedis:
+    """Just enough of the Redis client for the CMC quote cache"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def mget(self, names):
+        return [self.data.get(n) for n in names]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, name, value, ex=None):
+        self.data[name] = value
+
+    async def execute(self):
+        return []
+
+
+class TestCMCService:
+    """Tests for the CoinMarketCap quote cache"""
+
+    @pytest.mark.asyncio
+    async def test_cmc_quotes_fetch_only_misses(self):
+        """Cached CMC quotes are reused; only uncached symbols hit the API"""
+        from app.services.cmc_service import CoinMarketCapService
+
+        service = CoinMarketCapService()
+        service.api_key = "test"
+        fetch = AsyncMock(side_effect=lambda batch: {s: {"symbol": s} for s in batch})
+
+        with patch("app.services.cmc_service.get_redis", return_value=_FakeQuoteRedis()), \
+                patch.object(service, "_fetch_quotes", fetch):
+            await service.get_quotes_by_symbols(["btc", "ETH"])
+            quotes = await service.get_quotes_by_symbols(["BTC", "SOL"])
+
+        assert [c.args[0] for c in fetch.await_args_list] == [["BTC", "ETH"], ["SOL"]]
+        assert quotes == {"BTC": {"symbol": "BTC"}, "SOL": {"symbol": "SOL"}}
+
+
 # ============== Run tests ==============
 
 if __name__ == "__main__":
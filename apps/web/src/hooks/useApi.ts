@@ -261,7 +261,8 @@ export function useMonitoringStatus() {
   return useQuery({
     queryKey: ['monitoringStatus'],
     queryFn: api.getMonitoringStatus,
-    refetchInterval: 10000, // Poll every 10 seconds
+    // Pushed over the live WebSocket; polling only covers a dropped socket
+    refetchInterval: 60000,
   });
 }
 
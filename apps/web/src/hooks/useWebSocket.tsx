@@ -255,9 +255,15 @@ export function WebSocketProvider({ children }: { children: React.ReactNode }) {
         }
 
         case 'monitoring_status': {
-          // Monitoring started/stopped — refresh monitoring status queries
-          queryClient.invalidateQueries({ queryKey: ['monitoringStatus'] });
-          queryClient.invalidateQueries({ queryKey: ['userTelegramStatus'] });
+          // Frames carry the full status, so no refetch is needed
+          const ms = (message as any).data;
+          if (ms) {
+            queryClient.setQueryData(['monitoringStatus'], ms);
+          }
+          // Monitoring started/stopped — connection status may have changed
+          if (ms?.message) {
+            queryClient.invalidateQueries({ queryKey: ['userTelegramStatus'] });
+          }
           break;
         }
 
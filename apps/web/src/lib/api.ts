@@ -197,6 +197,9 @@ export async function getTrending(): Promise<TrendingResponse> {
 
 export interface HistoricalParams {
   days?: number;
+  limit?: number;
+  offset?: number;
+  layout?: "columns" | "aos";
   token_symbol?: string;
   channel_name?: string;
 }
@@ -317,8 +317,15 @@ export interface MonitoringStatusMessage extends BaseWebSocketMessage {
   type: 'monitoring_status';
   data: {
     is_monitoring: boolean;
+    started_at: string | null;
     channels_count: number;
-    message: string;
+    messages_processed: number;
+    signals_detected: number;
+    last_message_at: string | null;
+    errors: string[];
+    queue_size: number;
+    // Set on start/stop; null for counter updates
+    message: string | null;
   };
 }
 